@@ -22,7 +22,9 @@ import dash_table
 from pkg_resources import packaging as pkg
 
 import skijumpdesign
-from skijumpdesign.functions import make_jump, cartesian_from_measurements
+from skijumpdesign.functions import cartesian_from_measurements
+from skijumpdesign.cache import ResultCache
+from skijumpdesign.atlas import Atlas
 from skijumpdesign.surfaces import Surface
 from skijumpdesign.skiers import Skier
 from skijumpdesign.utils import InvalidJumpError
@@ -56,6 +58,20 @@ BOOTSTRAP_JS_URL = 'https://maxcdn.bootstrapcdn.com/bootstrap/3.3.7/js/bootstrap
 logger = logging.getLogger('skijumpdesign')
 logger.setLevel(logging.INFO)
 
+# NOTE : The results are shared by all the workers serving the app and kept
+# between restarts.
+RESULT_CACHE = ResultCache()
+
+# NOTE : SKIJUMPDESIGN_ATLAS is an optional env variable with the directory of
+# an atlas built with skijumpdesign.atlas. Designs on its lattice are served
+# from it.
+ATLAS = None
+if 'SKIJUMPDESIGN_ATLAS' in os.environ:
+    try:
+        ATLAS = Atlas(os.environ['SKIJUMPDESIGN_ATLAS'])
+    except (OSError, ValueError) as e:
+        logging.error('The atlas could not be opened:', exc_info=e)
+
 # NOTE : ONRENDER is a custom env variable that needs to be set via the app
 # settings on heroku.com. This should be set as TRUE for the primary and
 # staging apps.
@@ -1288,8 +1304,16 @@ def generate_data(slope_angle, approach_len, takeoff_angle, fall_height):
                      'Flight Distance': 0.0,
                      'Flight Height': 0.0}
     try:
-        *surfs, outputs = make_jump(slope_angle, 0.0, approach_len,
-                                    takeoff_angle, fall_height)
+        try:
+            if ATLAS is None:
+                raise KeyError('No atlas.')
+            *surfs, outputs = ATLAS.make_jump(slope_angle, 0.0, approach_len,
+                                              takeoff_angle, fall_height)
+        except KeyError:  # not on the atlas' lattice
+            *surfs, outputs = RESULT_CACHE.make_jump(slope_angle, 0.0,
+                                                     approach_len,
+                                                     takeoff_angle,
+                                                     fall_height)
     except InvalidJumpError as e:
         logging.error('Graph update error:', exc_info=e)
         dic = blank_graph('<br>'.join(textwrap.wrap(str(e), 30)))
@@ -1442,8 +1466,8 @@ def update_efh_graph(n_clicks, dummy, json_data, takeoff_angle):
 
         try:
             _, approach, takeoff, landing, landing_trans, _, _ = \
-                make_jump(slope_angle, 0.0, approach_len, takeoff_angle,
-                          fall_height)
+                RESULT_CACHE.make_jump(slope_angle, 0.0, approach_len,
+                                       takeoff_angle, fall_height)
         except InvalidJumpError:
             # NOTE : Should cause Surface to fail below.
             # TODO : Improve this, currently a poor workaround.
@@ -1479,10 +1503,11 @@ def update_efh_graph(n_clicks, dummy, json_data, takeoff_angle):
 
     try:
         surface = Surface(x_vals, y_vals)
-        distance, efh, speed = surface.calculate_efh(takeoff_angle,
-                                                     takeoff_point,
-                                                     skier,
-                                                     increment=0.5)
+        distance, efh, speed = RESULT_CACHE.calculate_efh(surface,
+                                                          takeoff_angle,
+                                                          takeoff_point,
+                                                          skier,
+                                                          increment=0.5)
         update_graph = populated_efh_graph(takeoff_point, surface, distance,
                                            efh, speed)
         data = np.vstack((distance, efh)).T
@@ -0,0 +1,271 @@
+import os
+import json
+import math
+import logging
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .version import __version__
+from .functions import make_jump
+from .surfaces import Surface, FlatSurface
+from .trajectories import Trajectory
+from .sweeps import OUTPUT_COLUMNS
+from .utils import InvalidJumpError
+
+# The design parameters of an atlas' lattice, in the order of make_jump().
+AXES = ('slope_angle', 'approach_len', 'takeoff_angle', 'fall_height')
+
+# NOTE : Each design stores these arrays, the length of the parent slope
+# followed by the coordinates of the surfaces and the flight, one after the
+# other in a single memory mapped file of floats.
+_ARRAYS = ('slope_length', 'approach_x', 'approach_y', 'takeoff_x',
+           'takeoff_y', 'landing_x', 'landing_y', 'landing_trans_x',
+           'landing_trans_y', 'flight_t', 'flight_x', 'flight_y')
+
+
+def _atlas_design(design):
+    """Returns the arrays stored for a design, its outputs in the order of
+    OUTPUT_COLUMNS and the reason it failed, an empty string if it didn't."""
+    try:
+        (slope, approach, takeoff, landing, landing_trans, flight,
+         outputs) = make_jump(*design)
+    except InvalidJumpError as e:
+        arrays = [np.empty(0)] * len(_ARRAYS)
+        return arrays, (np.nan,) * len(OUTPUT_COLUMNS), str(e)
+    slope_length = np.hypot(slope.end[0] - slope.start[0],
+                            slope.end[1] - slope.start[1])
+    arrays = [np.array([slope_length])]
+    for surface in (approach, takeoff, landing, landing_trans):
+        arrays += [surface.x, surface.y]
+    arrays += [flight.t, flight.pos[:, 0], flight.pos[:, 1]]
+    return arrays, tuple(outputs[key] for _, key in OUTPUT_COLUMNS), ''
+
+
+def build_atlas(path, slope_angles, approach_lens, takeoff_angles,
+                fall_heights, start_pos=0.0, workers=None):
+    """Makes the jumps for every point of a lattice of design parameters and
+    stores them in an atlas directory that Atlas serves them from.
+
+    Parameters
+    ==========
+    path : string
+        The directory of the atlas, created if it doesn't exist.
+    slope_angles : array_like, shape(n,)
+        The parent slope angles in degrees.
+    approach_lens : array_like, shape(m,)
+        The approach lengths in meters.
+    takeoff_angles : array_like, shape(o,)
+        The takeoff angles in degrees.
+    fall_heights : array_like, shape(p,)
+        The equivalent fall heights in meters.
+    start_pos : float, optional
+        The start position of all of the designs in meters along the parent
+        slope.
+    workers : integer, optional
+        If given, the designs are made by a pool of this many worker
+        processes.
+
+    Notes
+    =====
+    A design stores about 100 kB, so the lattice of every step of the web
+    app's sliders is far too large. The lattice should cover the most used
+    part of the design space, e.g. every degree and every fifth meter of
+    approach.
+
+    """
+
+    axes = [np.sort(np.asarray(values, dtype=float)) for values in
+            (slope_angles, approach_lens, takeoff_angles, fall_heights)]
+    designs = [(slope_angle, start_pos, approach_len, takeoff_angle,
+                fall_height) for slope_angle, approach_len, takeoff_angle,
+               fall_height in itertools.product(*axes)]
+
+    logging.info('Building an atlas of {} designs in {}.'.format(
+        len(designs), path))
+
+    os.makedirs(path, exist_ok=True)
+    # NOTE : The metadata is written last, so an atlas whose build was
+    # interrupted can't be opened.
+    if os.path.exists(os.path.join(path, 'atlas.json')):
+        os.remove(os.path.join(path, 'atlas.json'))
+
+    offsets = np.zeros((len(designs), len(_ARRAYS) + 1), dtype=np.int64)
+    outputs = np.empty((len(designs), len(OUTPUT_COLUMNS)))
+    failures = np.full(len(designs), -1, dtype=np.int32)
+    messages = []
+
+    # NOTE : The arrays are written as they are made, so the atlas never has
+    # to be held in memory.
+    with open(os.path.join(path, 'values.f8'), 'wb') as f:
+
+        def store(results):
+            offset = 0
+            for i, (arrays, design_outputs, failure) in enumerate(results):
+                sizes = [len(array) for array in arrays]
+                offsets[i] = offset + np.cumsum([0] + sizes)
+                offset = offsets[i, -1]
+                for array in arrays:
+                    f.write(np.asarray(array, dtype='<f8').tobytes())
+                outputs[i] = design_outputs
+                if failure:
+                    if failure not in messages:
+                        messages.append(failure)
+                    failures[i] = messages.index(failure)
+
+        if workers is None or workers < 2:
+            store(_atlas_design(design) for design in designs)
+        else:
+            chunksize = max(1, math.ceil(len(designs) / (4 * workers)))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                store(executor.map(_atlas_design, designs,
+                                   chunksize=chunksize))
+
+    np.save(os.path.join(path, 'offsets.npy'), offsets)
+    np.save(os.path.join(path, 'outputs.npy'), outputs)
+    np.save(os.path.join(path, 'failures.npy'), failures)
+
+    meta = {'version': __version__,
+            'start_pos': start_pos,
+            'axes': {name: values.tolist() for name, values in zip(AXES,
+                                                                   axes)},
+            'messages': messages}
+    with open(os.path.join(path, 'atlas.json'), 'w') as f:
+        json.dump(meta, f)
+
+    logging.info('{} of {} designs failed.'.format(np.sum(failures >= 0),
+                                                   len(designs)))
+
+
+class Atlas(object):
+    """Serves the jumps made by build_atlas() for the points of its lattice
+    from the memory mapped atlas files, without integrating them."""
+
+    # NOTE : Values that are within this tolerance of a lattice value are on
+    # the lattice, so slider values with rounding errors are found.
+    tolerance = 1e-6
+
+    def __init__(self, path):
+        """Opens the atlas.
+
+        Parameters
+        ==========
+        path : string
+            The directory of an atlas made by build_atlas().
+
+        """
+
+        with open(os.path.join(path, 'atlas.json')) as f:
+            meta = json.load(f)
+
+        if meta['version'] != __version__:
+            msg = 'The atlas {} was built with skijumpdesign {}, not {}.'
+            raise ValueError(msg.format(path, meta['version'], __version__))
+
+        self.path = path
+        self.start_pos = meta['start_pos']
+        self.axes = [np.array(meta['axes'][name]) for name in AXES]
+        self._messages = meta['messages']
+
+        self._offsets = np.load(os.path.join(path, 'offsets.npy'))
+        self._outputs = np.load(os.path.join(path, 'outputs.npy'))
+        self._failures = np.load(os.path.join(path, 'failures.npy'))
+        if self._offsets[-1, -1] > 0:
+            self._values = np.memmap(os.path.join(path, 'values.f8'),
+                                     dtype='<f8', mode='r')
+        else:  # NOTE : Empty files can't be memory mapped.
+            self._values = np.empty(0)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def index(self, slope_angle, approach_len, takeoff_angle, fall_height):
+        """Returns the index of the design in the atlas or None if it isn't
+        on the lattice."""
+        idxs = []
+        for axis, value in zip(self.axes, (slope_angle, approach_len,
+                                           takeoff_angle, fall_height)):
+            idx = np.argmin(np.abs(axis - value))
+            if abs(axis[idx] - value) > self.tolerance:
+                return None
+            idxs.append(idx)
+        return int(np.ravel_multi_index(idxs, [len(axis) for axis in
+                                               self.axes]))
+
+    def make_jump(self, slope_angle, start_pos, approach_len, takeoff_angle,
+                  fall_height):
+        """Returns the results of make_jump() stored for the design. See
+        make_jump() for the parameters and returns.
+
+        The parent slope is a FlatSurface, the approach, takeoff, landing and
+        landing transition are Surface objects with the stored coordinates
+        and the flight is a Trajectory of the stored positions.
+
+        Raises
+        ======
+        KeyError
+            If the design isn't on the atlas' lattice.
+        InvalidJumpError
+            If make_jump() raised it for the design.
+
+        """
+
+        idx = None
+        if abs(start_pos - self.start_pos) <= self.tolerance:
+            idx = self.index(slope_angle, approach_len, takeoff_angle,
+                             fall_height)
+        if idx is None:
+            raise KeyError((slope_angle, start_pos, approach_len,
+                            takeoff_angle, fall_height))
+
+        if self._failures[idx] >= 0:
+            raise InvalidJumpError(self._messages[self._failures[idx]])
+
+        offsets = self._offsets[idx]
+        # NOTE : Copies, so the returned objects can be modified.
+        arrays = [np.array(self._values[start:end]) for start, end in
+                  zip(offsets[:-1], offsets[1:])]
+
+        slope_angle = self.axes[0][np.unravel_index(
+            idx, [len(axis) for axis in self.axes])[0]]
+        slope = FlatSurface(np.deg2rad(slope_angle), arrays[0][0])
+        surfaces = [Surface(x, y) for x, y in zip(arrays[1:9:2],
+                                                   arrays[2:9:2])]
+        t, x, y = arrays[9:]
+        flight = Trajectory(t, np.vstack((x, y)).T)
+
+        outputs = {key: float(value) for (_, key), value in
+                   zip(OUTPUT_COLUMNS, self._outputs[idx])}
+
+        return (slope, *surfaces, flight, outputs)
+
+
+def _parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description='Builds an atlas of jump designs with build_atlas().')
+    parser.add_argument('path', help='The directory of the atlas.')
+    for name, unit in zip(AXES, ('degrees', 'meters', 'degrees', 'meters')):
+        parser.add_argument('--' + name.replace('_', '-'), type=float,
+                            nargs=3, required=True,
+                            metavar=('START', 'STOP', 'STEP'),
+                            help='The {}s in {}, stop '
+                                 'included.'.format(name.replace('_', ' '),
+                                                    unit))
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='The number of worker processes.')
+    return parser.parse_args(args)
+
+
+def _lattice_axis(start, stop, step):
+    """Returns the values from start to stop, included, spaced by step."""
+    return np.linspace(start, stop, int(round((stop - start) / step)) + 1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args()
+    build_atlas(args.path,
+                *[_lattice_axis(*getattr(args, name)) for name in AXES],
+                workers=args.workers)
@@ -0,0 +1,297 @@
+import io
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+
+import numpy as np
+
+from .version import __version__
+from .skiers import Skier
+from .functions import make_jump
+from .surfaces import Surface, FlatSurface
+from .trajectories import Trajectory
+from .utils import InvalidJumpError, cache_dir
+
+# NOTE : The cache is an optimization, so failing to read or write it, e.g.
+# because the directory is read only, only logs a warning.
+_CACHE_ERRORS = (sqlite3.Error, OSError)
+
+
+def _skier_params(skier):
+    """Returns the parameters of the skier that the results depend on."""
+    return [skier.mass, skier.area, skier.drag_coeff, skier.friction_coeff,
+            skier.tolerable_sliding_acc, skier.tolerable_landing_acc]
+
+
+def _jump_arrays(results):
+    """Returns the arrays stored for the results of make_jump()."""
+    slope, approach, takeoff, landing, landing_trans, flight, outputs = results
+    arrays = {'slope_length': np.hypot(slope.end[0] - slope.start[0],
+                                       slope.end[1] - slope.start[1]),
+              'outputs': json.dumps(outputs)}
+    for name, surface in zip(('approach', 'takeoff', 'landing',
+                              'landing_trans'),
+                             (approach, takeoff, landing, landing_trans)):
+        arrays[name + '_x'] = surface.x
+        arrays[name + '_y'] = surface.y
+    arrays.update(flight_t=flight.t, flight_pos=flight.pos,
+                  flight_vel=flight.vel, flight_acc=flight.acc)
+    return arrays
+
+
+def _jump_results(arrays, slope_angle):
+    """Returns the results of make_jump() from the stored arrays. Like
+    Atlas.make_jump(), the parent slope is a FlatSurface, the other surfaces
+    are Surface objects and the flight is a Trajectory."""
+    slope = FlatSurface(np.deg2rad(slope_angle), float(arrays['slope_length']))
+    surfaces = [Surface(arrays[name + '_x'], arrays[name + '_y']) for name in
+                ('approach', 'takeoff', 'landing', 'landing_trans')]
+    flight = Trajectory(arrays['flight_t'], arrays['flight_pos'],
+                        vel=arrays['flight_vel'], acc=arrays['flight_acc'])
+    outputs = json.loads(str(arrays['outputs']))
+    return (slope, *surfaces, flight, outputs)
+
+
+def _efh_arrays(results):
+    """Returns the arrays stored for the results of calculate_efh()."""
+    return dict(zip(('distance_x', 'efh', 'takeoff_speeds'), results))
+
+
+def _efh_results(arrays):
+    """Returns the results of calculate_efh() from the stored arrays."""
+    return arrays['distance_x'], arrays['efh'], arrays['takeoff_speeds']
+
+
+class ResultCache(object):
+    """A persistent cache of the results of make_jump() and
+    Surface.calculate_efh() stored in a SQLite file, shared by all the
+    processes that use the same file, e.g. the workers of the web app.
+
+    The results are keyed by a hash of the inputs, rounded to ``decimals``
+    decimal places, the skier parameters and the package version. Failures,
+    i.e. InvalidJumpError, are cached too. When the stored results exceed
+    ``max_size`` bytes the least recently used results are removed.
+
+    The results are stored as the arrays of their surfaces, flights and
+    outputs in the NumPy .npz format and are loaded without pickle, so a
+    cache file written by someone else can't execute code. As with Atlas, the
+    returned surfaces are Surface objects, except for the FlatSurface parent
+    slope, and the flight is a Trajectory.
+
+    """
+
+    # NOTE : Inputs are rounded so that the same slider values give the same
+    # key regardless of floating point noise. The functions are called with
+    # the rounded inputs so a hit returns exactly what a miss would.
+    decimals = 6
+    max_size = 2**30  # bytes
+    # NOTE : A make_jump() result is about 120 kB of arrays uncompressed.
+    compression_level = 1
+    timeout = 30.0  # seconds to wait for a lock held by another process
+    # NOTE : Updating the access time of a result needs SQLite's write lock,
+    # so it is only done if the stored time is older than this and is
+    # skipped if another process holds the lock. The eviction order only
+    # needs to be this precise.
+    access_interval = 60.0  # seconds
+
+    def __init__(self, path=None, max_size=None):
+        """Opens the cache, creating the file if needed.
+
+        Parameters
+        ==========
+        path : string, optional
+            The path of the SQLite file, ``results.sqlite`` in cache_dir() by
+            default.
+        max_size : integer, optional
+            The maximum size in bytes of the stored results.
+
+        """
+        if path is None:
+            path = os.path.join(cache_dir(), 'results.sqlite')
+        self.path = path
+        if max_size is not None:
+            self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                # NOTE : With write ahead logging readers don't block the
+                # writer and the writer doesn't block readers. The mode is
+                # stored in the file.
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('CREATE TABLE IF NOT EXISTS results (key TEXT '
+                             'PRIMARY KEY, value BLOB, size INTEGER, '
+                             'accessed REAL)')
+        except _CACHE_ERRORS as e:
+            logging.warning('The result cache {} is not '
+                            'available: {}'.format(path, e))
+
+    def _connect(self):
+        # NOTE : A connection is opened for each operation and closed after
+        # it, because SQLite files can be corrupted if a connection is
+        # inherited by a forked process, e.g. by the workers of a server that
+        # imports the app before forking.
+        return closing(sqlite3.connect(self.path, timeout=self.timeout,
+                                       isolation_level=None))
+
+    def _execute(self, *args):
+        with self._connect() as conn:
+            return conn.execute(*args).fetchall()
+
+    def key(self, name, *inputs):
+        """Returns the key of the results of the named function for the
+        inputs, floats or arrays, which are rounded to ``decimals``."""
+        sha = hashlib.sha1(__version__.encode())
+        sha.update(name.encode())
+        for value in inputs:
+            value = np.round(np.ascontiguousarray(value, dtype=float),
+                             self.decimals)
+            # NOTE : Rounding can give -0.0, which has other bytes than 0.0.
+            value = value + 0.0
+            sha.update(str(value.shape).encode())
+            sha.update(value.tobytes())
+        return sha.hexdigest()
+
+    def get(self, key):
+        """Returns the dictionary of arrays stored for the key or raises a
+        KeyError."""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute('SELECT value, accessed FROM results '
+                                    'WHERE key = ?', (key,)).fetchall()
+        except _CACHE_ERRORS as e:
+            logging.warning('Reading the result cache failed: {}'.format(e))
+            rows = []
+        arrays = None
+        if rows:
+            try:
+                with np.load(io.BytesIO(zlib.decompress(rows[0][0])),
+                             allow_pickle=False) as data:
+                    arrays = {name: data[name] for name in data.files}
+            # NOTE : E.g. results pickled by earlier versions of the cache.
+            except (zlib.error, ValueError, OSError) as e:
+                logging.warning('The cached result could not be read: '
+                                '{}'.format(e))
+        if arrays is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        now = time.time()
+        if now - rows[0][1] > self.access_interval:
+            self._touch(key, now)
+        return arrays
+
+    def _touch(self, key, now):
+        try:
+            # NOTE : Without a timeout the update is skipped instead of
+            # waiting for another process' write.
+            with closing(sqlite3.connect(self.path, timeout=0.0,
+                                         isolation_level=None)) as conn:
+                conn.execute('UPDATE results SET accessed = ? WHERE key = ?',
+                             (now, key))
+        except _CACHE_ERRORS as e:
+            logging.debug('The access time was not updated: {}'.format(e))
+
+    def put(self, key, arrays):
+        """Stores the dictionary of arrays for the key and removes the least
+        recently used results if the cache is too large."""
+        buf = io.BytesIO()
+        np.savez(buf, **arrays)
+        value = zlib.compress(buf.getvalue(), self.compression_level)
+        try:
+            with self._connect() as conn:
+                # NOTE : The insert and eviction are one transaction so that
+                # other processes can't use a result while it is removed.
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.execute('INSERT OR REPLACE INTO results VALUES '
+                                 '(?, ?, ?, ?)',
+                                 (key, value, len(value), time.time()))
+                    self._evict(conn)
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+                conn.execute('COMMIT')
+        except _CACHE_ERRORS as e:
+            logging.warning('Writing the result cache failed: {}'.format(e))
+
+    def _evict(self, conn):
+        rows = conn.execute('SELECT key, size FROM results ORDER BY accessed '
+                            'DESC').fetchall()
+        sizes = np.cumsum([size for _, size in rows])
+        stale = [(key,) for (key, _), size in zip(rows, sizes)
+                 if size > self.max_size]
+        if stale:
+            logging.info('Removing {} results from the result '
+                         'cache.'.format(len(stale)))
+            conn.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def _call(self, key, to_arrays, from_arrays, func, *args, **kwargs):
+        # NOTE : The results are always returned from the stored arrays, so a
+        # hit returns the same types as a miss.
+        try:
+            arrays = self.get(key)
+        except KeyError:
+            try:
+                arrays = to_arrays(func(*args, **kwargs))
+            except InvalidJumpError as e:
+                arrays = {'error': str(e)}
+            self.put(key, arrays)
+            arrays = {name: np.asarray(value) for name, value in
+                      arrays.items()}
+        if 'error' in arrays:
+            raise InvalidJumpError(str(arrays['error']))
+        return from_arrays(arrays)
+
+    def make_jump(self, slope_angle, start_pos, approach_len, takeoff_angle,
+                  fall_height):
+        """Returns the results of make_jump() for the rounded inputs, from the
+        cache if they were calculated before. See make_jump() for the
+        parameters."""
+        inputs = np.round([slope_angle, start_pos, approach_len,
+                           takeoff_angle, fall_height], self.decimals)
+        key = self.key('make_jump', inputs, _skier_params(Skier()))
+        return self._call(key, _jump_arrays,
+                          lambda arrays: _jump_results(arrays, inputs[0]),
+                          make_jump, *inputs.tolist())
+
+    def calculate_efh(self, surface, takeoff_angle, takeoff_point, skier,
+                      increment=0.2, tolerance=None):
+        """Returns the results of surface.calculate_efh() for the rounded
+        inputs, from the cache if they were calculated for a surface with the
+        same coordinates before. See Surface.calculate_efh() for the
+        parameters."""
+        takeoff_angle = round(takeoff_angle, self.decimals)
+        takeoff_point = tuple(np.round(takeoff_point, self.decimals))
+        key = self.key('calculate_efh', surface.x, surface.y, takeoff_angle,
+                       takeoff_point, _skier_params(skier), increment,
+                       np.nan if tolerance is None else tolerance)
+        return self._call(key, _efh_arrays, _efh_results,
+                          surface.calculate_efh, takeoff_angle,
+                          takeoff_point, skier, increment=increment,
+                          tolerance=tolerance)
+
+    def info(self):
+        """Returns the hits and misses of this instance and the number and
+        size in bytes of the stored results."""
+        try:
+            entries, size = self._execute('SELECT COUNT(*), SUM(size) FROM '
+                                          'results')[0]
+        except _CACHE_ERRORS:
+            entries, size = 0, 0
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries,
+                'size': size or 0}
+
+    def clear(self):
+        """Removes all of the stored results."""
+        self._execute('DELETE FROM results')
@@ -1,5 +1,8 @@
 import os
 import logging
+import threading
+from copy import deepcopy
+from collections import OrderedDict
 
 import numpy as np
 from scipy.interpolate import interp1d
@@ -96,9 +99,17 @@ def make_jump(slope_angle, start_pos, approach_len, takeoff_angle, fall_height,
         A dictionary of output values with keys: ``Takeoff Speed``, ``Flight
         Time``, and ``Snow Budget``.
 
-    """
+    Notes
+    =====
+    The jump is made in stages, the approach, takeoff, flight, landing
+    transition and landing, whose results are cached for the last
+    STAGE_CACHE_SIZE sets of the inputs that each stage depends on. Changing
+    only the fall height, for example, reuses the approach, takeoff and first
+    flight. The cache statistics of the stages are returned by
+    make_jump_cache_info() and the caches are cleared with
+    clear_make_jump_cache().
 
-    # TODO : function is too long!
+    """
 
     outputs = {'Takeoff Speed': None,
                'Flight Time': None,
@@ -107,14 +118,74 @@ def make_jump(slope_angle, start_pos, approach_len, takeoff_angle, fall_height,
     logging.info('Calling make_jump({}, {}, {}, {}, {})'.format(
         slope_angle, start_pos, approach_len, takeoff_angle, fall_height))
 
-    skier = Skier()
-
     if takeoff_angle >= 90.0 or takeoff_angle <= slope_angle:
         msg = 'Invalid takeoff angle. Enter value between {} and 90 degrees'
         raise InvalidJumpError(msg.format(slope_angle))
 
+    # NOTE : The stages are cached with the inputs that they depend on, so,
+    # for example, changing the fall height reuses the approach, takeoff and
+    # first flight. Copies of the cached surfaces are returned because they
+    # can be modified, e.g. with Surface.shift_coordinates().
+    skier = Skier()
+    slope_angle, start_pos, approach_len, takeoff_angle, fall_height = (
+        float(slope_angle), float(start_pos), float(approach_len),
+        float(takeoff_angle), float(fall_height))
+    approach_key = (slope_angle, start_pos, approach_len)
+    takeoff_key = approach_key + (takeoff_angle,)
+    landing_key = takeoff_key + (fall_height,)
+
+    approach, takeoff_entry_speed = _STAGE_CACHES['approach'].get(
+        approach_key, _approach_stage, skier, slope_angle, start_pos,
+        approach_len)
+
+    takeoff, takeoff_vel = _STAGE_CACHES['takeoff'].get(
+        takeoff_key, _takeoff_stage, skier, slope_angle, takeoff_angle,
+        approach, takeoff_entry_speed)
+
+    msg = 'Takeoff speed: {:1.3f} [m/s]'
+    takeoff_speed = vel2speed(*takeoff_vel)[0]
+    outputs['Takeoff Speed'] = takeoff_speed
+    logging.info(msg.format(takeoff_speed))
+
+    slope, flight = _STAGE_CACHES['flight'].get(
+        takeoff_key, _flight_stage, skier, slope_angle, approach_len, takeoff,
+        takeoff_vel)
+
+    landing_trans, flight = _STAGE_CACHES['landing transition'].get(
+        landing_key, _landing_trans_stage, skier, fall_height, slope, flight)
+
+    outputs['Flight Time'] = flight.duration
+    outputs['Flight Distance'] = flight.pos[-1, 0] - flight.pos[0, 0]
+    logging.info('Flight time: {:1.3f} [s]'.format(flight.duration))
+
+    slope, landing = _STAGE_CACHES['landing'].get(
+        landing_key, _landing_stage, skier, takeoff_angle, fall_height,
+        slope, takeoff, landing_trans)
+
+    x_at_highest = flight.interp_pos_wrt_slope(0.0)[0]
+    y_at_highest = flight.interp_pos_wrt_x(x_at_highest)[1]
+    outputs['Flight Height'] = y_at_highest - landing.interp_y(x_at_highest)
+
+    budget = snow_budget(slope, takeoff, landing, landing_trans)
+    outputs['Snow Budget'] = budget
+    logging.info('Snow budget: {} m^2'.format(budget))
+
+    logging.debug(make_jump_cache_info())
+
+    slope, approach, takeoff, landing, landing_trans, flight = deepcopy(
+        (slope, approach, takeoff, landing, landing_trans, flight))
+
+    if plot:
+        plot_jump(slope, approach, takeoff, landing, landing_trans, flight)
+        plt.show()
+
+    return slope, approach, takeoff, landing, landing_trans, flight, outputs
+
+
+def _approach_stage(skier, slope_angle, start_pos, approach_len):
+    """Returns the approach of make_jump() and the speed at its end."""
+
     slope_angle = np.deg2rad(slope_angle)
-    takeoff_angle = np.deg2rad(takeoff_angle)
 
     # The approach is the flat slope that the skier starts from rest on to gain
     # speed before reaching the takeoff ramp.
@@ -123,48 +194,72 @@ def make_jump(slope_angle, start_pos, approach_len, takeoff_angle, fall_height,
 
     approach = FlatSurface(slope_angle, approach_len, init_pos=init_pos)
 
+    return approach, skier.end_speed_on(approach)
+
+
+def _takeoff_stage(skier, slope_angle, takeoff_angle, approach,
+                   takeoff_entry_speed):
+    """Returns the takeoff surface of make_jump() and the takeoff
+    velocity."""
+
     # The takeoff surface is the combined circle-clothoid-circle-flat.
     # TODO : If there is not enough speed, then this method will run forever
     # because the skier can't make the jump. Need to raise an error if this is
     # the case.
-    takeoff_entry_speed = skier.end_speed_on(approach)
-    takeoff = TakeoffSurface(skier, slope_angle, takeoff_angle,
-                             takeoff_entry_speed, init_pos=approach.end)
+    takeoff = TakeoffSurface(skier, np.deg2rad(slope_angle),
+                             np.deg2rad(takeoff_angle), takeoff_entry_speed,
+                             init_pos=approach.end)
 
     # The skier becomes airborne after the takeoff surface and the trajectory
     # is computed until the skier contacts the parent slope.
     takeoff_vel = skier.end_vel_on(takeoff, init_speed=takeoff_entry_speed)
 
-    msg = 'Takeoff speed: {:1.3f} [m/s]'
-    takeoff_speed = vel2speed(*takeoff_vel)[0]
-    outputs['Takeoff Speed'] = takeoff_speed
-    logging.info(msg.format(takeoff_speed))
+    return takeoff, takeoff_vel
 
-    slope = FlatSurface(slope_angle, 100 * approach_len)
 
-    flight = skier.fly_to(slope, init_pos=takeoff.end, init_vel=takeoff_vel)
+def _flight_stage(skier, slope_angle, approach_len, takeoff, takeoff_vel):
+    """Returns a long parent slope and the flight of make_jump() from the
+    takeoff to it."""
+
+    slope = FlatSurface(np.deg2rad(slope_angle), 100 * approach_len)
+
+    return slope, skier.fly_to(slope, init_pos=takeoff.end,
+                               init_vel=takeoff_vel)
+
+
+def _landing_trans_stage(skier, fall_height, slope, flight):
+    """Returns the landing transition and the flight to the landing
+    transition of make_jump()."""
 
     # The landing transition curve transfers the max velocity skier from their
     # landing point smoothly to the parent slope.
     landing_trans = LandingTransitionSurface(slope, flight, fall_height,
                                              skier.tolerable_landing_acc)
 
-    slope = FlatSurface(slope_angle, np.sqrt(landing_trans.end[0]**2 +
-                                             landing_trans.end[1]**2) + 1.0)
-
     land_trans_contact = HorizontalSurface(landing_trans.start[1],
                                            50.0,
                                            start=landing_trans.start[0] - 10.0)
 
-    flight = skier.fly_to(land_trans_contact, init_pos=takeoff.end,
-                          init_vel=takeoff_vel)
-    outputs['Flight Time'] = flight.duration
-    outputs['Flight Distance'] = flight.pos[-1, 0] - flight.pos[0, 0]
-    logging.info('Flight time: {:1.3f} [s]'.format(flight.duration))
+    # NOTE : The flight to the landing transition is the first part of the
+    # flight to the parent slope.
+    flight = flight.truncated(land_trans_contact)
+
+    return landing_trans, flight
+
+
+def _landing_stage(skier, takeoff_angle, fall_height, slope, takeoff,
+                   landing_trans):
+    """Returns the parent slope until a meter after the landing transition
+    and the landing surface of make_jump()."""
+
+    # NOTE : The long parent slope of the flight stage is only shortened here,
+    # for the returned slope, the landing surface and the snow budget.
+    slope = FlatSurface(slope.angle, np.sqrt(landing_trans.end[0]**2 +
+                                             landing_trans.end[1]**2) + 1.0)
 
     # The landing surface ensures an equivalent fall height for any skiers that
     # do not reach maximum velocity.
-    landing = LandingSurface(skier, takeoff.end, takeoff_angle,
+    landing = LandingSurface(skier, takeoff.end, np.deg2rad(takeoff_angle),
                              landing_trans.start, fall_height, surf=slope)
 
     logging.info("Num points in landing surface: {}".format(len(landing.x)))
@@ -172,19 +267,65 @@ def make_jump(slope_angle, start_pos, approach_len, takeoff_angle, fall_height,
     if landing.y[0] < slope.interp_y(landing.x[0]):
         raise InvalidJumpError('Fall height is too large.')
 
-    x_at_highest = flight.interp_pos_wrt_slope(0.0)[0]
-    y_at_highest = flight.interp_pos_wrt_x(x_at_highest)[1]
-    outputs['Flight Height'] = y_at_highest - landing.interp_y(x_at_highest)
-
-    budget = snow_budget(slope, takeoff, landing, landing_trans)
-    outputs['Snow Budget'] = budget
-    logging.info('Snow budget: {} m^2'.format(budget))
-
-    if plot:
-        plot_jump(slope, approach, takeoff, landing, landing_trans, flight)
-        plt.show()
-
-    return slope, approach, takeoff, landing, landing_trans, flight, outputs
+    return slope, landing
+
+
+class _StageCache(object):
+    """A least recently used cache of the results of a stage of make_jump()
+    that counts its hits and misses."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        # NOTE : The web app may make jumps in several threads.
+        self._lock = threading.Lock()
+
+    def get(self, key, stage, *args):
+        """Returns the cached result for the key or stores and returns the
+        result of stage(*args)."""
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return self._results[key]
+        result = stage(*args)
+        with self._lock:
+            self.misses += 1
+            self._results[key] = result
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# The stages of make_jump() keep their results for this many sets of inputs.
+STAGE_CACHE_SIZE = 32
+
+_STAGE_CACHES = OrderedDict((name, _StageCache(STAGE_CACHE_SIZE)) for name in
+                            ('approach', 'takeoff', 'flight',
+                             'landing transition', 'landing'))
+
+
+def make_jump_cache_info():
+    """Returns a dictionary that maps the names of the cached stages of
+    make_jump() to dictionaries with the number of ``hits`` and ``misses`` of
+    the stage's cache and its current ``size``."""
+    return {name: {'hits': cache.hits, 'misses': cache.misses,
+                   'size': len(cache._results)}
+            for name, cache in _STAGE_CACHES.items()}
+
+
+def clear_make_jump_cache():
+    """Clears the cached stages of make_jump() and their statistics."""
+    for cache in _STAGE_CACHES.values():
+        cache.clear()
 
 
 def plot_jump(slope, approach, takeoff, landing, landing_trans, flight):
@@ -0,0 +1,153 @@
+import bisect
+
+import numpy as np
+
+
+class Interpolator(object):
+    """Class that linearly interpolates, and extrapolates, tabulated data.
+
+    This gives the same results as::
+
+       scipy.interpolate.interp1d(x, y, axis=0, fill_value='extrapolate')
+
+    but is designed for the many scalar lookups made in the integrators' right
+    hand side and event functions, where the overhead of interp1d dominates.
+    On equally spaced x values the segment is found by direct indexing and on
+    unequally spaced x values the previously used segment and its neighbors
+    are checked before falling back to a binary search.
+
+    """
+
+    # The x values are treated as equally spaced if all spacings are within
+    # this relative tolerance of the first spacing.
+    uniform_rtol = 1e-9
+
+    def __init__(self, x, y):
+        """Instantiates an interpolator.
+
+        Parameters
+        ==========
+        x : array_like, shape(n,)
+            The independent values. If they are monotonically decreasing they
+            are reversed and if they are not monotonic they are sorted.
+        y : array_like, shape(n,) or shape(n, m)
+            The dependent values, each row corresponds to a value in x.
+
+        """
+
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+
+        if x.ndim != 1 or len(x) < 2:
+            raise ValueError('x must be one dimensional with at least two '
+                             'values.')
+        if y.shape[0] != len(x):
+            raise ValueError('y must have the same number of rows as x.')
+
+        dx = np.diff(x)
+        if np.all(dx < 0.0):
+            x, y, dx = x[::-1], y[::-1], -dx[::-1]
+        elif np.any(dx < 0.0):
+            order = np.argsort(x, kind='mergesort')
+            x, y = x[order], y[order]
+            dx = np.diff(x)
+
+        self.x = x
+        self.y = y
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._slopes = (np.diff(y, axis=0) /
+                            dx.reshape((-1,) + (1,) * (y.ndim - 1)))
+
+        self._num_segments = len(x) - 1
+        self._uniform = bool(dx[0] > 0.0 and
+                             np.allclose(dx, dx[0], rtol=self.uniform_rtol,
+                                         atol=0.0))
+        self._x0 = float(x[0])
+        self._inv_dx = 1.0 / float(dx[0]) if self._uniform else None
+
+        # NOTE : Python floats are faster than NumPy scalars for the scalar
+        # lookups.
+        self._x_list = x.tolist()
+        if y.ndim == 1:
+            self._y_list = y.tolist()
+            self._slope_list = self._slopes.tolist()
+        self._last_segment = 0
+
+    def __deepcopy__(self, memo):
+        # NOTE : An interpolator isn't modified after it is created, other than
+        # the hint of the last segment, so copies of the surfaces and
+        # trajectories that hold it share it.
+        return self
+
+    def _find_segment(self, x):
+        """Returns the index of the segment that contains the scalar x, or the
+        first or last segment if x is outside of the data."""
+
+        last = self._num_segments - 1
+
+        if self._uniform:
+            pos = (x - self._x0) * self._inv_dx
+            if pos >= 1.0:
+                if pos < self._num_segments:
+                    return int(pos)
+                return last
+            return 0
+
+        xs = self._x_list
+        i = self._last_segment
+        if xs[i] <= x <= xs[i + 1]:
+            return i
+        if i < last and xs[i + 1] <= x <= xs[i + 2]:
+            i += 1
+        elif i > 0 and xs[i - 1] <= x <= xs[i]:
+            i -= 1
+        else:
+            i = min(max(bisect.bisect_right(xs, x) - 1, 0), last)
+        self._last_segment = i
+        return i
+
+    def __call__(self, x_new):
+        """Returns the interpolated values at x_new.
+
+        Parameters
+        ==========
+        x_new : float or array_like, shape(k,)
+            The values to interpolate at.
+
+        Returns
+        =======
+        float or ndarray, shape(m,) or shape(k,) or shape(k, m)
+            The interpolated values. A scalar x_new gives a float if y is one
+            dimensional and an array of a row of y otherwise.
+
+        """
+
+        # NOTE : NumPy float64 is a subclass of float, so this catches the
+        # values taken from the integrators' state arrays.
+        if isinstance(x_new, float) or np.ndim(x_new) == 0:
+            x_new = float(x_new)
+            i = self._find_segment(x_new)
+            if self.y.ndim == 1:
+                return (self._y_list[i] + self._slope_list[i] *
+                        (x_new - self._x_list[i]))
+            else:
+                return self.y[i] + self._slopes[i] * (x_new - self._x_list[i])
+
+        x_new = np.asarray(x_new, dtype=float)
+
+        if self._uniform:
+            pos = np.floor((x_new - self._x0) * self._inv_dx)
+            # NOTE : fmin/fmax replace NaN so it can be used as an index, the
+            # result is still NaN.
+            idxs = np.fmax(np.fmin(pos, self._num_segments - 1),
+                           0.0).astype(int)
+        else:
+            idxs = np.searchsorted(self.x, x_new, side='right') - 1
+            idxs = np.clip(idxs, 0, self._num_segments - 1)
+
+        delta = x_new - self.x[idxs]
+        if self.y.ndim > 1:
+            delta = delta[..., np.newaxis]
+
+        return self.y[idxs] + self._slopes[idxs] * delta
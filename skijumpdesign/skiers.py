@@ -9,12 +9,204 @@ try:
 except ImportError:
     pycvodes = None
 else:
-    from pycvodes import integrate_adaptive, integrate_predefined
+    from pycvodes import integrate_adaptive
 
-from .trajectories import Trajectory
+from .trajectories import Trajectory, DenseTrajectory
 from .utils import GRAV_ACC, AIR_DENSITY
 from .utils import InvalidJumpError
-from .utils import compute_drag
+from .utils import compute_drag, compute_flight_derivs, compute_slide_derivs
+
+
+def _drag_free_speed(landing_point, takeoff_point, takeoff_angle):
+    """Returns the takeoff speed needed to land at a point without air drag,
+    NaN if the point is not below the takeoff direction."""
+    delx = landing_point[0] - takeoff_point[0]
+    dely = landing_point[1] - takeoff_point[1]
+    drop = delx * np.tan(takeoff_angle) - dely
+    if drop <= 0.0:
+        return np.nan
+    return np.sqrt(delx**2 * GRAV_ACC / (2 * np.cos(takeoff_angle)**2 * drop))
+
+
+def _hermite_state(states0, derivs0, states1, derivs1, dt, frac):
+    """Returns the cubic Hermite interpolation of states inside integration
+    steps of duration dt at the fractions of the step frac, shape(n,)."""
+    frac = np.atleast_1d(frac)[:, np.newaxis]
+    frac2 = frac**2
+    frac3 = frac**3
+    h00 = 2.0 * frac3 - 3.0 * frac2 + 1.0
+    h10 = frac3 - 2.0 * frac2 + frac
+    h01 = -2.0 * frac3 + 3.0 * frac2
+    h11 = frac3 - frac2
+    return (h00 * states0 + h10 * dt * derivs0 + h01 * states1 +
+            h11 * dt * derivs1)
+
+
+def _hermite_root(states0, derivs0, states1, derivs1, dt, func,
+                  num_iterations=50):
+    """Returns the fractions of the integration steps, shape(n,), where
+    func(states), which is positive at the start and negative at the end of
+    each step, crosses zero along the cubic Hermite interpolant of the
+    states. Bisection is used so that every step is solved simultaneously."""
+    lower = np.zeros(states0.shape[0])
+    upper = np.ones(states0.shape[0])
+    for i in range(num_iterations):
+        middle = (lower + upper) / 2.0
+        above = func(_hermite_state(states0, derivs0, states1, derivs1, dt,
+                                    middle)) > 0.0
+        lower = np.where(above, middle, lower)
+        upper = np.where(above, upper, middle)
+    return (lower + upper) / 2.0
+
+
+class _HermiteInterpolant(object):
+    """Piecewise cubic Hermite interpolant of the states, shape(n, m), and
+    their time derivatives at the n times of an integration. Calling it with
+    times, shape(k,), returns the states with shape(m, k), like the dense
+    output of solve_ivp()."""
+
+    def __init__(self, times, states, derivs):
+        self.times = np.asarray(times)
+        self.states = np.asarray(states)
+        self.derivs = np.asarray(derivs)
+
+    def __call__(self, t):
+        t = np.atleast_1d(t)
+        idxs = np.searchsorted(self.times, t, side='right') - 1
+        idxs = np.clip(idxs, 0, len(self.times) - 2)
+        dt = self.times[idxs + 1] - self.times[idxs]
+        return _hermite_state(self.states[idxs], self.derivs[idxs],
+                              self.states[idxs + 1], self.derivs[idxs + 1],
+                              dt[:, np.newaxis], (t - self.times[idxs]) /
+                              dt).T
+
+
+class _FlightFamily(object):
+    """The flights of a skier that takes off from one point at one angle for
+    a grid of takeoff speeds. The flights are integrated once, with the
+    horizontal position as the independent variable, so the takeoff speed
+    and impact velocity needed to land at any point under the family can be
+    interpolated instead of found by shooting."""
+
+    def __init__(self, skier, takeoff_point, takeoff_angle, max_speed, max_x,
+                 num_speeds=200, x_step=0.05, fallback=None):
+        """Instantiates the family of flights.
+
+        Parameters
+        ==========
+        skier : Skier
+            A skier instance.
+        takeoff_point : 2-tuple of floats
+            The (x, y) coordinates of the takeoff point in meters.
+        takeoff_angle : float
+            The takeoff angle in radians.
+        max_speed : float
+            The largest takeoff speed of the family in meters per second.
+        max_x : float
+            The largest horizontal position in meters that landing points
+            will be looked up at.
+        num_speeds : integer, optional
+            The number of takeoff speeds, equally spaced from above zero to
+            max_speed.
+        x_step : float, optional
+            The spacing in meters of the horizontal positions the flights are
+            integrated to.
+        fallback : function, optional
+            A function with the signature ``fallback(landing_point)`` that
+            returns the takeoff speed and impact velocity of points that are
+            not between the family's flights. Defaults to
+            Skier.speed_to_land_at().
+
+        """
+
+        self.skier = skier
+        self.takeoff_point = takeoff_point
+        self.takeoff_angle = takeoff_angle
+        self.speeds = np.linspace(0.0, max_speed, num=num_speeds + 1)[1:]
+        self.x_step = x_step
+        self._fallback = fallback
+
+        self._drag_per_mass = (AIR_DENSITY * skier.drag_coeff * skier.area /
+                               2.0 / skier.mass)
+
+        num_steps = int(np.ceil((max_x - takeoff_point[0]) / x_step)) + 1
+
+        # the states [y, vx, vy] of each flight at each x and their
+        # derivatives with respect to x
+        self.states = np.empty((num_steps + 1, num_speeds, 3))
+        self.derivs = np.empty((num_steps + 1, num_speeds, 3))
+
+        states = np.empty((num_speeds, 3))
+        states[:, 0] = takeoff_point[1]
+        states[:, 1] = self.speeds * np.cos(takeoff_angle)
+        states[:, 2] = self.speeds * np.sin(takeoff_angle)
+
+        h = x_step
+        for i in range(num_steps + 1):
+            k1 = self._rhs(states)
+            self.states[i] = states
+            self.derivs[i] = k1
+            k2 = self._rhs(states + h / 2.0 * k1)
+            k3 = self._rhs(states + h / 2.0 * k2)
+            k4 = self._rhs(states + h * k3)
+            states = states + h / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+    def _rhs(self, states):
+        """Returns the derivatives of the flight states [y, vx, vy],
+        shape(n, 3), with respect to the horizontal position."""
+        vx = states[:, 1]
+        vy = states[:, 2]
+        derivs = np.empty_like(states)
+        derivs[:, 0] = vy / vx
+        derivs[:, 1] = -self._drag_per_mass * np.abs(vx)
+        derivs[:, 2] = (-GRAV_ACC - self._drag_per_mass * vy * np.abs(vy)) / vx
+        return derivs
+
+    def speed_to_land_at(self, landing_point):
+        """Returns the magnitude of the velocity required to land at a
+        specific point and the velocity at that point, like
+        Skier.speed_to_land_at(). Points that are not between the family's
+        flights are found with the fallback function."""
+
+        x, y = landing_point
+
+        # NOTE : The flights are interpolated to x with cubic Hermite
+        # polynomials and then the speed and impact velocity are interpolated
+        # to y with cubic polynomials through the four nearest flights.
+        pos = (x - self.takeoff_point[0]) / self.x_step
+        i = min(max(int(pos), 0), len(self.states) - 2)
+        states = _hermite_state(self.states[i], self.derivs[i],
+                                self.states[i + 1], self.derivs[i + 1],
+                                self.x_step, np.full(len(self.speeds),
+                                                     pos - i))
+
+        heights = states[:, 0]
+        j = np.searchsorted(heights, y)
+
+        # NOTE : The flights of the slowest tenth of the takeoff speeds fan
+        # out too quickly to interpolate between.
+        if (x <= self.takeoff_point[0] or pos > len(self.states) - 1 or
+                j < max(2, len(self.speeds) // 10) or
+                j > len(self.speeds) - 2 or
+                np.any(np.diff(heights[j - 2:j + 2]) <= 0.0)):
+            if self._fallback is not None:
+                return self._fallback(landing_point)
+            return self.skier.speed_to_land_at(landing_point,
+                                               self.takeoff_point,
+                                               self.takeoff_angle)
+
+        idxs = slice(j - 2, j + 2)
+        nodes = heights[idxs]
+        weights = np.ones(4)
+        for a in range(4):
+            for b in range(4):
+                if a != b:
+                    weights[a] *= (y - nodes[b]) / (nodes[a] - nodes[b])
+
+        takeoff_speed = weights.dot(self.speeds[idxs])
+        impact_vel = weights.dot(states[idxs, 1:])
+
+        return takeoff_speed, (impact_vel[0], impact_vel[1])
 
 
 class Skier(object):
@@ -25,6 +217,16 @@ class Skier(object):
     samples_per_sec = 360  # Hz
     # If the skier flies too long the integration will be stopped.
     max_flight_time = 30.0  # seconds
+    # Fixed time step used by the batched integrators when no trajectories
+    # are requested.
+    batch_time_step = 0.02  # seconds
+    # speed_to_land_at() gives up if it does not converge within this many
+    # flights or this much time.
+    max_shooting_iterations = 50
+    max_shooting_time = 30.0  # seconds
+    # speed_to_land_at() finds a takeoff speed that passes this close to the
+    # landing point.
+    shooting_tolerance = 1e-6  # meters
 
     def __init__(self, mass=75.0, area=0.34, drag_coeff=0.821,
                  friction_coeff=0.03, tolerable_sliding_acc=1.5,
@@ -90,6 +292,13 @@ class Skier(object):
 
         return -np.sign(speed) * self.friction_coeff * normal_force
 
+    def _flight_derivs(self, state):
+        """Returns the 4 x 5 array holding the time derivatives of the flight
+        states in the first column and their Jacobian in the rest."""
+        return compute_flight_derivs(state[2], state[3], self.mass,
+                                     self.area, self.drag_coeff, AIR_DENSITY,
+                                     GRAV_ACC)
+
     def _flight_rhs(self, t, state):
         """Returns the time derivative of the skier's state during flight.
 
@@ -102,19 +311,21 @@ class Skier(object):
 
         Returns
         =======
-        4-tuple of floats
+        ndarray, shape(4,)
             The values of the derivatives of the states.
 
         """
-
-        xdot = state[2]
-        ydot = state[3]
-        # TODO : sympy autowrap these entire expressions instead of just
-        # drag_force().
-        vxdot = self.drag_force(xdot) / self.mass
-        vydot = -GRAV_ACC + self.drag_force(ydot) / self.mass
-
-        return xdot, ydot, vxdot, vydot
+        return self._flight_derivs(state)[:, 0]
+
+    def _flight_rhs_sensitivity(self, t, state):
+        """Returns the time derivatives of the flight states, state[:4], and of
+        their derivatives with respect to a takeoff parameter, state[4:],
+        which are governed by the variational equations."""
+        derivs = self._flight_derivs(state)
+        dsdt = np.empty(8)
+        dsdt[:4] = derivs[:, 0]
+        dsdt[4:] = derivs[:, 1:].dot(state[4:])
+        return dsdt
 
     def _flight_rhs_sundials(self, t, s, dsdt):
         """Populates the time derivative of the skier's state during flight.
@@ -129,16 +340,258 @@ class Skier(object):
             The values of the time derivatives of the states.
 
         """
+        dsdt[:] = self._flight_derivs(s)[:, 0]
+
+    def _flight_jac_sundials(self, t, s, jmat_out, dfdt_out=None, fy=None):
+        """Populates the Jacobian of the time derivative of the skier's state
+        during flight.
+
+        Parameters
+        ==========
+        t : float
+            The value of time in seconds.
+        s : array_like, shape(4,)
+            The values of the states: [x, y, vx, vy].
+        jmat_out : array_like, shape(4, 4)
+            The partial derivatives of the state derivatives with respect to
+            the states.
+        dfdt_out : array_like, shape(4,), optional
+            The partial derivatives of the state derivatives with respect to
+            time.
+
+        """
+        jmat_out[:, :] = self._flight_derivs(s)[:, 1:]
+        if dfdt_out is not None:
+            dfdt_out[:] = 0.0
+
+    def _flight_rhs_sensitivity_sundials(self, t, s, dsdt):
+        """Populates the time derivatives of the flight states and their
+        sensitivities, see _flight_rhs_sensitivity()."""
+        dsdt[:] = self._flight_rhs_sensitivity(t, s)
+
+    def _flight_jac_sensitivity_sundials(self, t, s, jmat_out, dfdt_out=None,
+                                         fy=None):
+        """Populates the Jacobian of the time derivatives of the flight states
+        and their sensitivities, shape(8, 8), see
+        _flight_rhs_sensitivity()."""
+        jac = self._flight_derivs(s)[:, 1:]
+        drag_per_mass = AIR_DENSITY * self.drag_coeff * self.area / 2.0 / \
+            self.mass
+        jmat_out[:, :] = 0.0
+        jmat_out[:4, :4] = jac
+        jmat_out[4:, 4:] = jac
+        # NOTE : The Jacobian depends on the velocities through the drag.
+        jmat_out[6, 2] = -2.0 * drag_per_mass * np.sign(s[2]) * s[6]
+        jmat_out[7, 3] = -2.0 * drag_per_mass * np.sign(s[3]) * s[7]
+        if dfdt_out is not None:
+            dfdt_out[:] = 0.0
+
+    def _flight_rhs_many(self, states):
+        """Returns the time derivatives of many skiers' states during flight.
+
+        Parameters
+        ==========
+        states : ndarray, shape(n, 4)
+            The values of the states for each of the n skiers: [x, y, vx, vy].
+
+        Returns
+        =======
+        ndarray, shape(n, 4)
+            The values of the derivatives of the states.
+
+        """
+
+        # NOTE : drag is -sign(v) / 2 * ro * C * A * v**2, written with abs()
+        # so it vectorizes without the compiled scalar drag function.
+        drag_per_mass = AIR_DENSITY * self.drag_coeff * self.area / 2.0 / \
+            self.mass
+
+        vx = states[:, 2]
+        vy = states[:, 3]
+
+        derivs = np.empty_like(states)
+        derivs[:, 0] = vx
+        derivs[:, 1] = vy
+        derivs[:, 2] = -drag_per_mass * vx * np.abs(vx)
+        derivs[:, 3] = -GRAV_ACC - drag_per_mass * vy * np.abs(vy)
+
+        return derivs
+
+    def _flight_rhs_sensitivity_many(self, states):
+        """Returns the time derivatives of many skiers' flight states and
+        sensitivities, shape(n, 8), see _flight_rhs_sensitivity()."""
+
+        drag_per_mass = AIR_DENSITY * self.drag_coeff * self.area / 2.0 / \
+            self.mass
 
-        xdot = s[2]
-        ydot = s[3]
-        vxdot = self.drag_force(xdot) / self.mass
-        vydot = -GRAV_ACC + self.drag_force(ydot) / self.mass
+        derivs = np.empty_like(states)
+        derivs[:, :4] = self._flight_rhs_many(states[:, :4])
+        derivs[:, 4] = states[:, 6]
+        derivs[:, 5] = states[:, 7]
+        derivs[:, 6] = -2.0 * drag_per_mass * np.abs(states[:, 2]) * \
+            states[:, 6]
+        derivs[:, 7] = -2.0 * drag_per_mass * np.abs(states[:, 3]) * \
+            states[:, 7]
 
-        dsdt[0] = xdot
-        dsdt[1] = ydot
-        dsdt[2] = vxdot
-        dsdt[3] = vydot
+        return derivs
+
+    def fly_to_many(self, surface, init_pos, init_vels, trajectories=False,
+                    time_step=None, logging_type='info'):
+        """Returns the impact times and states of many skiers that fly from
+        the provided initial conditions to the surface. All of the flights are
+        advanced together with a fixed step fourth order Runge-Kutta method
+        and each impact is located inside its final step with cubic Hermite
+        interpolation.
+
+        Parameters
+        ==========
+        surface : Surface
+            A landing surface. This surface must intersect the flight paths.
+        init_pos : array_like, shape(2,) or shape(n, 2)
+            The x and y coordinates of the starting point of the flights in
+            meters. A single point is shared by all flights.
+        init_vels : array_like, shape(n, 2)
+            The x and y components of each skier's velocity at the start of
+            the flight in meters per second.
+        trajectories : boolean, optional
+            If True a Trajectory is also returned for each flight.
+        time_step : float, optional
+            The integration time step in seconds. Defaults to
+            1/Skier.samples_per_sec if trajectories are requested, otherwise
+            to the coarser Skier.batch_time_step.
+        logging_type : string
+            The logging level desired for the non-debug logging calls in this
+            function.
+
+        Returns
+        =======
+        impact_times : ndarray, shape(n,)
+            The flight duration in seconds of each skier. NaN if the skier did
+            not contact the surface within Skier.max_flight_time.
+        impact_states : ndarray, shape(n, 4)
+            The [x, y, vx, vy] state of each skier at impact. NaN if the skier
+            did not contact the surface within Skier.max_flight_time.
+        trajs : list of Trajectory
+            The flight trajectories, only returned if ``trajectories`` is True.
+            None is given for the skiers that do not contact the surface.
+
+        """
+        logging_call = getattr(logging, logging_type)
+
+        init_vels = np.atleast_2d(np.asarray(init_vels, dtype=float))
+        num = init_vels.shape[0]
+        init_pos = np.broadcast_to(np.asarray(init_pos, dtype=float),
+                                   (num, 2))
+
+        def height_above(states):
+            # NOTE : The vertical gap changes sign exactly where the signed
+            # distance from the surface does and is cheap to evaluate for many
+            # points at once.
+            return states[:, 1] - surface.interp_y(states[:, 0])
+
+        if time_step is not None:
+            dt = time_step
+        elif trajectories:
+            dt = 1.0 / self.samples_per_sec
+        else:
+            dt = self.batch_time_step
+        num_steps = int(np.ceil(self.max_flight_time / dt))
+
+        states = np.hstack((init_pos, init_vels))
+        derivs = self._flight_rhs_many(states)
+        gaps = height_above(states)
+
+        impact_times = np.full(num, np.nan)
+        impact_states = np.full((num, 4), np.nan)
+
+        # indices of the skiers that are still in the air
+        flying = np.arange(num)
+
+        # NOTE : Only the states of the skiers that are still in the air are
+        # recorded, with their indices, so the memory used is proportional to
+        # the total number of steps flown instead of num_steps * num.
+        if trajectories:
+            history_idxs = [flying]
+            history = [states.copy()]
+            history_derivs = [derivs.copy()]
+
+        logging_call('Integrating {} skier flights.'.format(num))
+        start_time = time.time()
+
+        for step in range(num_steps):
+
+            k1 = derivs
+            k2 = self._flight_rhs_many(states + dt / 2.0 * k1)
+            k3 = self._flight_rhs_many(states + dt / 2.0 * k2)
+            k4 = self._flight_rhs_many(states + dt * k3)
+            new_states = states + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            new_derivs = self._flight_rhs_many(new_states)
+            new_gaps = height_above(new_states)
+
+            # NOTE : always from above surface, positive to negative crossing,
+            # this matches the event direction used in fly_to().
+            landed = (gaps >= 0.0) & (new_gaps <= 0.0)
+
+            if np.any(landed):
+                frac = _hermite_root(states[landed], derivs[landed],
+                                     new_states[landed], new_derivs[landed],
+                                     dt, height_above)
+                idxs = flying[landed]
+                impact_times[idxs] = (step + frac) * dt
+                impact_states[idxs] = _hermite_state(
+                    states[landed], derivs[landed], new_states[landed],
+                    new_derivs[landed], dt, frac)
+
+            keep = ~landed
+            flying = flying[keep]
+            states = new_states[keep]
+            derivs = new_derivs[keep]
+            gaps = new_gaps[keep]
+
+            if trajectories:
+                history_idxs.append(flying)
+                history.append(states)
+                history_derivs.append(derivs)
+
+            if len(flying) == 0:
+                break
+
+        if len(flying) > 0:
+            msg = ('{} of {} flying skiers did not contact ground within '
+                   '{:1.3f} seconds.')
+            logging.warning(msg.format(len(flying), num,
+                                       self.max_flight_time))
+
+        msg = 'Flight integration of {} skiers finished in {:1.3f} seconds.'
+        logging_call(msg.format(num, time.time() - start_time))
+
+        if not trajectories:
+            return impact_times, impact_states
+
+        # NOTE : A stable sort groups the recorded states by skier and keeps
+        # each skier's states in time order.
+        history_idxs = np.concatenate(history_idxs)
+        order = np.argsort(history_idxs, kind='stable')
+        history = np.concatenate(history)[order]
+        history_derivs = np.concatenate(history_derivs)[order]
+        steps_flown = np.bincount(history_idxs, minlength=num)
+        starts = np.cumsum(steps_flown) - steps_flown
+
+        trajs = []
+        for i in range(num):
+            if np.isnan(impact_times[i]):
+                trajs.append(None)
+                continue
+            n = steps_flown[i]
+            rows = slice(starts[i], starts[i] + n)
+            t = np.hstack((np.arange(n) * dt, impact_times[i]))
+            sts = np.vstack((history[rows], impact_states[i]))
+            acc = np.vstack((history_derivs[rows, 2:],
+                             self._flight_rhs_many(impact_states[i:i + 1])[:,
+                                                                           2:]))
+            trajs.append(Trajectory(t, sts[:, :2], vel=sts[:, 2:], acc=acc))
+
+        return impact_times, impact_states, trajs
 
     def fly_to(self, surface, init_pos, init_vel, fine=True, compute_acc=True,
                logging_type='info'):
@@ -157,9 +610,9 @@ class Skier(object):
             The x and y components of the skier's velocity at the start of the
             flight in meters per second.
         fine : boolean
-            If True two integrations occur. The first finds the landing time
-            with coarse time steps and the second integrates over a finer
-            equally spaced time steps. False will skip the second integration.
+            If True the trajectory is sampled at equally spaced times, at
+            Skier.samples_per_sec, from the integrator's dense output when it
+            is first accessed. False returns the integrator's time steps.
         compute_acc : boolean, optional
             If true acceleration will be calculated. If false acceleration is
             set to zero.
@@ -220,7 +673,8 @@ class Skier(object):
                         (0.0, self.max_flight_time),
                         init_pos + init_vel,
                         events=(touch_surface, ),
-                        rtol=1e-6, atol=1e-9)
+                        rtol=1e-6, atol=1e-9,
+                        dense_output=fine)
 
         impact_time = sol.t[-1]
 
@@ -242,25 +696,11 @@ class Skier(object):
         logging.debug(sol.y[:, -1])
         logging.debug(touch_surface(impact_time, sol.y[:, -1]))
 
-        if fine:  # integrate at desired resolution
-            times = np.linspace(0.0, impact_time,
-                                num=int(self.samples_per_sec * impact_time))
-            sol = solve_ivp(self._flight_rhs,
-                            (0.0, impact_time),
-                            init_pos + init_vel,
-                            t_eval=times,
-                            rtol=1e-6,
-                            atol=1e-9)
-
         msg = 'Flight integration finished in {:1.3f} seconds.'
         logging_call(msg.format(time.time() - start_time))
 
-        impact_time = sol.t[-1]
-
-        logging.debug(impact_time)
-        logging.debug(impact_time - te)
-        logging.debug(sol.y[:, -1])
-        logging.debug(touch_surface(impact_time, sol.y[:, -1]))
+        if fine:  # sample the dense output at the desired resolution
+            return self._dense_flight(sol.sol, impact_time, compute_acc)
 
         # NOTE : This prevents Trajectory from running the acceleration
         # gradient if not needed.
@@ -271,6 +711,24 @@ class Skier(object):
 
         return Trajectory(sol.t, sol.y[:2].T, vel=sol.y[2:].T, acc=acc)
 
+    def _dense_flight(self, dense, impact_time, compute_acc):
+        """Returns a flight trajectory that is sampled at samples_per_sec from
+        the interpolant dense(times), which returns the states with shape(4,
+        n), when first accessed."""
+
+        def sample(times):
+            states = dense(times)
+            # NOTE : This prevents Trajectory from running the acceleration
+            # gradient if not needed.
+            if compute_acc:
+                acc = None
+            else:
+                acc = np.zeros_like(states[:2].T)
+            return {'pos': states[:2].T, 'vel': states[2:].T, 'acc': acc}
+
+        return DenseTrajectory((0.0, impact_time), sample,
+                               self.samples_per_sec)
+
     def _fly_to_sundials(self, surface, init_pos, init_vel, fine=True,
                          compute_acc=True, logging_type='info'):
 
@@ -285,7 +743,8 @@ class Skier(object):
         start_time = time.time()
 
         times, states, info = integrate_adaptive(rhs=self._flight_rhs_sundials,
-                                                 jac=None,
+                                                 jac=self._flight_jac_sundials,
+                                                 method='adams',
                                                  y0=init_pos + init_vel,
                                                  x0=0.0,
                                                  xend=self.max_flight_time,
@@ -307,20 +766,14 @@ class Skier(object):
         msg = 'Flight impact event occurred at {:1.3f} s'
         #logging_call(msg.format(float(te)))
 
-        if fine:  # integrate at desired resolution
-            times = np.linspace(0.0, impact_time,
-                                num=int(self.samples_per_sec * impact_time))
-            states, info = integrate_predefined(self._flight_rhs_sundials,
-                                                None,
-                                                init_pos + init_vel,
-                                                times,
-                                                1e-9,
-                                                1e-6,
-                                                1e-8)
-
         msg = 'Flight integration finished in {:1.3f} seconds.'
         logging_call(msg.format(time.time() - start_time))
 
+        if fine:  # sample the dense output at the desired resolution
+            dense = _HermiteInterpolant(times, states,
+                                        self._flight_rhs_many(states))
+            return self._dense_flight(dense, impact_time, compute_acc)
+
         # NOTE : This prevents Trajectory from running the acceleration
         # gradient if not needed.
         if compute_acc:
@@ -330,6 +783,122 @@ class Skier(object):
 
         return Trajectory(times, states[:, :2], vel=states[:, 2:], acc=acc)
 
+    def impact_state(self, init_pos, init_vel, surface=None, x=None,
+                     logging_type='debug', sensitivity=None):
+        """Returns the time and state of the skier at the end of a flight
+        without building a trajectory. The flight ends when the skier contacts
+        the surface or, if x is given instead, reaches that horizontal
+        position. This is intended for the shooting loops that only need the
+        state at a single point of many flights.
+
+        Parameters
+        ==========
+        init_pos : 2-tuple of floats
+            The x and y coordinates of the starting point of the flight in
+            meters.
+        init_vel : 2-tuple of floats
+            The x and y components of the skier's velocity at the start of the
+            flight in meters per second.
+        surface : Surface, optional
+            A landing surface. This surface must intersect the flight path.
+        x : float, optional
+            The horizontal position in meters at which the flight ends. The
+            flight is not stopped by any surface before it reaches x.
+        logging_type : string
+            The logging level desired for the non-debug logging calls in this
+            function.
+        sensitivity : 2-tuple of floats, optional
+            The derivatives of the initial velocity with respect to a
+            parameter, e.g. the takeoff direction for the takeoff speed. If
+            given, the flight's variational equations are integrated too.
+
+        Returns
+        =======
+        time : float
+            The duration of the flight in seconds.
+        state : ndarray, shape(4,) or shape(8,)
+            The x and y coordinates in meters and the x and y components of
+            the velocity in meters per second at the end of the flight. If
+            sensitivity is given, followed by the derivatives of these four
+            with respect to the parameter at the end time.
+
+        Raises
+        ======
+        InvalidJumpError
+           Error if the flight does not end within Skier.max_flight_time.
+
+        Notes
+        =====
+        The flight is integrated once with the same tolerances as
+        ``fly_to()`` and the end is located on the integrator's interpolant
+        of the last step.
+
+        """
+        if (surface is None) == (x is None):
+            raise ValueError('Either surface or x must be given.')
+
+        logging_call = getattr(logging, logging_type)
+
+        if x is None:
+            def end_dist(state):
+                return surface.distance_from(state[0], state[1])
+            # NOTE: always from above surface, positive to negative crossing
+            direction = -1
+        else:
+            def end_dist(state):
+                return state[0] - x
+            direction = 1 if x > init_pos[0] else -1
+
+        init_state = tuple(init_pos) + tuple(init_vel)
+        if sensitivity is None:
+            rhs, rhs_sundials, jac_sundials = (self._flight_rhs,
+                                               self._flight_rhs_sundials,
+                                               self._flight_jac_sundials)
+        else:
+            init_state += (0.0, 0.0) + tuple(sensitivity)
+            rhs, rhs_sundials, jac_sundials = (
+                self._flight_rhs_sensitivity,
+                self._flight_rhs_sensitivity_sundials,
+                self._flight_jac_sensitivity_sundials)
+
+        if pycvodes is not None:
+
+            def end_flight_sundials(t, state, out):
+                out[0] = end_dist(state)
+
+            times, states, info = integrate_adaptive(
+                rhs=rhs_sundials, jac=jac_sundials,
+                method='adams', y0=init_state, x0=0.0,
+                xend=self.max_flight_time, atol=1e-9, rtol=1e-6,
+                roots=end_flight_sundials, nroots=1, return_on_root=True)
+            time, state = times[-1], states[-1]
+        else:
+
+            def end_flight(t, state):
+                return end_dist(state)
+
+            end_flight.terminal = True
+            end_flight.direction = direction
+
+            # NOTE : solve_ivp ends the solution at a terminal event with the
+            # state evaluated on the step's interpolant.
+            sol = solve_ivp(rhs, (0.0, self.max_flight_time), init_state,
+                            events=(end_flight, ), rtol=1e-6, atol=1e-9)
+            time, state = sol.t[-1], sol.y[:, -1]
+
+        if isclose(time, self.max_flight_time) or time > self.max_flight_time:
+            if x is None:
+                msg = ('Flying skier did not contact ground within {:1.3f} '
+                       'seconds, integration aborted.')
+                raise InvalidJumpError(msg.format(self.max_flight_time))
+            msg = ('Flying skier did not reach x = {:1.3f} within {:1.3f} '
+                   'seconds, integration aborted.')
+            raise InvalidJumpError(msg.format(x, self.max_flight_time))
+
+        logging_call('Flight ended at {:1.3f} s.'.format(time))
+
+        return time, state
+
     def slide_on(self, surface, init_speed=0.0, fine=True):
         """Returns the trajectory of the skier sliding over a surface.
 
@@ -341,9 +910,9 @@ class Skier(object):
             The magnitude of the velocity of the skier at the start of the
             surface which is directed tangent to the surface.
         fine : boolean
-            If True two integrations occur. The first finds the exit time with
-            coarse time steps and the second integrates over a finer equally
-            spaced time steps. False will skip the second integration.
+            If True the trajectory is sampled at equally spaced times, at
+            Skier.samples_per_sec, from the integrator's dense output when it
+            is first accessed. False returns the integrator's time steps.
 
         Returns
         =======
@@ -367,14 +936,12 @@ class Skier(object):
             slope = surface.interp_slope(x)
             kurva = surface.interp_curvature(x)
 
-            theta = np.arctan(slope)
-
-            xdot = v * np.cos(theta)
-            vdot = -GRAV_ACC * np.sin(theta) + (
-                (self.drag_force(v) + self.friction_force(v, slope, kurva)) /
-                self.mass)
-
-            return xdot, vdot
+            # NOTE : The Jacobian columns are not needed by the explicit
+            # integrator, so the slope and curvature derivatives are zeroed.
+            return compute_slide_derivs(v, slope, kurva, 0.0, 0.0, self.mass,
+                                        self.area, self.drag_coeff,
+                                        self.friction_coeff, AIR_DENSITY,
+                                        GRAV_ACC)[:, 0]
 
         def reach_end(t, state):
             """Returns zero when the skier gets to the end of the approach
@@ -389,13 +956,9 @@ class Skier(object):
         sol = solve_ivp(rhs,
                         (0.0, 1000.0),  # time span
                         (surface.x[0], init_speed),  # initial conditions
-                        events=(reach_end, ))
-
-        if fine:
-            times = np.linspace(0.0, sol.t[-1],
-                                num=int(self.samples_per_sec * sol.t[-1]))
-            sol = solve_ivp(rhs, (0.0, sol.t[-1]), (surface.x[0], init_speed),
-                            t_eval=times)
+                        events=(reach_end, ),
+                        rtol=1e-6, atol=1e-9,
+                        dense_output=fine)
 
         msg = 'Sliding integration finished in {} seconds.'
         logging.info(msg.format(time.time() - start_time))
@@ -407,19 +970,31 @@ class Skier(object):
                    'the end of the surface.')
             raise InvalidJumpError(msg)
 
-        y = surface.interp_y(sol.y[0])
-        slope = surface.interp_slope(sol.y[0])
-        angle = np.arctan(slope)
-        vx = sol.y[1] * np.cos(angle)
-        vy = sol.y[1] * np.sin(angle)
+        def sample(states):
+            y = surface.interp_y(states[0])
+            slope = surface.interp_slope(states[0])
+            angle = np.arctan(slope)
+            vx = states[1] * np.cos(angle)
+            vy = states[1] * np.sin(angle)
+            return {'pos': np.vstack((states[0], y)).T,
+                    'vel': np.vstack((vx, vy)).T,
+                    'speed': states[1]}
+
+        if fine:  # sample the dense output at the desired resolution
+            return DenseTrajectory((0.0, sol.t[-1]),
+                                   lambda times: sample(sol.sol(times)),
+                                   self.samples_per_sec)
 
-        return Trajectory(sol.t, np.vstack((sol.y[0], y)).T,
-                          vel=np.vstack((vx, vy)).T, speed=sol.y[1])
+        return Trajectory(sol.t, **sample(sol.y))
 
     def end_speed_on(self, surface, **kwargs):
         """Returns the ending speed after sliding on the provided surface.
         Keyword args are passed to Skier.slide_on()."""
 
+        # NOTE : Only the final state is needed, so the trajectory isn't
+        # sampled unless asked for.
+        kwargs.setdefault('fine', False)
+
         traj = self.slide_on(surface, **kwargs)
 
         return traj.speed[-1]
@@ -428,11 +1003,172 @@ class Skier(object):
         """Returns the ending velocity (vx, vy) after sliding on the provided
         surface. Keyword args are passed to Skier.slide_on()."""
 
+        kwargs.setdefault('fine', False)
+
         traj = self.slide_on(surface, **kwargs)
         return tuple(traj.vel[-1])
 
+    def slide_on_many(self, surface, init_speeds, skiers=None, time_step=None,
+                      max_time=1000.0):
+        """Returns the exit speeds and velocities of many skiers sliding over
+        a surface. All of the slides are advanced together with a fixed step
+        fourth order Runge-Kutta method and the exit is located inside the
+        final step with cubic Hermite interpolation. No trajectories are
+        created.
+
+        Parameters
+        ==========
+        surface : Surface
+            A surface that the skiers will slide on.
+        init_speeds : array_like, shape(n,)
+            The magnitude of the velocity of each skier at the start of the
+            surface which is directed tangent to the surface.
+        skiers : sequence of Skier, optional
+            A skier for each initial speed that supplies the mass, area, drag
+            coefficient, and friction coefficient. If not provided, all of the
+            slides use this skier's properties.
+        time_step : float, optional
+            The integration time step in seconds. Defaults to
+            Skier.batch_time_step.
+        max_time : float, optional
+            Slides that have not reached the end of the surface after this
+            many seconds are stopped.
+
+        Returns
+        =======
+        exit_speeds : ndarray, shape(n,)
+            The speed of each skier at the end of the surface. NaN if the skier
+            did not reach the end.
+        exit_vels : ndarray, shape(n, 2)
+            The (vx, vy) velocity of each skier at the end of the surface. NaN
+            if the skier did not reach the end.
+        reached_end : ndarray of bool, shape(n,)
+            False if the skier's tangential speed became negative or the skier
+            did not reach the end of the surface within ``max_time``.
+
+        """
+
+        init_speeds = np.atleast_1d(np.asarray(init_speeds, dtype=float))
+        num = len(init_speeds)
+
+        if skiers is None:
+            skiers = [self] * num
+        elif len(skiers) != num:
+            raise ValueError('There must be one skier per initial speed.')
+
+        drag_per_mass = np.array([AIR_DENSITY * s.drag_coeff * s.area / 2.0 /
+                                  s.mass for s in skiers])
+        friction_coeff = np.array([s.friction_coeff for s in skiers])
+
+        def rhs(states, idxs):
+            """Returns the time derivatives of the [x, v] states of the skiers
+            with indices idxs."""
+
+            x = states[:, 0]
+            v = states[:, 1]
+
+            slope = surface.interp_slope(x)
+            kurva = surface.interp_curvature(x)
+
+            theta = np.arctan(slope)
+
+            drag = -drag_per_mass[idxs] * v * np.abs(v)
+            # NOTE : This matches Skier.friction_force() which uses the tangent
+            # of the slope.
+            friction = -np.sign(v) * friction_coeff[idxs] * (
+                GRAV_ACC * np.cos(np.tan(slope)) + kurva * v**2)
+
+            derivs = np.empty_like(states)
+            derivs[:, 0] = v * np.cos(theta)
+            derivs[:, 1] = -GRAV_ACC * np.sin(theta) + drag + friction
+
+            return derivs
+
+        end_x = surface.x[-1]
+
+        def to_end(states):
+            return end_x - states[:, 0]
+
+        dt = self.batch_time_step if time_step is None else time_step
+        num_steps = int(np.ceil(max_time / dt))
+
+        # indices of the skiers that are still sliding
+        sliding = np.flatnonzero(init_speeds >= 0.0)
+        states = np.column_stack((np.full(len(sliding), surface.x[0]),
+                                  init_speeds[sliding]))
+        derivs = rhs(states, sliding)
+
+        exit_speeds = np.full(num, np.nan)
+        reached_end = np.zeros(num, dtype=bool)
+
+        logging.info('Integrating {} skiers sliding.'.format(num))
+        start_time = time.time()
+
+        for step in range(num_steps):
+
+            if len(sliding) == 0:
+                break
+
+            k1 = derivs
+            k2 = rhs(states + dt / 2.0 * k1, sliding)
+            k3 = rhs(states + dt / 2.0 * k2, sliding)
+            k4 = rhs(states + dt * k3, sliding)
+            new_states = states + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            new_derivs = rhs(new_states, sliding)
+
+            stopped = new_states[:, 1] < 0.0
+            finished = (new_states[:, 0] >= end_x) & ~stopped
+
+            if np.any(finished):
+                frac = _hermite_root(states[finished], derivs[finished],
+                                     new_states[finished],
+                                     new_derivs[finished], dt, to_end)
+                exit_states = _hermite_state(states[finished],
+                                             derivs[finished],
+                                             new_states[finished],
+                                             new_derivs[finished], dt, frac)
+                idxs = sliding[finished]
+                exit_speeds[idxs] = exit_states[:, 1]
+                reached_end[idxs] = True
+
+            keep = ~(finished | stopped)
+            sliding = sliding[keep]
+            states = new_states[keep]
+            derivs = new_derivs[keep]
+
+        msg = 'Sliding integration of {} skiers finished in {} seconds.'
+        logging.info(msg.format(num, time.time() - start_time))
+
+        if not np.all(reached_end):
+            msg = '{} of {} sliding skiers did not reach the end of the surface.'
+            logging.info(msg.format(num - np.sum(reached_end), num))
+
+        angle = np.arctan(surface.interp_slope(end_x))
+        exit_vels = np.column_stack((exit_speeds * np.cos(angle),
+                                     exit_speeds * np.sin(angle)))
+
+        return exit_speeds, exit_vels, reached_end
+
+    def _state_at_x(self, takeoff_point, takeoff_angle, takeoff_speed, x):
+        """Returns the flight state, shape(4,), where the skier passes the
+        horizontal position x and its derivative with respect to the takeoff
+        speed, shape(4,)."""
+
+        direction = (np.cos(takeoff_angle), np.sin(takeoff_angle))
+        init_vel = (takeoff_speed * direction[0], takeoff_speed * direction[1])
+
+        _, state = self.impact_state(takeoff_point, init_vel, x=x,
+                                     sensitivity=direction)
+        state, sens = state[:4], state[4:]
+
+        # NOTE : The flight reaches x at a time that also depends on the
+        # takeoff speed.
+        dstate = sens - self._flight_rhs(0.0, state) * sens[0] / state[2]
+
+        return state, dstate
+
     def speed_to_land_at(self, landing_point, takeoff_point, takeoff_angle,
-                         surf):
+                         surf=None, init_speed=None):
         """Returns the magnitude of the velocity required to land at a specific
         point given launch position and angle.
 
@@ -444,82 +1180,387 @@ class Skier(object):
             The (x, y) coordinates of the takeoff point in meters.
         takeoff_angle : float
             The takeoff angle in radians.
-        surf : Surface
-            This should most likely be the parent slope but needs to be
-            something that ensures the skier flies past the landing point.
+        surf : Surface, optional
+            Not used. The flights are integrated until they pass the landing
+            point's x coordinate, so no surface is needed to stop them.
+        init_speed : float, optional
+            An initial guess of the takeoff speed, e.g. the speed to land at
+            a nearby point. Defaults to the takeoff speed without drag.
 
         Returns
         =======
         takeoff_speed : float
             The magnitude of the takeoff velocity.
+        impact_vel : 2-tuple of floats
+            The x and y components of the velocity at the landing point.
 
-        """
+        Raises
+        ======
+        InvalidJumpError
+            Error if the landing point can't be reached or the takeoff speed
+            is not found within Skier.max_shooting_iterations flights or
+            Skier.max_shooting_time seconds.
 
-        # NOTE : This method corresponds to Mont's Matlab function
-        # findVoWithDrag.m.
+        """
+        takeoff_speed, impact_vel, _ = self._speed_to_land_at(
+            landing_point, takeoff_point, takeoff_angle, init_speed=init_speed)
+        return takeoff_speed, impact_vel
 
-        # NOTE : This may only work if the landing surface is below the takeoff
-        # point.
+    def _speed_to_land_at(self, landing_point, takeoff_point, takeoff_angle,
+                          init_speed=None):
+        """Returns the results of speed_to_land_at() and the number of flights
+        that were needed."""
 
-        # TODO : Is it possible to solve a boundary value problem here instead
-        # using this iterative approach with an initial value problem?
+        # NOTE : This method is based on Mont's Matlab function
+        # findVoWithDrag.m, but uses Newton's method with the derivative of
+        # the height at the landing point's x with respect to the takeoff
+        # speed from the flight's sensitivity equations.
 
         x, y = landing_point
 
         if isclose(landing_point[0] - takeoff_point[0], 0.0):
-            return 0.0, (0.0, 0.0)
-
-        theta = takeoff_angle
-        cto = np.cos(takeoff_angle)
-        sto = np.sin(takeoff_angle)
-        tto = np.tan(takeoff_angle)
+            return 0.0, (0.0, 0.0), 0
 
         # guess init. velocity for impact at x,y based on explicit solution
         # for the no drag case
-        delx = landing_point[0] - takeoff_point[0]
-        dely = landing_point[1] - takeoff_point[1]
-        logging.debug('delx = {}, dely = {}'.format(delx, dely))
-        logging.debug(delx**2 * GRAV_ACC / (2*cto**2 * (delx*tto - dely)))
-        logging.debug(2*cto**2 * (delx*tto - dely))
-        vo = np.sqrt(delx**2 * GRAV_ACC / (2*cto**2 * (delx*tto - dely)))
+        vo = _drag_free_speed(landing_point, takeoff_point, takeoff_angle)
+        # NOTE : Gravity and drag always turn the flight path downwards.
+        if np.isnan(vo):
+            msg = ('Landing point ({:1.3f}, {:1.3f}) is not below the takeoff '
+                   'direction and cannot be reached.')
+            raise InvalidJumpError(msg.format(x, y))
+        if init_speed is not None and init_speed > 0.0:
+            vo = init_speed
         logging.debug('vo = {}'.format(vo))
-        # dvody is calculated from the explicit solution without drag @ (x,y)
-        dvody = ((delx**2 * GRAV_ACC / 2 / cto**2)**0.5 *
-                 ((delx*tto-dely)**(-3/2)) / 2)
-        # TODO : This gets a negative under the sqrt for some cases, e.g.
-        # make_jump(-10.0, 0.0, 30.0, 20.0, 0.1)
-        dvody = (np.sqrt(GRAV_ACC*(delx)**2/((delx)*np.sin(2*theta) -
-                                             2*(dely)*cto**2))*cto**2 /
-                 ((delx)*np.sin(2*theta) - 2*(dely)*cto**2))
 
-        deltay = np.inf
+        # NOTE : The height at x increases with the takeoff speed, so the
+        # takeoff speed is bracketed by speeds that land below and above the
+        # landing point. Newton steps outside of the bracket are replaced by
+        # bisection, or doubling if there is no upper bound yet.
+        lower, upper = 0.0, np.inf
 
-        while abs(deltay) > 0.001:
-            vox = vo*cto
-            voy = vo*sto
+        start_time = time.time()
 
-            flight_traj = self.fly_to(surf, init_pos=takeoff_point,
-                                      init_vel=(vox, voy),
-                                      compute_acc=False,
-                                      logging_type='debug')
+        for iteration in range(1, self.max_shooting_iterations + 1):
+
+            state_at_x, dstate = self._state_at_x(takeoff_point,
+                                                  takeoff_angle, vo, x)
+            dydvo = dstate[1]
+
+            deltay = state_at_x[1] - y
+            logging.debug('vo = {}, deltay = {}, dydvo = {}'.format(
+                vo, deltay, dydvo))
+
+            if abs(deltay) <= self.shooting_tolerance:
+                break
+
+            if deltay < 0.0:
+                lower = vo
+            else:
+                upper = vo
+
+            if dydvo > 0.0:
+                new_vo = vo - deltay / dydvo
+            else:
+                new_vo = np.nan
+
+            if lower < new_vo < upper:
+                # NOTE : The height error after a Newton step is about half
+                # of the second derivative times the step squared. Without
+                # drag the height at x goes as -1 / vo**2, so the second
+                # derivative is about -3 / vo times the first. If the
+                # predicted error is within the tolerance, the step is taken
+                # without another flight and the state is extrapolated.
+                step = new_vo - vo
+                if 1.5 * dydvo * step**2 / vo <= self.shooting_tolerance:
+                    state_at_x = state_at_x + step * dstate
+                    vo = new_vo
+                    break
+            else:
+                new_vo = ((lower + upper) / 2.0 if np.isfinite(upper) else
+                          2.0 * vo)
+            vo = new_vo
+
+            if time.time() - start_time > self.max_shooting_time:
+                msg = ('Takeoff speed to land at ({:1.3f}, {:1.3f}) not found '
+                       'within {:1.1f} seconds.')
+                raise InvalidJumpError(msg.format(x, y,
+                                                  self.max_shooting_time))
+        else:
+            msg = ('Takeoff speed to land at ({:1.3f}, {:1.3f}) not found in '
+                   '{} iterations.')
+            raise InvalidJumpError(msg.format(x, y, iteration))
 
-            traj_at_impact = flight_traj.interp_wrt_x(x)
+        logging.debug('Takeoff speed found in {} iterations.'.format(
+            iteration))
 
-            ypred = traj_at_impact[2]
-            logging.debug('ypred = {}'.format(ypred))
+        takeoff_speed = vo
 
-            deltay = ypred - y
-            logging.debug('deltay = {}'.format(deltay))
-            dvo = -deltay * dvody
-            logging.debug('dvo = {}'.format(dvo))
-            vo = vo + dvo
-            logging.debug('vo = {}'.format(vo))
+        impact_vel = (state_at_x[2], state_at_x[3])
+
+        return takeoff_speed, impact_vel, iteration
+
+    def _states_at_x_many(self, takeoff_point, takeoff_angle, takeoff_speeds,
+                          xs, dt):
+        """Returns the flight states, shape(n, 4), where the skiers that take
+        off with the n takeoff speeds pass the horizontal positions xs, and
+        the derivatives of the heights there with respect to the takeoff
+        speeds, shape(n,). NaN is given for the skiers that do not reach
+        their x within Skier.max_flight_time."""
+
+        num = len(takeoff_speeds)
+        direction = np.array([np.cos(takeoff_angle), np.sin(takeoff_angle)])
+
+        states = np.zeros((num, 8))
+        states[:, 0] = takeoff_point[0]
+        states[:, 1] = takeoff_point[1]
+        states[:, 2:4] = np.outer(takeoff_speeds, direction)
+        states[:, 6:] = direction
+        derivs = self._flight_rhs_sensitivity_many(states)
+
+        targets = np.asarray(xs, dtype=float)
+        states_at_x = np.full((num, 8), np.nan)
+
+        # indices of the skiers that have not reached their x yet
+        flying = np.arange(num)
+
+        rhs = self._flight_rhs_sensitivity_many
+
+        for step in range(int(np.ceil(self.max_flight_time / dt))):
+
+            k1 = derivs
+            k2 = rhs(states + dt / 2.0 * k1)
+            k3 = rhs(states + dt / 2.0 * k2)
+            k4 = rhs(states + dt * k3)
+            new_states = states + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            new_derivs = rhs(new_states)
+
+            passed = new_states[:, 0] >= targets
+
+            if np.any(passed):
+                # NOTE : x increases monotonically and nearly linearly during
+                # the step, so Newton's method on the cubic Hermite
+                # interpolant of x, started from the linear interpolation,
+                # converges in a few iterations.
+                x0, x1 = states[passed, 0], new_states[passed, 0]
+                vx0, vx1 = derivs[passed, 0], new_derivs[passed, 0]
+                frac = (targets[passed] - x0) / (x1 - x0)
+                for i in range(4):
+                    x = _hermite_state(x0[:, np.newaxis], vx0[:, np.newaxis],
+                                       x1[:, np.newaxis], vx1[:, np.newaxis],
+                                       dt, frac)[:, 0]
+                    frac2 = frac**2
+                    dxdf = ((6.0 * frac2 - 6.0 * frac) * (x0 - x1) +
+                            (3.0 * frac2 - 4.0 * frac + 1.0) * dt * vx0 +
+                            (3.0 * frac2 - 2.0 * frac) * dt * vx1)
+                    frac = np.clip(frac - (x - targets[passed]) / dxdf, 0.0,
+                                   1.0)
+                states_at_x[flying[passed]] = _hermite_state(
+                    states[passed], derivs[passed], new_states[passed],
+                    new_derivs[passed], dt, frac)
+
+            keep = ~passed
+            flying = flying[keep]
+            states = new_states[keep]
+            derivs = new_derivs[keep]
+            targets = targets[keep]
+
+            if len(flying) == 0:
+                break
+
+        sens = states_at_x[:, 4:]
+        dydvo = (sens[:, 1] - states_at_x[:, 3] / states_at_x[:, 2] *
+                 sens[:, 0])
+
+        return states_at_x[:, :4], dydvo
+
+    def speeds_to_land_at(self, landing_points, takeoff_point, takeoff_angle,
+                          max_speed=None, init_speeds=None, time_step=None,
+                          logging_type='info'):
+        """Returns the magnitudes of the velocities required to land at many
+        points given a launch position and angle. This gives the same results
+        as speed_to_land_at() for each point, but the Newton iterations of all
+        the points are done together. Each iteration advances the flights of
+        every unconverged point with a fixed step fourth order Runge-Kutta
+        method, like fly_to_many().
 
-        # the takeoff velocity is adjsted by dvo before the while loop ends
-        vo = vo - dvo
+        Parameters
+        ==========
+        landing_points : array_like, shape(n, 2)
+            The (x, y) coordinates of the desired landing points in meters.
+        takeoff_point : 2-tuple of floats
+            The (x, y) coordinates of the takeoff point in meters.
+        takeoff_angle : float
+            The takeoff angle in radians.
+        max_speed : float, optional
+            If given, the landing points are treated in order and once a point
+            needs a takeoff speed greater than this in meters per second, can't
+            be reached, or its takeoff speed isn't found within the iteration
+            and time limits, no more points are solved. NaN is given for that
+            point and all of the points after it instead of raising an
+            error.
+        init_speeds : array_like, shape(n,), optional
+            Initial guesses of the takeoff speeds, e.g. the speeds of nearby
+            landing points. The drag free takeoff speeds are used where these
+            are not finite.
+        time_step : float, optional
+            The integration time step in seconds. Defaults to
+            Skier.batch_time_step.
+        logging_type : string
+            The logging level desired for the non-debug logging calls in this
+            function.
 
-        takeoff_speed = vo
+        Returns
+        =======
+        takeoff_speeds : ndarray, shape(n,)
+            The magnitudes of the takeoff velocities.
+        impact_vels : ndarray, shape(n, 2)
+            The x and y components of the velocities at the landing points.
 
-        impact_vel = (traj_at_impact[3], traj_at_impact[4])
+        Raises
+        ======
+        InvalidJumpError
+            Error if max_speed is not given and a landing point can't be
+            reached or the takeoff speeds are not found within
+            Skier.max_shooting_iterations iterations or
+            Skier.max_shooting_time seconds.
 
-        return takeoff_speed, impact_vel
+        """
+        logging_call = getattr(logging, logging_type)
+
+        points = np.atleast_2d(np.asarray(landing_points, dtype=float))
+        num = len(points)
+        dt = self.batch_time_step if time_step is None else time_step
+
+        takeoff_speeds = np.full(num, np.nan)
+        impact_vels = np.full((num, 2), np.nan)
+
+        delx = points[:, 0] - takeoff_point[0]
+        dely = points[:, 1] - takeoff_point[1]
+
+        at_takeoff = np.isclose(delx, 0.0, rtol=0.0, atol=1e-9)
+        takeoff_speeds[at_takeoff] = 0.0
+        impact_vels[at_takeoff] = 0.0
+
+        cto = np.cos(takeoff_angle)
+        tto = np.tan(takeoff_angle)
+
+        # NOTE : Gravity and drag always turn the flight path downwards, see
+        # speed_to_land_at().
+        drop = delx * tto - dely
+        unreachable = ~at_takeoff & (drop <= 0.0)
+
+        # index of the first point that needs more than max_speed
+        last = num
+        if np.any(unreachable):
+            first = np.argmax(unreachable)
+            if max_speed is None:
+                msg = ('Landing point ({:1.3f}, {:1.3f}) is not below the '
+                       'takeoff direction and cannot be reached.')
+                raise InvalidJumpError(msg.format(*points[first]))
+            last = first
+
+        # guess init. velocity for impact at x,y based on explicit solution
+        # for the no drag case
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vo = np.sqrt(delx**2 * GRAV_ACC / (2*cto**2 * drop))
+        if init_speeds is not None:
+            init_speeds = np.asarray(init_speeds, dtype=float)
+            vo = np.where(np.isfinite(init_speeds) & (init_speeds > 0.0),
+                          init_speeds, vo)
+
+        lower = np.zeros(num)
+        upper = np.full(num, np.inf)
+
+        active = np.flatnonzero(~at_takeoff & ~unreachable)
+        active = active[active < last]
+
+        msg = 'Finding the takeoff speeds for {} landing points.'
+        logging_call(msg.format(len(active)))
+        start_time = time.time()
+
+        iteration = 0
+
+        while len(active) > 0:
+
+            iteration += 1
+            if iteration > self.max_shooting_iterations:
+                msg = ('Takeoff speeds to land at {} points not found in {} '
+                       'iterations.')
+                msg = msg.format(len(active), self.max_shooting_iterations)
+                if max_speed is None:
+                    raise InvalidJumpError(msg)
+                # NOTE : With max_speed the points that are not found are
+                # treated like points that can't be reached.
+                logging_call(msg)
+                last = min(last, active[0])
+                break
+
+            states_at_x, dydvo = self._states_at_x_many(
+                takeoff_point, takeoff_angle, vo[active], points[active, 0],
+                dt)
+
+            not_reached = np.isnan(states_at_x[:, 0])
+            if np.any(not_reached):
+                first = active[not_reached][0]
+                msg = ('Flying skier did not reach x = {:1.3f} within {:1.3f} '
+                       'seconds, integration aborted.')
+                msg = msg.format(points[first, 0], self.max_flight_time)
+                if max_speed is None:
+                    raise InvalidJumpError(msg)
+                logging_call(msg)
+                last = min(last, first)
+
+            deltay = states_at_x[:, 1] - points[active, 1]
+
+            done = np.abs(deltay) <= self.shooting_tolerance
+            takeoff_speeds[active[done]] = vo[active[done]]
+            impact_vels[active[done]] = states_at_x[done, 2:]
+
+            # NOTE : The same safeguarded Newton step as speed_to_land_at().
+            below = deltay < 0.0
+            lower[active] = np.where(below, vo[active], lower[active])
+            upper[active] = np.where(below, upper[active], vo[active])
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                new_vo = np.where(dydvo > 0.0,
+                                  vo[active] - deltay / dydvo, np.nan)
+            inside = (lower[active] < new_vo) & (new_vo < upper[active])
+            new_vo = np.where(inside, new_vo,
+                              np.where(np.isfinite(upper[active]),
+                                       (lower[active] + upper[active]) / 2.0,
+                                       2.0 * vo[active]))
+
+            continuing = ~done
+
+            if max_speed is not None:
+                # NOTE : The speeds are only tried up to max_speed, if that
+                # still lands below the point the point can't be landed on.
+                exceeded = continuing & (lower[active] >= max_speed)
+                if np.any(exceeded):
+                    last = min(last, active[exceeded][0])
+                new_vo = np.minimum(new_vo, max_speed)
+                continuing &= ~exceeded
+
+            vo[active] = new_vo
+            active = active[continuing]
+            active = active[active < last]
+
+            if (len(active) > 0 and
+                    time.time() - start_time > self.max_shooting_time):
+                msg = ('Takeoff speeds to land at {} points not found within '
+                       '{:1.1f} seconds.')
+                msg = msg.format(len(active), self.max_shooting_time)
+                if max_speed is None:
+                    raise InvalidJumpError(msg)
+                logging_call(msg)
+                last = min(last, active[0])
+                break
+
+        takeoff_speeds[last:] = np.nan
+        impact_vels[last:] = np.nan
+
+        msg = 'Takeoff speeds found in {} iterations and {:1.3f} seconds.'
+        logging_call(msg.format(iteration, time.time() - start_time))
+
+        return takeoff_speeds, impact_vels
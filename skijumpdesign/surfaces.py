@@ -1,12 +1,21 @@
 import os
+import math
 import time
+import bisect
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
 
 import numpy as np
 from scipy.interpolate import interp1d
-from scipy.optimize import fsolve
 from scipy.integrate import solve_ivp, trapz, quad
 
+from .interpolation import Interpolator
+from .skiers import _FlightFamily, _drag_free_speed
 from .utils import InvalidJumpError
 from .utils import GRAV_ACC, EPS
 from .utils import compute_dist_from_flat, vel2speed
@@ -18,6 +27,341 @@ else:
     import matplotlib.pyplot as plt
 
 
+def _speeds_to_land_at_chunk(skier, takeoff_point, takeoff_angle, max_speed,
+                             start, stop, shm_name=None, num=None,
+                             inputs=None):
+    """Solves the takeoff speeds for the landing points start:stop in a
+    worker process. The landing points and initial takeoff speed guesses are
+    read from the first three columns of the shape(num, 6) array in the
+    shared memory block shm_name and the takeoff speeds and impact
+    velocities are written to the last three. If shm_name is None the
+    chunk's rows of the first three columns are given as inputs and the
+    results are returned instead."""
+
+    if shm_name is None:
+        speeds, vels = skier.speeds_to_land_at(
+            inputs[:, :2], takeoff_point, takeoff_angle, max_speed=max_speed,
+            init_speeds=inputs[:, 2], logging_type='debug')
+        return np.column_stack((speeds, vels))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = np.ndarray((num, 6), dtype=float, buffer=shm.buf)
+        speeds, vels = skier.speeds_to_land_at(
+            data[start:stop, :2], takeoff_point, takeoff_angle,
+            max_speed=max_speed, init_speeds=data[start:stop, 2],
+            logging_type='debug')
+        data[start:stop, 3] = speeds
+        data[start:stop, 4:] = vels
+        # NOTE : The block can't be closed while an array uses its buffer.
+        del data
+    finally:
+        shm.close()
+
+
+def _parallel_speeds_to_land_at(skier, landing_points, takeoff_point,
+                                takeoff_angle, max_speed, workers,
+                                init_speeds=None):
+    """Returns the same results as Skier.speeds_to_land_at() with max_speed
+    by splitting the landing points into contiguous chunks that are solved
+    by a pool of worker processes. The landing points and the results are
+    kept in a shared memory block, when available, so that the arrays are
+    not pickled."""
+
+    num = len(landing_points)
+    bounds = np.linspace(0, num, num=min(workers, num) + 1).astype(int)
+    chunks = list(zip(bounds[:-1], bounds[1:]))
+
+    shm = None
+    if shared_memory is not None:
+        shm = shared_memory.SharedMemory(create=True, size=num * 6 * 8)
+        data = np.ndarray((num, 6), dtype=float, buffer=shm.buf)
+    else:
+        data = np.empty((num, 6))
+    data[:, :2] = landing_points
+    data[:, 2:] = np.nan
+    if init_speeds is not None:
+        data[:, 2] = init_speeds
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for start, stop in chunks:
+                if shm is None:
+                    futures.append(executor.submit(
+                        _speeds_to_land_at_chunk, skier, takeoff_point,
+                        takeoff_angle, max_speed, start, stop,
+                        inputs=data[start:stop, :3]))
+                else:
+                    futures.append(executor.submit(
+                        _speeds_to_land_at_chunk, skier, takeoff_point,
+                        takeoff_angle, max_speed, start, stop,
+                        shm_name=shm.name, num=num))
+            for i, ((start, stop), future) in enumerate(zip(chunks,
+                                                            futures)):
+                result = future.result()
+                if shm is None:
+                    data[start:stop, 3:] = result
+                # NOTE : Once a chunk needs more than max_speed the chunks
+                # after it are not needed, see Skier.speeds_to_land_at().
+                if np.any(np.isnan(data[start:stop, 3])):
+                    for later in futures[i + 1:]:
+                        later.cancel()
+                    break
+        results = data[:, 3:].copy()
+    finally:
+        if shm is not None:
+            del data
+            shm.close()
+            shm.unlink()
+
+    aborted = np.isnan(results[:, 0])
+    if np.any(aborted):
+        results[np.argmax(aborted):] = np.nan
+
+    return results[:, 0], results[:, 1:]
+
+
+def _refine_efh(distance_x, solve, tolerance, coarse_step=16, safety=2.0):
+    """Returns the indices of the landing locations distance_x that are
+    needed to linearly interpolate the equivalent fall heights and takeoff
+    speeds to the tolerance, along with their values. solve(idxs,
+    init_speeds) returns the equivalent fall heights and takeoff speeds at
+    the increasing landing location indices idxs, with nan from the first
+    location that needs too high a takeoff speed onwards."""
+
+    # NOTE : An interval is accepted when the values at its midpoint and at
+    # the midpoints of both of its halves are within tolerance / safety of
+    # the line between its ends. The accepted interval is then interpolated
+    # between all five points, whose spacing is a quarter of the interval.
+    # Otherwise both halves are checked in the same way. The midpoints of
+    # the halves are solved for all of the intervals of a level in one call
+    # of solve(), because the cost of a call barely depends on the number of
+    # locations.
+
+    num = len(distance_x)
+    efh = np.full(num, np.nan)
+    speeds = np.full(num, np.nan)
+    solved = np.zeros(num, dtype=bool)
+    # index of the first location that can't be landed on
+    abort = num
+
+    def evaluate(idxs):
+        nonlocal abort
+        idxs = np.unique(idxs)
+        idxs = idxs[~solved[idxs] & (idxs < abort)]
+        if len(idxs) == 0:
+            return
+        # NOTE : The takeoff speeds of the solved neighbors give good
+        # initial guesses.
+        known = np.flatnonzero(solved & ~np.isnan(speeds))
+        init_speeds = None
+        if len(known) > 0:
+            init_speeds = np.interp(distance_x[idxs], distance_x[known],
+                                    speeds[known])
+        efh[idxs], speeds[idxs] = solve(idxs, init_speeds)
+        solved[idxs] = True
+        nans = np.flatnonzero(solved & np.isnan(speeds))
+        if len(nans) > 0:
+            abort = nans[0]
+            later = np.arange(num) > abort
+            efh[later], speeds[later] = np.nan, np.nan
+
+    left = np.arange(0, num - 1, coarse_step)
+    right = np.minimum(left + coarse_step, num - 1)
+
+    while True:
+
+        # NOTE : intervals that can't be halved or that start after the
+        # first location that can't be landed on are finished.
+        unfinished = (right - left > 1) & (left < abort)
+        left, right = left[unfinished], right[unfinished]
+        if len(left) == 0:
+            break
+
+        mid = (left + right) // 2
+        points = (left, (left + mid) // 2, mid, (mid + right) // 2, right)
+        evaluate(np.hstack(points))
+
+        refine = np.zeros(len(left), dtype=bool)
+        for vals in (efh, speeds):
+            for idxs in points[1:-1]:
+                frac = ((distance_x[idxs] - distance_x[left]) /
+                        (distance_x[right] - distance_x[left]))
+                interp = vals[left] + frac * (vals[right] - vals[left])
+                with np.errstate(invalid='ignore'):
+                    refine |= np.abs(vals[idxs] - interp) > tolerance / safety
+        # the first location that can't be landed on is inside the interval
+        num_nan = sum(np.isnan(speeds[idxs]).astype(int) for idxs in points)
+        refine |= (num_nan > 0) & (num_nan < len(points))
+
+        left, right = (np.hstack((left[refine], mid[refine])),
+                       np.hstack((mid[refine], right[refine])))
+
+    sampled = np.flatnonzero(solved)
+
+    return sampled, efh[sampled], speeds[sampled]
+
+
+class _SegmentIndex(object):
+    """Index of the line segments of a polyline with monotonically increasing
+    x values that gives the exact signed shortest distance from many points
+    to the polyline. The first and last segments are treated as rays so the
+    distances are to the linearly extrapolated polyline, like
+    ``Surface.interp_y()``.
+
+    The segments are grouped into blocks of consecutive segments with
+    bounding boxes. The segment directly above or below a point gives an
+    upper bound on its distance and only the segments in blocks whose
+    bounding box is within that bound are checked."""
+
+    block_size = 16
+
+    def __init__(self, x, y):
+        self.x = x
+        self.x0 = x[:-1]
+        self.y0 = y[:-1]
+        self.dx = np.diff(x)
+        self.dy = np.diff(y)
+        self.len_sq = self.dx**2 + self.dy**2
+        self.num_segments = len(self.dx)
+
+        size = self.block_size
+        starts = np.arange(0, self.num_segments, size)
+        ends = np.minimum(starts + size, self.num_segments)
+        self.block_counts = ends - starts
+        self.block_xmin = x[starts]
+        self.block_xmax = x[ends]
+        self.block_ymin = np.minimum(np.minimum.reduceat(y[:-1], starts),
+                                     y[ends])
+        self.block_ymax = np.maximum(np.maximum.reduceat(y[:-1], starts),
+                                     y[ends])
+        # the end rays make the end blocks unbounded
+        self.block_left = self.block_xmin.copy()
+        self.block_left[0] = -np.inf
+        self.block_right = self.block_xmax.copy()
+        self.block_right[-1] = np.inf
+
+        # NOTE : Python floats are faster than NumPy scalars for the single
+        # point queries made by the flight event functions.
+        self._x_list = x.tolist()
+        self._y_list = y.tolist()
+
+    def _closest(self, segs, xp, yp):
+        """Returns the squared distance from each point to the corresponding
+        segment and the y value of the closest point on the segment minus the
+        point's y value."""
+        frac = ((xp - self.x0[segs]) * self.dx[segs] +
+                (yp - self.y0[segs]) * self.dy[segs]) / self.len_sq[segs]
+        frac = np.where(segs > 0, np.maximum(frac, 0.0), frac)
+        frac = np.where(segs < self.num_segments - 1, np.minimum(frac, 1.0),
+                        frac)
+        del_x = self.x0[segs] + frac * self.dx[segs] - xp
+        del_y = self.y0[segs] + frac * self.dy[segs] - yp
+        return del_x**2 + del_y**2, del_y
+
+    def distance_scalar(self, xp, yp):
+        """Returns the signed shortest distance, positive above the polyline,
+        from the point (xp, yp)."""
+
+        xs, ys = self._x_list, self._y_list
+        last = self.num_segments - 1
+
+        i = min(max(bisect.bisect_right(xs, xp) - 1, 0), last)
+        dx, dy = xs[i + 1] - xs[i], ys[i + 1] - ys[i]
+        frac = ((xp - xs[i]) * dx + (yp - ys[i]) * dy) / (dx * dx + dy * dy)
+        if i > 0:
+            frac = max(frac, 0.0)
+        if i < last:
+            frac = min(frac, 1.0)
+        bound = math.hypot(xs[i] + frac * dx - xp, ys[i] + frac * dy - yp)
+        bound = bound * (1.0 + 1e-10) + 1e-12
+        gap = yp - (ys[i] + dy / dx * (xp - xs[i]))
+
+        if math.isnan(bound):
+            return bound
+
+        lo = min(bisect.bisect_left(xs, xp - bound, 1) - 1, i)
+        hi = max(bisect.bisect_right(xs, xp + bound, 0, last + 1) - 1, i)
+
+        sl = slice(lo, hi + 1)
+        x0, y0, dx, dy = self.x0[sl], self.y0[sl], self.dx[sl], self.dy[sl]
+        frac = ((xp - x0) * dx + (yp - y0) * dy) / self.len_sq[sl]
+        ends = frac[0], frac[-1]
+        frac = np.clip(frac, 0.0, 1.0)
+        if lo == 0:
+            frac[0] = min(ends[0], 1.0)
+        if hi == last:
+            frac[-1] = max(ends[1], 0.0)
+        del_y = y0 + frac * dy - yp
+        dist_sq = (x0 + frac * dx - xp)**2 + del_y**2
+        closest = np.argmin(dist_sq)
+
+        del_y = float(del_y[closest])
+        sign = -math.copysign(1.0, del_y) if del_y != 0.0 else np.sign(gap)
+        return sign * math.sqrt(dist_sq[closest])
+
+    def distance(self, xp, yp):
+        """Returns the signed shortest distances, positive above the polyline,
+        from the points (xp, yp) given as arrays of shape(k,)."""
+
+        xp = np.asarray(xp, dtype=float)
+        yp = np.asarray(yp, dtype=float)
+        num_points = len(xp)
+        size = self.block_size
+
+        start = np.searchsorted(self.x, xp, side='right') - 1
+        start = np.clip(start, 0, self.num_segments - 1)
+        bound = np.sqrt(self._closest(start, xp, yp)[0])
+        bound = bound * (1.0 + 1e-10) + 1e-12
+
+        # (point, block) pairs that overlap the bound in x
+        lo = np.searchsorted(self.block_right, xp - bound, side='left')
+        hi = np.searchsorted(self.block_left, xp + bound, side='right') - 1
+        lo = np.minimum(lo, start // size)  # NaN points check one block
+        hi = np.maximum(hi, start // size)
+        counts = hi - lo + 1
+        pair_points = np.repeat(np.arange(num_points), counts)
+        offsets = np.cumsum(counts) - counts
+        blocks = (lo[pair_points] + np.arange(counts.sum()) -
+                  offsets[pair_points])
+
+        # keep the blocks whose bounding box is within the bound
+        px, py = xp[pair_points], yp[pair_points]
+        gap_x = np.maximum(np.maximum(self.block_xmin[blocks] - px,
+                                      px - self.block_xmax[blocks]), 0.0)
+        gap_y = np.maximum(np.maximum(self.block_ymin[blocks] - py,
+                                      py - self.block_ymax[blocks]), 0.0)
+        keep = ((gap_x**2 + gap_y**2 <= bound[pair_points]**2) |
+                (blocks == 0) | (blocks == len(self.block_counts) - 1) |
+                (blocks == start[pair_points] // size))
+        blocks, pair_points = blocks[keep], pair_points[keep]
+
+        # (point, segment) pairs in the kept blocks
+        counts = self.block_counts[blocks]
+        seg_points = np.repeat(pair_points, counts)
+        offsets = np.cumsum(counts) - counts
+        segs = (np.repeat(blocks * size - offsets, counts) +
+                np.arange(counts.sum()))
+
+        dist_sq, del_y = self._closest(segs, xp[seg_points], yp[seg_points])
+
+        point_offsets = np.searchsorted(seg_points, np.arange(num_points))
+        min_dist_sq = np.minimum.reduceat(dist_sq, point_offsets)
+        # the closest candidate for each point gives the sign
+        order = np.lexsort((dist_sq, seg_points))
+        closest = order[point_offsets]
+
+        # if the closest point is level with the point, e.g. beside a corner,
+        # the vertical gap to the polyline gives the sign
+        gap = yp - (self.y0[start] + self.dy[start] / self.dx[start] *
+                    (xp - self.x0[start]))
+        sign = np.where(del_y[closest] != 0.0, -np.sign(del_y[closest]),
+                        np.sign(gap))
+
+        return sign * np.sqrt(min_dist_sq)
+
+
 class Surface(object):
     """Base class for a 2D curve that represents the cross section of a surface
     expressed in a standard Cartesian coordinate system."""
@@ -55,6 +399,7 @@ class Surface(object):
 
     def _initialize_surface(self):
 
+        self._segment_index = None
         self._check_monotonic()
         self._check_x_spacing()
         self._initialize_gradients()
@@ -88,10 +433,9 @@ class Surface(object):
 
     def _initialize_interpolators(self):
 
-        kwargs = {'fill_value': 'extrapolate'}
-        self.interp_y = interp1d(self.x, self.y, **kwargs)
-        self.interp_slope = interp1d(self.x, self.slope, **kwargs)
-        self.interp_curvature = interp1d(self.x, self.curvature, **kwargs)
+        self.interp_y = Interpolator(self.x, self.y)
+        self.interp_slope = Interpolator(self.x, self.slope)
+        self.interp_curvature = Interpolator(self.x, self.curvature)
 
     def _check_monotonic(self):
         # NOTE: eps solution only works when adding to 0.
@@ -134,33 +478,36 @@ class Surface(object):
 
         Parameters
         ==========
-        xp : float
+        xp : float or array_like, shape(k,)
             The horizontal, x, coordinate of the point.
-        yp : float
+        yp : float or array_like, shape(k,)
             The vertical, y, coordinate of the point.
 
         Returns
         =======
-        distance : float
+        distance : float or ndarray, shape(k,)
             The shortest distance from the point to the surface. If the point
             is above the surface a positive distance is returned, else a
             negative distance.
 
-        Note
-        ====
-        This general implementation can be slow, so implement overloaded
-        ``distance_from()`` methods in subclasses when you can.
+        Notes
+        =====
+        The distance is exact for the piecewise linear surface, linearly
+        extrapolated beyond its ends. The segments are indexed the first time
+        this is called, so each query only checks the few segments that can
+        be closer than the segment directly above or below the point.
 
         """
 
-        def distance_squared(x):
-            return (xp - x)**2 + (yp - self.interp_y(x))**2
+        if self._segment_index is None:
+            self._segment_index = _SegmentIndex(self.x, self.y)
 
-        distances = np.sqrt((self.x - xp)**2 + (self.y - yp)**2)
+        if np.ndim(xp) == 0 and np.ndim(yp) == 0:
+            return float(self._segment_index.distance_scalar(float(xp),
+                                                             float(yp)))
 
-        x = fsolve(distance_squared, self.x[np.argmin(distances)])
-
-        return np.sign(yp - self.interp_y(x)) * np.sqrt(distance_squared(x))
+        return self._segment_index.distance(np.atleast_1d(xp),
+                                            np.atleast_1d(yp))
 
     def length(self):
         """Returns the length of the surface in meters via a numerical line
@@ -191,36 +538,13 @@ class Surface(object):
         surface is above the provided surface."""
         return self.y - surface.interp_y(self.x)
 
-    def calculate_efh(self, takeoff_angle, takeoff_point, skier, increment=0.2):
-        """Returns the equivalent fall height for the surface at the specified
-        constant intervals relative to the provided takeoff point or the start
-        of the surface.
-
-        Parameters
-        ==========
-        takeoff_angle : float
-            Takeoff angle in radians.
-        takeoff_point : 2-tuple of floats
-            x and y coordinates of the point at which the skier leaves the
-            takeoff ramp.
-        skier : Skier
-            A skier instance.
-        increment : float, optional
-            x increment in meters between each calculated landing location.
-
-        Returns
-        =======
-        distance_x : ndarray, shape(n,)
-            Horizontal x locations of the equivalent fall height measures
-            spaced at the specified meter intervals relative to leftmost point
-            on the surface or the takeoff point, whichever is greater.
-        efh : ndarray, shape(n,)
-            The equivalent fall height corresponding to each value in
-            ``distance_x``.
-        takeoff_speeds : ndarray, shape(n,)
-            The takeoff speed required to land the corresponding x coordinate.
-
-        """
+    def _efh_solver(self, takeoff_angle, takeoff_point, skier, increment,
+                    workers=None):
+        """Returns the uniformly spaced landing locations used by
+        calculate_efh(), the surface height and slope angle at them,
+        shape(n, 2), and a function, solve(idxs, init_speeds=None), that
+        returns the equivalent fall heights and takeoff speeds at the
+        increasing location indices idxs."""
 
         if abs(takeoff_angle) > np.pi/2:
             msg = ('Takeoff angle must be between -pi/2 and pi/2.')
@@ -259,35 +583,294 @@ class Surface(object):
 
         slope = self.interp_slope(distance_x)
         slope_angle = np.arctan(slope)
-        kwargs = {'fill_value': 'extrapolate'}
-        interp_y_efh = interp1d(x, y, **kwargs)
+        interp_y_efh = Interpolator(x, y)
         height_y = interp_y_efh(distance_x)
 
-        # NOTE : Create a surface under the surface that the skier will impact
-        # if they pass over the primary surface (self).
-        catch_surf = HorizontalSurface(np.min(height_y) - 0.1,
-                                       abs(distance_x[0] - distance_x[-1] + 2.0),
-                                       start=distance_x[-1] - 1.0)
-
-        efh = np.empty(len(distance_x))
-        efh[:] = np.nan
-        takeoff_speeds = np.full(len(distance_x), np.nan)
-
-        for i, (x, y, m) in enumerate(zip(distance_x, height_y, slope_angle)):
-            takeoff_speed, impact_vel = \
-                skier.speed_to_land_at((x, y), takeoff_point, takeoff_angle,
-                                       catch_surf)
-            # TODO: Use fly to check that it hits the x,y
-            impact_speed, impact_angle = vel2speed(*impact_vel)
-            # NOTE : A nan is inserted if skier surpasses 100 miles per hour
-            if takeoff_speed > 44:
-                msg = ('Impact of the surface from above is only possible until'
-                       ' {:.2f} meters. Calculation aborted.')
-                logging.warning(msg.format(x))
-                break
-            efh[i] = (impact_speed ** 2 * np.sin(m - impact_angle) ** 2 /
-                      (2 * GRAV_ACC))
-            takeoff_speeds[i] = takeoff_speed
+        landing_points = np.column_stack((distance_x, height_y))
+
+        def solve(idxs, init_speeds=None):
+            # NOTE : The takeoff speeds of the landing points are found
+            # together. A nan is given from the first point where the skier
+            # would have to surpass 100 miles per hour onwards.
+            if workers is not None and workers > 1:
+                takeoff_speeds, impact_vels = _parallel_speeds_to_land_at(
+                    skier, landing_points[idxs], takeoff_point, takeoff_angle,
+                    44.0, workers, init_speeds=init_speeds)
+            else:
+                takeoff_speeds, impact_vels = skier.speeds_to_land_at(
+                    landing_points[idxs], takeoff_point, takeoff_angle,
+                    max_speed=44.0, init_speeds=init_speeds,
+                    logging_type='debug')
+            impact_speeds, impact_angles = vel2speed(*impact_vels.T)
+            efh = (impact_speeds ** 2 *
+                   np.sin(slope_angle[idxs] - impact_angles) ** 2 /
+                   (2 * GRAV_ACC))
+            return efh, takeoff_speeds
+
+        return distance_x, np.column_stack((height_y, slope_angle)), solve
+
+    def calculate_efh(self, takeoff_angle, takeoff_point, skier, increment=0.2,
+                      workers=None, tolerance=None):
+        """Returns the equivalent fall height for the surface at the specified
+        constant intervals relative to the provided takeoff point or the start
+        of the surface. If a tolerance is given only the locations needed to
+        linearly interpolate the equivalent fall height and takeoff speed to
+        that tolerance are calculated.
+
+        Parameters
+        ==========
+        takeoff_angle : float
+            Takeoff angle in radians.
+        takeoff_point : 2-tuple of floats
+            x and y coordinates of the point at which the skier leaves the
+            takeoff ramp.
+        skier : Skier
+            A skier instance.
+        increment : float, optional
+            x increment in meters between each calculated landing location.
+        workers : integer, optional
+            If greater than one, the landing locations are split into this
+            many chunks which are calculated in parallel by a pool of worker
+            processes. This only pays off for many landing locations, e.g.
+            long surfaces or small increments.
+        tolerance : float, optional
+            If given, intervals of 16 locations are halved, down to the
+            increment, until the equivalent fall heights in meters and the
+            takeoff speeds in meters per second at their midpoint and at the
+            midpoints of their halves are within half of this tolerance of
+            the line between their ends. The values are only checked at these
+            points, so a feature of the surface narrower than a quarter of an
+            interval can be missed. Each level of halving is solved at once,
+            which costs about as much as solving every location, so this only
+            saves time for small increments, e.g. 0.01 meters.
+
+        Returns
+        =======
+        distance_x : ndarray, shape(n,)
+            Horizontal x locations of the equivalent fall height measures
+            spaced at the specified meter intervals relative to leftmost point
+            on the surface or the takeoff point, whichever is greater. If a
+            tolerance is given, these are the subset of those locations that
+            were calculated.
+        efh : ndarray, shape(n,)
+            The equivalent fall height corresponding to each value in
+            ``distance_x``.
+        takeoff_speeds : ndarray, shape(n,)
+            The takeoff speed required to land the corresponding x coordinate.
+
+        """
+
+        distance_x, _, solve = self._efh_solver(takeoff_angle, takeoff_point,
+                                                skier, increment, workers)
+        num_points = len(distance_x)
+
+        if tolerance is None:
+            efh, takeoff_speeds = solve(np.arange(num_points))
+        else:
+            sampled, efh, takeoff_speeds = _refine_efh(distance_x, solve,
+                                                       tolerance)
+            logging.info('Equivalent fall height calculated at {} of {} '
+                         'landing locations.'.format(len(sampled),
+                                                     num_points))
+            distance_x = distance_x[sampled]
+
+        if np.any(np.isnan(takeoff_speeds)):
+            msg = ('Impact of the surface from above is only possible until'
+                   ' {:.2f} meters. Calculation aborted.')
+            logging.warning(msg.format(
+                distance_x[np.argmax(np.isnan(takeoff_speeds))]))
+
+        return distance_x, efh, takeoff_speeds
+
+    def iter_efh(self, takeoff_angle, takeoff_point, skier, increment=0.2,
+                 stride=4):
+        """Yields the equivalent fall heights of calculate_efh() coarse to
+        fine, so that a profile can be shown, or the calculation stopped,
+        before all of the landing locations are done. Every ``stride``
+        location is calculated first and then the gaps are filled in by
+        halving the spacing.
+
+        The results arrive in batches, one per level of spacing, because the
+        locations of a level are solved together by
+        Skier.speeds_to_land_at(). Nothing is yielded until the first level,
+        about 1/stride of the work, is solved, so a larger stride gives the
+        first results sooner.
+
+        Parameters
+        ==========
+        takeoff_angle : float
+            Takeoff angle in radians.
+        takeoff_point : 2-tuple of floats
+            x and y coordinates of the point at which the skier leaves the
+            takeoff ramp.
+        skier : Skier
+            A skier instance.
+        increment : float, optional
+            x increment in meters between each calculated landing location.
+        stride : integer, optional
+            Spacing, in increments, of the first locations calculated.
+
+        Yields
+        ======
+        x : float
+            Horizontal location of the equivalent fall height measure.
+        efh : float
+            The equivalent fall height at ``x``.
+        takeoff_speed : float
+            The takeoff speed required to land at ``x``.
+
+        Notes
+        =====
+        The values are nan from the first location where the skier would have
+        to surpass 100 miles per hour onwards. If that location is only found
+        when filling in a gap, the later locations that have already been
+        yielded are yielded again with nan values, so the last value yielded
+        for each location always matches calculate_efh().
+
+        """
+
+        distance_x, _, solve = self._efh_solver(takeoff_angle, takeoff_point,
+                                                skier, increment)
+        num_points = len(distance_x)
+
+        efh = np.full(num_points, np.nan)
+        takeoff_speeds = np.full(num_points, np.nan)
+        solved = np.zeros(num_points, dtype=bool)
+        # index of the first location that can't be landed on
+        abort = num_points
+
+        step = max(int(stride), 1)
+
+        while step >= 1:
+
+            idxs = np.arange(0, num_points, step)
+            idxs = idxs[~solved[idxs]]
+            reachable = idxs[idxs < abort]
+
+            if len(reachable) > 0:
+                # NOTE : The takeoff speeds of the calculated neighbors give
+                # good initial guesses.
+                known = np.flatnonzero(solved & ~np.isnan(takeoff_speeds))
+                if len(known) > 0:
+                    init_speeds = np.interp(distance_x[reachable],
+                                            distance_x[known],
+                                            takeoff_speeds[known])
+                else:
+                    init_speeds = None
+                efh[reachable], takeoff_speeds[reachable] = solve(
+                    reachable, init_speeds)
+            solved[idxs] = True
+
+            stale = np.array([], dtype=int)
+            aborted = reachable[np.isnan(takeoff_speeds[reachable])]
+            if len(aborted) > 0:
+                abort = aborted[0]
+                stale = np.flatnonzero(solved & ~np.isnan(takeoff_speeds) &
+                                       (np.arange(num_points) > abort))
+                efh[stale], takeoff_speeds[stale] = np.nan, np.nan
+
+            for i in np.union1d(idxs, stale):
+                yield distance_x[i], efh[i], takeoff_speeds[i]
+
+            step //= 2
+
+        if abort < num_points:
+            msg = ('Impact of the surface from above is only possible until'
+                   ' {:.2f} meters. Calculation aborted.')
+            logging.warning(msg.format(distance_x[abort]))
+
+    def update_efh(self, previous_surface, previous_efh, takeoff_angle,
+                   takeoff_point, skier, increment=0.2):
+        """Returns the equivalent fall height for this surface, an edited
+        version of a previous surface, by only recalculating the landing
+        locations where the edit changed the surface's height or slope. The
+        equivalent fall height at a location only depends on the takeoff and
+        the surface at that location, so the cost scales with the size of the
+        edit instead of the length of the surface.
+
+        Parameters
+        ==========
+        previous_surface : Surface
+            The surface before it was edited.
+        previous_efh : 3-tuple of ndarrays
+            The ``distance_x``, ``efh``, and ``takeoff_speeds`` returned by
+            ``previous_surface.calculate_efh()`` with the same takeoff angle,
+            takeoff point, skier, and increment and without a tolerance.
+        takeoff_angle : float
+            Takeoff angle in radians.
+        takeoff_point : 2-tuple of floats
+            x and y coordinates of the point at which the skier leaves the
+            takeoff ramp.
+        skier : Skier
+            A skier instance.
+        increment : float, optional
+            x increment in meters between each calculated landing location.
+
+        Returns
+        =======
+        distance_x : ndarray, shape(n,)
+            Horizontal x locations of the equivalent fall height measures,
+            see calculate_efh().
+        efh : ndarray, shape(n,)
+            The equivalent fall height corresponding to each value in
+            ``distance_x``.
+        takeoff_speeds : ndarray, shape(n,)
+            The takeoff speed required to land the corresponding x coordinate.
+
+        """
+
+        distance_x, geometry, solve = self._efh_solver(
+            takeoff_angle, takeoff_point, skier, increment)
+        previous_x, previous_geometry, _ = previous_surface._efh_solver(
+            takeoff_angle, takeoff_point, skier, increment)
+
+        if (previous_x.shape != distance_x.shape or
+                np.shape(previous_efh[0]) != distance_x.shape or
+                not np.allclose(previous_x, distance_x) or
+                not np.allclose(previous_efh[0], distance_x)):
+            logging.info('The landing locations have changed, the equivalent '
+                         'fall height is calculated at all of them.')
+            return self.calculate_efh(takeoff_angle, takeoff_point, skier,
+                                      increment=increment)
+
+        num_points = len(distance_x)
+        efh = np.array(previous_efh[1], dtype=float)
+        takeoff_speeds = np.array(previous_efh[2], dtype=float)
+
+        # NOTE : The previous result is nan from the first location that
+        # couldn't be landed on, the locations after it were never calculated.
+        previous_nan = np.isnan(takeoff_speeds)
+        uncalculated = np.zeros(num_points, dtype=bool)
+        if np.any(previous_nan):
+            uncalculated[np.argmax(previous_nan) + 1:] = True
+
+        changed = np.any(np.abs(geometry - previous_geometry) > 1e-12, axis=1)
+        idxs = np.flatnonzero(changed)
+        if len(idxs) > 0:
+            efh[idxs], takeoff_speeds[idxs] = solve(
+                idxs, np.where(uncalculated, np.nan, takeoff_speeds)[idxs])
+        uncalculated[idxs] = False
+        num_calculated = len(idxs)
+
+        # The edit may allow landing beyond the previous first location that
+        # couldn't be landed on.
+        aborted = np.isnan(takeoff_speeds) & ~uncalculated
+        first = np.argmax(aborted) if np.any(aborted) else num_points
+        idxs = np.flatnonzero(uncalculated)
+        idxs = idxs[idxs < first]
+        if len(idxs) > 0:
+            efh[idxs], takeoff_speeds[idxs] = solve(idxs)
+            num_calculated += len(idxs)
+
+        if np.any(np.isnan(takeoff_speeds)):
+            first = np.argmax(np.isnan(takeoff_speeds))
+            efh[first:], takeoff_speeds[first:] = np.nan, np.nan
+            msg = ('Impact of the surface from above is only possible until'
+                   ' {:.2f} meters. Calculation aborted.')
+            logging.warning(msg.format(distance_x[first]))
+
+        logging.info('Equivalent fall height recalculated at {} of {} landing '
+                     'locations.'.format(num_calculated, num_points))
 
         return distance_x, efh, takeoff_speeds
 
@@ -343,20 +926,20 @@ class HorizontalSurface(Surface):
 
         Parameters
         ==========
-        xp : float
+        xp : float or array_like, shape(k,)
             The horizontal, x, coordinate of the point.
-        yp : float
+        yp : float or array_like, shape(k,)
             The vertical, y, coordinate of the point.
 
         Returns
         =======
-        distance : float
+        distance : float or ndarray, shape(k,)
             The shortest distance from the point to the surface. If the point
             is above the surface a positive distance is returned, else a
             negative distance.
 
         """
-        return yp - self.y[0]
+        return np.asarray(yp) - self.y[0]
 
 
 class FlatSurface(Surface):
@@ -404,21 +987,28 @@ class FlatSurface(Surface):
 
         Parameters
         ==========
-        xp : float
+        xp : float or array_like, shape(k,)
             The horizontal, x, coordinate of the point.
-        yp : float
+        yp : float or array_like, shape(k,)
             The vertical, y, coordinate of the point.
 
         Returns
         =======
-        distance : float
-            The shortest distance from the point to the surface. If the point
-            is above the surface a positive distance is returned, else a
-            negative distance.
+        distance : float or ndarray, shape(k,)
+            The shortest distance from the point to the line through the
+            surface. If the point is above the surface a positive distance is
+            returned, else a negative distance.
 
         """
 
-        if compute_dist_from_flat is None:
+        # NOTE : The distance is measured from the start of the surface, so
+        # surfaces that don't start on the line through the origin are
+        # handled.
+        xp = xp - self.x[0]
+        yp = yp - self.y[0]
+
+        # NOTE : The compiled function only takes scalars.
+        if compute_dist_from_flat is None or np.ndim(xp) or np.ndim(yp):
             m = np.tan(self.angle)
             d = (yp - m * xp) * np.cos(self.angle)
             return d
@@ -633,7 +1223,7 @@ class LandingTransitionSurface(Surface):
 
     acc_error_tolerance = 0.001
     max_iterations = 1000
-    delta = 0.01  # used for central difference approximation
+    delta = 0.01  # distance backed up from the end of the flight
 
     def __init__(self, parent_surface, flight_traj, fall_height, tolerable_acc,
                  num_points=100):
@@ -679,7 +1269,9 @@ class LandingTransitionSurface(Surface):
     def calc_trans_acc(self, x):
         """Returns the acceleration in G's the skier feels at the exit
         transition occurring if the transition starts at the provided
-        horizontal location, x."""
+        horizontal location, x. x can be a float or an array of floats, in
+        which case arrays of the accelerations and characteristic distances
+        are returned."""
 
         # TODO : This code seems to be repeated some in the LandingSurface
         # creation code.
@@ -687,16 +1279,14 @@ class LandingTransitionSurface(Surface):
         # NOTE : "slope" means dy/dx here
 
         flight_y, flight_speed, flight_angle = \
-            self.flight_traj.interp_wrt_x(x)[[2, 9, 8]]
+            self.flight_traj.interp_wrt_x(x)[..., [2, 9, 8]].T
 
         # NOTE : Not sure if setting this to pi/2 if the flight speed is
         # greater than the allowable impact speed is a correct thing to do but
         # it prevents some arcsin RunTimeWarnings for invalid values.
         ratio = self.allowable_impact_speed / flight_speed
-        if ratio > 1.0:
-            flight_rel_landing_angle = np.pi / 2
-        else:
-            flight_rel_landing_angle = np.arcsin(ratio)
+        flight_rel_landing_angle = np.where(
+            ratio > 1.0, np.pi / 2, np.arcsin(np.minimum(ratio, 1.0)))
 
         landing_angle = flight_angle + flight_rel_landing_angle
         landing_slope = np.tan(landing_angle)  # y'E(x0)
@@ -720,16 +1310,6 @@ class LandingTransitionSurface(Surface):
 
         return np.abs(trans_acc / GRAV_ACC), char_dist
 
-    def _find_dgdx(self, x):
-
-        x_plus = x + self.delta
-        x_minus = x - self.delta
-
-        acc_plus, _ = self.calc_trans_acc(x_plus)
-        acc_minus, _ = self.calc_trans_acc(x_minus)
-
-        return (acc_plus - acc_minus) / 2 / self.delta
-
     def find_transition_point(self):
         """Returns the horizontal position indicating the intersection of the
         flight path with the beginning of the landing transition. This is the
@@ -739,45 +1319,59 @@ class LandingTransitionSurface(Surface):
 
         Notes
         =====
-        This uses Newton's method to find an adequate point but may fail to do
-        so with some combinations of flight trajectories, parent slope
-        geometry, and allowable acceleration. A warning will be emitted if the
-        maximum number of iterations is reached in this search and the curve is
-        likely invalid.
+        The transition acceleration is evaluated at all of the flight
+        trajectory's samples after the point parallel to the parent slope at
+        once. The first sample after the first tolerable sample whose
+        acceleration exceeds the tolerable acceleration and the sample before
+        it bracket the transition point,
+        which is then refined by bisection until the acceleration is within
+        LandingTransitionSurface.acc_error_tolerance of the tolerable
+        acceleration. If no sample exceeds it, the transition starts just
+        before the end of the flight.
 
         """
 
-        i = 0
-        g_error = np.inf
-        x, _ = self.find_parallel_traj_point()
-        xpara = float(x)  # copy
-
-        while g_error > .001:  # tolerance
-
-            transition_Gs, char_dist = self.calc_trans_acc(x)
-
-            g_error = abs(transition_Gs - self.tolerable_acc)
-
-            dx = -g_error / self._find_dgdx(x)
+        xpara, _ = self.find_parallel_traj_point()
+        xpara = float(xpara)
 
-            x += dx
+        flight_x = self.flight_traj.pos[:, 0]
+        xs = np.hstack((xpara, flight_x[flight_x > xpara]))
 
-            if x >= self.flight_traj.pos[-1, 0]:
-                msg = ('No landing transition point was found, backing up to '
-                       'last possible point.')
-                logging.info(msg)
-                x = self.flight_traj.pos[-1, 0] - 2 * self.delta
+        with np.errstate(divide='ignore', invalid='ignore'):
+            transition_Gs, _ = self.calc_trans_acc(xs)
+        tolerable = transition_Gs <= self.tolerable_acc
 
-            if i > self.max_iterations:
-                msg = 'Landing transition while loop ran more than {} times.'
-                logging.warning(msg.format(self.max_iterations))
-                break
-            else:
-                i += 1
-
-        logging.debug('{} iterations in the landing transition loop.'.format(i))
+        if not np.any(tolerable):
+            msg = 'Not able to find valid landing transition point.'
+            raise InvalidJumpError(msg)
 
-        x -= dx  # loop stops after dx is added, so take previous
+        # NOTE : The acceleration may first decrease below the tolerable
+        # acceleration after the parallel point, so the search starts at the
+        # first tolerable sample.
+        first = np.argmax(tolerable)
+        exceeds = ~tolerable[first:]
+
+        if not np.any(exceeds):
+            msg = ('No landing transition point was found, backing up to '
+                   'last possible point.')
+            logging.info(msg)
+            x = flight_x[-1] - 2 * self.delta
+        else:
+            i = first + np.argmax(exceeds)
+            lower, upper = xs[i - 1], xs[i]
+            for iteration in range(self.max_iterations):
+                x = (lower + upper) / 2.0
+                g_error = self.calc_trans_acc(x)[0] - self.tolerable_acc
+                if abs(g_error) <= self.acc_error_tolerance:
+                    break
+                elif g_error > 0.0:
+                    upper = x
+                else:
+                    lower = x
+            logging.debug('{} iterations in the landing transition '
+                          'bisection.'.format(iteration + 1))
+
+        transition_Gs, char_dist = self.calc_trans_acc(x)
 
         msg = ("The maximum landing transition acceleration is {} G's and the "
                "tolerable landing transition acceleration is {} G's.")
@@ -835,7 +1429,7 @@ class LandingSurface(Surface):
     """Class that defines an equivalent fall height landing surface."""
 
     def __init__(self, skier, takeoff_point, takeoff_angle, max_landing_point,
-                 fall_height, surf):
+                 fall_height, surf, method='shooting'):
         """Instantiates a surface that ensures impact velocity is equivalent to
         that from a vertical fall.
 
@@ -856,19 +1450,36 @@ class LandingSurface(Surface):
             greater than zero.
         surf : Surface
             A surface below the full flight trajectory, the parent slope is a
-            good choice. It is useful if the distance_from() method runs very
-            fast, as it is called a lot internally.
+            good choice. It is stored but no longer needed to compute the
+            landing surface.
+        method : string, optional
+            How the impact velocity at each point of the surface is found.
+            ``'shooting'`` finds it with Skier.speed_to_land_at() and
+            ``'family'`` interpolates it from flights integrated once for a
+            grid of takeoff speeds, which is several times faster. The
+            surfaces agree to about 0.1 millimeters.
+
+        Notes
+        =====
+        The number of landing points whose takeoff speed was shot for
+        ('misses'), answered from the recently converged points ('hits') and
+        the total number of flights of the shots ('iterations') are stored in
+        the shooting_stats dictionary attribute.
 
         """
         if fall_height <= 0.0:
             raise InvalidJumpError('Fall height must be greater than zero.')
 
+        if method not in ('shooting', 'family'):
+            raise ValueError("method must be 'shooting' or 'family'.")
+
         self.skier = skier
         self.takeoff_point = takeoff_point
         self.takeoff_angle = takeoff_angle
         self.max_landing_point = max_landing_point
         self.fall_height = fall_height
         self.surf = surf
+        self.method = method
 
         x, y = self._create_safe_surface()
 
@@ -886,6 +1497,87 @@ class LandingSurface(Surface):
         """Returns the x and y coordinates of the equivalent fall height
         landing surface."""
 
+        self.shooting_stats = {'hits': 0, 'misses': 0, 'iterations': 0}
+
+        # NOTE : This is working for this range (back to 16.5), I think it is
+        # getting hung in the find skier.speed_to_land_at().
+
+        x_eval = np.linspace(self.max_landing_point[0], self.takeoff_point[0],
+                             num=1000)
+
+        logging.debug(x_eval)
+
+        y0 = self.max_landing_point[1]
+
+        logging.info('Integrating landing surface.')
+        start_time = time.time()
+        y = self._integrate_safe_surface(x_eval, y0, self.method)
+        msg = 'Landing surface finished in {} seconds.'
+        logging.info(msg.format(time.time() - start_time))
+
+        x = x_eval[::-1]
+        y = y[::-1]
+
+        return x, y
+
+    def _shooter(self):
+        """Returns a function that returns the takeoff speed and impact
+        velocity to land at a point, counted in shooting_stats."""
+
+        # NOTE : Consecutive evaluations of rhs() land at nearby points, so
+        # each shot starts from the drag free takeoff speed scaled by the
+        # ratio of the converged to the drag free takeoff speed at the
+        # nearest of the recently converged points. Repeated points are not
+        # shot again.
+        recent = deque(maxlen=8)
+
+        def shoot(landing_point):
+            x, y = landing_point
+            for point, _, takeoff_speed, impact_vel in recent:
+                if point == (x, y):
+                    self.shooting_stats['hits'] += 1
+                    return takeoff_speed, impact_vel
+            self.shooting_stats['misses'] += 1
+            init_speed = None
+            if recent:
+                ratio = min(recent, key=lambda r: (r[0][0] - x)**2 +
+                            (r[0][1] - y)**2)[1]
+                init_speed = ratio * _drag_free_speed(landing_point,
+                                                      self.takeoff_point,
+                                                      self.takeoff_angle)
+            takeoff_speed, impact_vel, iterations = \
+                self.skier._speed_to_land_at(landing_point,
+                                             self.takeoff_point,
+                                             self.takeoff_angle,
+                                             init_speed=init_speed)
+            self.shooting_stats['iterations'] += iterations
+            if takeoff_speed > 0.0:
+                ratio = takeoff_speed / _drag_free_speed(landing_point,
+                                                         self.takeoff_point,
+                                                         self.takeoff_angle)
+                recent.append(((x, y), ratio, takeoff_speed, impact_vel))
+            return takeoff_speed, impact_vel
+
+        return shoot
+
+    def _safe_surface_rhs(self, method):
+        """Returns the right hand side of the landing surface's ordinary
+        differential equation, with the impact velocities found with the
+        given method."""
+
+        shoot = self._shooter()
+
+        if method == 'family':
+            # NOTE : The skier must take off fastest to reach the end of the
+            # surface, the margin keeps the end inside the family.
+            max_speed = shoot(self.max_landing_point)[0]
+            speed_to_land_at = _FlightFamily(
+                self.skier, self.takeoff_point, self.takeoff_angle,
+                1.1 * max_speed, self.max_landing_point[0],
+                fallback=shoot).speed_to_land_at
+        else:
+            speed_to_land_at = shoot
+
         def rhs(x, y):
             """Returns the slope of the safe surface that ensures the impact
             speed is equivalent to the impact speed from the equivalent fall
@@ -913,8 +1605,7 @@ class LandingSurface(Surface):
 
             logging.debug('x = {}, y = {}'.format(x, y))
 
-            takeoff_speed, impact_vel = self.skier.speed_to_land_at(
-                (x, y), self.takeoff_point, self.takeoff_angle, self.surf)
+            takeoff_speed, impact_vel = speed_to_land_at((x, y))
 
             if takeoff_speed > 0.0:
                 impact_speed, impact_angle = vel2speed(*impact_vel)
@@ -948,27 +1639,20 @@ class LandingSurface(Surface):
 
             return dydx
 
-        # NOTE : This is working for this range (back to 16.5), I think it is
-        # getting hung in the find skier.speed_to_land_at().
+        return rhs
 
-        x_eval = np.linspace(self.max_landing_point[0], self.takeoff_point[0],
-                             num=1000)
+    def _integrate_safe_surface(self, x_eval, y0, method):
+        """Returns the heights of the landing surface at x_eval, integrated
+        from the height y0 at x_eval[0]."""
 
-        logging.debug(x_eval)
+        rhs = self._safe_surface_rhs(method)
 
-        y0 = np.array([self.max_landing_point[1]])
+        y0 = np.array([y0])
 
         logging.debug('Making sure rhs() works.')
-        logging.debug(rhs(self.max_landing_point[0], y0))
+        logging.debug(rhs(x_eval[0], y0))
 
-        logging.info('Integrating landing surface.')
-        start_time = time.time()
         sol = solve_ivp(rhs, (x_eval[0], x_eval[-1]), y0, t_eval=x_eval,
                         max_step=1.0)
-        msg = 'Landing surface finished in {} seconds.'
-        logging.info(msg.format(time.time() - start_time))
 
-        x = sol.t[::-1]
-        y = sol.y.squeeze()[::-1]
-
-        return x, y
+        return sol.y[0]
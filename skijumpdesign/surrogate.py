@@ -0,0 +1,268 @@
+import bisect
+import logging
+from functools import reduce
+
+import numpy as np
+
+from .version import __version__
+from .functions import make_jump
+from .sweeps import sweep, OUTPUT_COLUMNS
+
+# The design parameters that the surrogate interpolates over.
+AXES = ('slope_angle', 'approach_len', 'takeoff_angle', 'fall_height')
+
+
+class Surrogate(object):
+    """An interpolant of the make_jump() outputs over a grid of designs that
+    estimates them in microseconds.
+
+    The outputs are interpolated multilinearly between the designs of the
+    grid. A design is trusted if it is in the grid and all of the corners of
+    its grid cell are valid designs. The error of each cell's interpolation
+    is estimated from the second differences of the outputs at its corners.
+
+    """
+
+    # NOTE : Values that are within this tolerance of a grid value are on the
+    # grid, e.g. for axes with a single value.
+    tolerance = 1e-6
+    # NOTE : The second differences at the corners of a cell can
+    # underestimate the second derivatives inside it, so the error bounds are
+    # multiplied by this factor. The errors at 30 random designs of a
+    # 3x3x3x4 grid were at most 0.58 times the bounds.
+    error_factor = 2.0
+
+    def __init__(self, axes, values, start_pos=0.0):
+        """Instantiates the surrogate.
+
+        Parameters
+        ==========
+        axes : sequence of 4 array_like
+            The increasing slope angles, approach lengths, takeoff angles and
+            fall heights of the grid.
+        values : array_like, shape(n, m, o, p, 5)
+            The make_jump() outputs at the grid's designs in the order of
+            OUTPUT_COLUMNS, NaN for the designs that are invalid.
+        start_pos : float, optional
+            The start position of the grid's designs.
+
+        """
+
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.values = np.asarray(values, dtype=float)
+        self.start_pos = start_pos
+
+        shape = tuple(len(axis) for axis in self.axes)
+        if self.values.shape != shape + (len(OUTPUT_COLUMNS),):
+            raise ValueError('The values must have shape {}.'.format(
+                shape + (len(OUTPUT_COLUMNS),)))
+
+        self.feasible = ~np.any(np.isnan(self.values), axis=-1)
+        self.errors = self._estimate_errors()
+
+        # NOTE : Python floats and bisect are faster than NumPy for the
+        # lookups of a single design.
+        self._axes_lists = [axis.tolist() for axis in self.axes]
+
+        logging.info('Surrogate of {} designs, {} valid.'.format(
+            self.feasible.size, np.sum(self.feasible)))
+
+    @classmethod
+    def from_sweep(cls, table):
+        """Returns the surrogate of a table returned by sweep() or
+        load_sweep()."""
+
+        start_pos = np.unique(table['start_pos'])
+        if len(start_pos) != 1:
+            raise ValueError('The designs must have the same start position.')
+
+        axes = [np.unique(table[name]) for name in AXES]
+        shape = tuple(len(axis) for axis in axes)
+        if np.prod(shape) != len(table[AXES[0]]):
+            raise ValueError('The designs must be a grid.')
+
+        idxs = tuple(np.searchsorted(axis, table[name]) for axis, name in
+                     zip(axes, AXES))
+        values = np.full(shape + (len(OUTPUT_COLUMNS),), np.nan)
+        values[idxs] = np.column_stack([table[column] for column, _ in
+                                        OUTPUT_COLUMNS])
+
+        return cls(axes, values, start_pos=float(start_pos[0]))
+
+    def _estimate_errors(self):
+        """Returns the estimated error bound of the outputs in each grid
+        cell, shape(n - 1, m - 1, o - 1, p - 1, 5), with the axes of a single
+        value kept."""
+
+        # NOTE : The error of linear interpolation is at most h**2 / 8 times
+        # the second derivative, and the second difference is about h**2
+        # times the second derivative. Second differences that involve an
+        # invalid design are NaN.
+        node_errors = np.zeros_like(self.values)
+        for axis, num in enumerate(self.values.shape[:-1]):
+            if num == 1:
+                continue
+            elif num == 2:
+                node_errors += np.nan
+                continue
+            diff2 = np.abs(np.diff(self.values, n=2, axis=axis))
+            pad = [(0, 0)] * self.values.ndim
+            pad[axis] = (1, 1)
+            node_errors += self.error_factor * np.pad(diff2, pad,
+                                                      mode='edge') / 8
+
+        cell_errors = node_errors
+        for axis, num in enumerate(self.values.shape[:-1]):
+            if num > 1:
+                lower = np.take(cell_errors, range(num - 1), axis=axis)
+                upper = np.take(cell_errors, range(1, num), axis=axis)
+                cell_errors = np.maximum(lower, upper)
+
+        return cell_errors
+
+    def _cell(self, slope_angle, approach_len, takeoff_angle, fall_height):
+        """Returns the slices of the grid cell that contains the design and
+        the interpolation weights along each axis, or None if the design is
+        outside of the grid."""
+        slices, weights = [], []
+        for axis, value in zip(self._axes_lists, (slope_angle, approach_len,
+                                                  takeoff_angle,
+                                                  fall_height)):
+            if (value < axis[0] - self.tolerance or
+                    value > axis[-1] + self.tolerance):
+                return None
+            if len(axis) == 1:
+                slices.append(slice(0, 1))
+                weights.append(np.ones(1))
+                continue
+            i = min(max(bisect.bisect_right(axis, value) - 1, 0),
+                    len(axis) - 2)
+            t = min(max((value - axis[i]) / (axis[i + 1] - axis[i]), 0.0),
+                    1.0)
+            slices.append(slice(i, i + 2))
+            weights.append(np.array([1.0 - t, t]))
+        return tuple(slices), weights
+
+    def estimate(self, slope_angle, approach_len, takeoff_angle, fall_height):
+        """Returns the estimated make_jump() outputs of a design.
+
+        Parameters
+        ==========
+        slope_angle, approach_len, takeoff_angle, fall_height : float
+            The design parameters, see make_jump().
+
+        Returns
+        =======
+        outputs : ndarray, shape(5,)
+            The estimated outputs in the order of OUTPUT_COLUMNS. NaN if the
+            design isn't trusted.
+        errors : ndarray, shape(5,)
+            The estimated error bounds of the outputs, NaN if they are
+            unknown, e.g. next to invalid designs.
+        trusted : boolean
+            True if the design is in the grid and all of the corners of its
+            grid cell are valid designs.
+
+        """
+
+        nan = np.full(len(OUTPUT_COLUMNS), np.nan)
+
+        cell = self._cell(slope_angle, approach_len, takeoff_angle,
+                          fall_height)
+        if cell is None:
+            return nan, nan, False
+        slices, weights = cell
+
+        if not self.feasible[slices].all():
+            return nan, nan, False
+
+        weights = reduce(np.multiply.outer, weights)
+        outputs = np.tensordot(weights, self.values[slices], axes=4)
+
+        return outputs, self.errors[tuple(s.start for s in slices)], True
+
+    def feasibility(self, slope_angle, approach_len, takeoff_angle,
+                    fall_height):
+        """Returns the interpolated fraction of valid designs around the
+        design, from 0.0 if the surrounding grid designs are all invalid to
+        1.0 if they are all valid, or NaN outside of the grid. Designs above
+        0.5 are likely valid."""
+        cell = self._cell(slope_angle, approach_len, takeoff_angle,
+                          fall_height)
+        if cell is None:
+            return np.nan
+        slices, weights = cell
+        weights = reduce(np.multiply.outer, weights)
+        return float(np.sum(weights * self.feasible[slices]))
+
+
+def fit_surrogate(slope_angles, approach_lens, takeoff_angles, fall_heights,
+                  start_pos=0.0, workers=None, journal=None):
+    """Returns the surrogate of the grid of designs made with sweep(). See
+    sweep() for the parameters."""
+    table = sweep(slope_angles, approach_lens, takeoff_angles, fall_heights,
+                  start_pos=start_pos, workers=workers, journal=journal)
+    return Surrogate.from_sweep(table)
+
+
+def save_surrogate(surrogate, path):
+    """Saves a surrogate to a compressed NumPy .npz file."""
+    np.savez_compressed(path, values=surrogate.values,
+                        start_pos=surrogate.start_pos, version=__version__,
+                        **dict(zip(AXES, surrogate.axes)))
+
+
+def load_surrogate(path):
+    """Returns the surrogate saved by save_surrogate() at path."""
+    with np.load(path) as data:
+        if str(data['version']) != __version__:
+            logging.warning('The surrogate {} was made with skijumpdesign {}, '
+                            'not {}.'.format(path, data['version'],
+                                             __version__))
+        return Surrogate([data[name] for name in AXES], data['values'],
+                         start_pos=float(data['start_pos']))
+
+
+def make_jump_estimate(slope_angle, start_pos, approach_len, takeoff_angle,
+                       fall_height, surrogate, tolerance=None):
+    """Returns the outputs of make_jump() for a design estimated by the
+    surrogate, or calculated by make_jump() if the design isn't trusted.
+
+    Parameters
+    ==========
+    slope_angle, start_pos, approach_len, takeoff_angle, fall_height : float
+        The design parameters, see make_jump().
+    surrogate : Surrogate
+        The surrogate of a grid of designs.
+    tolerance : float, optional
+        If given, make_jump() is also called if the estimated error bound of
+        any output is larger than this or unknown.
+
+    Returns
+    =======
+    outputs : dictionary
+        The outputs of the design with the keys of the outputs of
+        make_jump().
+
+    Raises
+    ======
+    InvalidJumpError
+        If make_jump() is called and raises it.
+
+    """
+
+    trusted = abs(start_pos - surrogate.start_pos) <= surrogate.tolerance
+    if trusted:
+        outputs, errors, trusted = surrogate.estimate(
+            slope_angle, approach_len, takeoff_angle, fall_height)
+    if trusted and tolerance is not None:
+        # NOTE : Unknown errors are NaN, which fail the comparison.
+        trusted = np.all(errors <= tolerance)
+
+    if not trusted:
+        logging.info('Calling make_jump() for the untrusted design.')
+        return make_jump(slope_angle, start_pos, approach_len, takeoff_angle,
+                         fall_height)[-1]
+
+    return {key: float(value) for (_, key), value in zip(OUTPUT_COLUMNS,
+                                                          outputs)}
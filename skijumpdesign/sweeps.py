@@ -0,0 +1,310 @@
+import os
+import json
+import math
+import hashlib
+import logging
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .version import __version__
+from .skiers import Skier
+from .functions import make_jump
+from .utils import InvalidJumpError
+
+# The columns of a sweep's table, the designs' inputs followed by the
+# make_jump() outputs.
+INPUT_COLUMNS = ('slope_angle', 'start_pos', 'approach_len', 'takeoff_angle',
+                 'fall_height')
+OUTPUT_COLUMNS = (('takeoff_speed', 'Takeoff Speed'),
+                  ('flight_time', 'Flight Time'),
+                  ('flight_distance', 'Flight Distance'),
+                  ('flight_height', 'Flight Height'),
+                  ('snow_budget', 'Snow Budget'))
+
+
+class Journal(object):
+    """An append only file of the results of the completed work units of a
+    long job, e.g. the designs of a sweep. Each result is written to disk as
+    soon as it is added, so a job that crashes or is killed can be restarted
+    with the same journal and only compute the units that are missing.
+
+    Results are keyed by a hash of the unit's inputs and the version of
+    skijumpdesign, so results of other versions are not reused.
+
+    """
+
+    def __init__(self, path):
+        """Loads the results in the journal, if the file exists. It is
+        created when the first result is added.
+
+        Parameters
+        ==========
+        path : string
+            The path of the journal file.
+
+        """
+        self.path = path
+        self._results = {}
+
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                lines = f.read().decode().split('\n')
+                # NOTE : The last line is incomplete if the job was killed
+                # while writing it, so it is removed before appending.
+                if lines[-1]:
+                    logging.warning('Removing the incomplete last line of '
+                                    'the journal {}.'.format(path))
+                    f.truncate(f.tell() - len(lines[-1].encode()))
+                for line in lines[:-1]:
+                    try:
+                        record = json.loads(line)
+                        self._results[record['key']] = record['result']
+                    except (ValueError, KeyError, TypeError):
+                        logging.warning('Skipping a corrupt line of the '
+                                        'journal {}.'.format(path))
+
+        logging.info('Loaded {} results from the journal {}.'.format(
+            len(self._results), path))
+
+    @staticmethod
+    def key(*inputs):
+        """Returns the key of a work unit with the given inputs, floats,
+        strings or arrays."""
+        sha = hashlib.sha1(__version__.encode())
+        for value in inputs:
+            if isinstance(value, str):
+                sha.update(value.encode())
+            else:
+                value = np.ascontiguousarray(value, dtype=float)
+                sha.update(str(value.shape).encode())
+                sha.update(value.tobytes())
+        return sha.hexdigest()
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def add(self, key, result):
+        """Stores the result of a work unit, a JSON serializable object,
+        appending it to the journal file and flushing it to disk."""
+        self._results[key] = result
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'key': key, 'result': result}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _run_journaled(func, units, keys, workers, journal, encode, decode):
+    """Returns the results of func for each of the units, computing only those
+    whose keys aren't in the journal, if given, and adding each computed
+    result to it as soon as it is returned."""
+
+    if journal is not None:
+        journal = Journal(journal)
+        todo = [i for i, key in enumerate(keys) if key not in journal]
+    else:
+        todo = list(range(len(units)))
+
+    logging.info('Computing {} of {} work units.'.format(len(todo),
+                                                         len(units)))
+
+    results = [None] * len(units)
+
+    def store(results_todo):
+        for i, result in zip(todo, results_todo):
+            results[i] = result
+            if journal is not None:
+                journal.add(keys[i], encode(result))
+
+    if workers is None or workers < 2 or len(todo) < 2:
+        store(func(units[i]) for i in todo)
+    else:
+        chunksize = max(1, math.ceil(len(todo) / (4 * workers)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            store(executor.map(func, [units[i] for i in todo],
+                               chunksize=chunksize))
+
+    if journal is not None:
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                results[i] = decode(journal[key])
+
+    return results
+
+
+def _sweep_design(design):
+    """Returns the outputs of make_jump() for a design as a tuple in the
+    order of OUTPUT_COLUMNS and the reason the design failed, an empty string
+    if it didn't."""
+    try:
+        *_, outputs = make_jump(*design)
+    except InvalidJumpError as e:
+        return (np.nan,) * len(OUTPUT_COLUMNS), str(e)
+    return tuple(outputs[key] for _, key in OUTPUT_COLUMNS), ''
+
+
+def sweep(slope_angles, approach_lens, takeoff_angles, fall_heights,
+          start_pos=0.0, workers=None, path=None, journal=None):
+    """Returns a table of the make_jump() outputs for every combination of the
+    design parameters.
+
+    Parameters
+    ==========
+    slope_angles : array_like, shape(n,)
+        The parent slope angles in degrees.
+    approach_lens : array_like, shape(m,)
+        The approach lengths in meters.
+    takeoff_angles : array_like, shape(o,)
+        The takeoff angles in degrees.
+    fall_heights : array_like, shape(p,)
+        The equivalent fall heights in meters.
+    start_pos : float, optional
+        The start position of all of the designs in meters along the parent
+        slope.
+    workers : integer, optional
+        If given, the designs are made by a pool of this many worker
+        processes.
+    path : string, optional
+        If given, the table is also saved to this path with save_sweep().
+    journal : string, optional
+        If given, the path of a Journal that each design's outputs are
+        written to as soon as they are made. Designs already in the journal
+        are not made again, so an interrupted sweep is resumed by calling
+        sweep() again with the same journal.
+
+    Returns
+    =======
+    table : OrderedDict
+        The columns of the table, arrays with shape(n*m*o*p,) and one value
+        per design, keyed by the INPUT_COLUMNS, the OUTPUT_COLUMNS and
+        ``failure``, the message of the InvalidJumpError raised by
+        make_jump() for the design or an empty string. The outputs of failed
+        designs are NaN. ``pandas.DataFrame(table)`` converts it to a data
+        frame.
+
+    Notes
+    =====
+    The fall height varies fastest and the slope angle slowest, so
+    consecutive designs share the cached stages of make_jump(). Each worker
+    process is given contiguous designs for the same reason.
+
+    """
+
+    designs = [(slope_angle, start_pos, approach_len, takeoff_angle,
+                fall_height) for slope_angle, approach_len, takeoff_angle,
+               fall_height in itertools.product(slope_angles, approach_lens,
+                                                takeoff_angles, fall_heights)]
+
+    logging.info('Sweeping {} designs.'.format(len(designs)))
+
+    keys = [Journal.key('make_jump', design) for design in designs]
+    results = _run_journaled(_sweep_design, designs, keys, workers, journal,
+                             encode=lambda result: list(result),
+                             decode=lambda result: tuple(result))
+
+    inputs = np.array(designs, dtype=float).reshape(-1, len(INPUT_COLUMNS))
+    outputs = np.array([outputs for outputs, _ in results],
+                       dtype=float).reshape(-1, len(OUTPUT_COLUMNS))
+
+    table = OrderedDict()
+    for column, values in zip(INPUT_COLUMNS, inputs.T):
+        table[column] = values
+    for (column, _), values in zip(OUTPUT_COLUMNS, outputs.T):
+        table[column] = values
+    table['failure'] = np.array([failure for _, failure in results],
+                                dtype=str)
+
+    logging.info('{} of {} designs failed.'.format(
+        np.sum(table['failure'] != ''), len(designs)))
+
+    if path is not None:
+        save_sweep(table, path)
+
+    return table
+
+
+def save_sweep(table, path):
+    """Saves a table returned by sweep() to a compressed NumPy .npz file with
+    one array per column."""
+    np.savez_compressed(path, **table)
+
+
+def load_sweep(path):
+    """Returns the table saved by save_sweep() at path."""
+    columns = (INPUT_COLUMNS + tuple(column for column, _ in OUTPUT_COLUMNS) +
+               ('failure',))
+    with np.load(path) as data:
+        return OrderedDict((column, data[column]) for column in columns)
+
+
+def _efh_job(args):
+    """Returns the results of Surface.calculate_efh() for a job."""
+    (surface, takeoff_angle, takeoff_point), skier, increment, tolerance = args
+    return surface.calculate_efh(takeoff_angle, takeoff_point, skier,
+                                 increment=increment, tolerance=tolerance)
+
+
+def sweep_efh(jobs, skier=None, increment=0.2, tolerance=None, workers=None,
+              journal=None):
+    """Returns the equivalent fall heights of many surfaces.
+
+    Parameters
+    ==========
+    jobs : sequence of 3-tuples
+        The surface, takeoff angle in radians and takeoff point of each
+        equivalent fall height calculation, see Surface.calculate_efh().
+    skier : Skier, optional
+        The skier, the default skier if not given.
+    increment : float, optional
+        x increment in meters between each calculated landing location.
+    tolerance : float, optional
+        The tolerance passed to Surface.calculate_efh().
+    workers : integer, optional
+        If given, the surfaces are calculated by a pool of this many worker
+        processes.
+    journal : string, optional
+        If given, the path of a Journal that each surface's results are
+        written to as soon as they are calculated. Surfaces already in the
+        journal are not calculated again, and the results of the surfaces
+        calculated before an error is raised are kept.
+
+    Returns
+    =======
+    results : list of 3-tuples
+        The landing locations, equivalent fall heights and takeoff speeds
+        returned by Surface.calculate_efh() for each job.
+
+    """
+
+    if skier is None:
+        skier = Skier()
+
+    skier_params = [skier.mass, skier.area, skier.drag_coeff,
+                    skier.friction_coeff]
+    options = [increment, np.nan if tolerance is None else tolerance]
+
+    units, keys = [], []
+    for surface, takeoff_angle, takeoff_point in jobs:
+        units.append(((surface, takeoff_angle, takeoff_point), skier,
+                      increment, tolerance))
+        keys.append(Journal.key('calculate_efh', surface.x, surface.y,
+                                [takeoff_angle], takeoff_point, skier_params,
+                                options))
+
+    def encode(result):
+        # NOTE : NaN is written as the NaN literal, which json reads back.
+        return [values.tolist() for values in result]
+
+    def decode(result):
+        return tuple(np.array(values, dtype=float) for values in result)
+
+    return _run_journaled(_efh_job, units, keys, workers, journal, encode,
+                          decode)
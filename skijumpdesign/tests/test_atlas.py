@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from ..atlas import Atlas, build_atlas, _lattice_axis
+from ..functions import make_jump
+from ..utils import InvalidJumpError
+
+
+def test_atlas(tmpdir):
+
+    path = str(tmpdir.join('atlas'))
+
+    build_atlas(path, [-15.0], [30.0, 40.0], [25.0], [0.0, 0.5])
+
+    atlas = Atlas(path)
+    assert len(atlas) == 4
+    assert atlas.index(-15.0, 40.0, 25.0, 0.5) == 3
+    assert atlas.index(-15.0, 40.0, 25.0, 0.7) is None
+
+    # the slider values can have rounding errors
+    jump = atlas.make_jump(-15.0, 0.0, 40.0, 25.0, 0.1 + 0.4)
+    expected = make_jump(-15.0, 0.0, 40.0, 25.0, 0.5)
+
+    for surf, expected_surf in zip(jump[:5], expected[:5]):
+        np.testing.assert_array_equal(surf.x, expected_surf.x)
+        np.testing.assert_array_equal(surf.y, expected_surf.y)
+    assert jump[0].angle == expected[0].angle
+    np.testing.assert_array_equal(jump[5].pos, expected[5].pos)
+    assert jump[6] == expected[6]
+
+    # a fall height of zero raises an InvalidJumpError
+    with pytest.raises(InvalidJumpError):
+        atlas.make_jump(-15.0, 0.0, 30.0, 25.0, 0.0)
+
+    with pytest.raises(KeyError):
+        atlas.make_jump(-15.0, 0.0, 35.0, 25.0, 0.5)
+    with pytest.raises(KeyError):
+        atlas.make_jump(-15.0, 1.0, 40.0, 25.0, 0.5)
+
+    np.testing.assert_allclose(_lattice_axis(0.1, 1.5, 0.01),
+                               np.arange(10, 151) / 100)
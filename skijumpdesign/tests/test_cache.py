@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ..cache import ResultCache
+from ..functions import make_jump
+from ..skiers import Skier
+from ..surfaces import FlatSurface
+from ..utils import InvalidJumpError
+
+
+def test_result_cache(tmpdir):
+
+    path = str(tmpdir.join('results.sqlite'))
+
+    cache = ResultCache(path)
+
+    *surfs, outputs = cache.make_jump(-15.0, 0.0, 40.0, 25.0, 0.5)
+    assert cache.info()['misses'] == 1
+    assert cache.info()['entries'] == 1
+
+    *expected_surfs, expected_outputs = make_jump(-15.0, 0.0, 40.0, 25.0,
+                                                  0.5)
+    assert outputs == expected_outputs
+    for surf, expected in zip(surfs[:-1], expected_surfs):
+        np.testing.assert_array_equal(surf.x, expected.x)
+    np.testing.assert_array_equal(surfs[-1].pos, expected_surfs[-1].pos)
+
+    # rounding noise hits the stored results, also from another instance
+    # sharing the file
+    other = ResultCache(path)
+    *hit_surfs, hit_outputs = other.make_jump(-15.0, 0.0, 40.0 + 1e-10,
+                                              25.0, 0.5)
+    assert other.info()['hits'] == 1
+    assert hit_outputs == outputs
+    for surf, hit_surf in zip(surfs[:-1], hit_surfs):
+        assert type(surf) == type(hit_surf)
+        np.testing.assert_array_equal(surf.y, hit_surf.y)
+    assert type(hit_surfs[0]) == FlatSurface
+    np.testing.assert_array_equal(hit_surfs[-1].pos, surfs[-1].pos)
+    np.testing.assert_array_equal(hit_surfs[-1].vel, expected_surfs[-1].vel)
+
+    # hits only update the access time if it is older than access_interval
+    accessed = cache._execute('SELECT accessed FROM results')[0][0]
+    other.make_jump(-15.0, 0.0, 40.0, 25.0, 0.5)
+    assert cache._execute('SELECT accessed FROM results')[0][0] == accessed
+    other.access_interval = 0.0
+    other.make_jump(-15.0, 0.0, 40.0, 25.0, 0.5)
+    assert cache._execute('SELECT accessed FROM results')[0][0] > accessed
+    assert other.info()['hits'] == 3
+
+    # failures are stored too
+    with pytest.raises(InvalidJumpError):
+        cache.make_jump(-15.0, 0.0, 40.0, 25.0, 0.0)
+    with pytest.raises(InvalidJumpError):
+        other.make_jump(-15.0, 0.0, 40.0, 25.0, 0.0)
+    assert other.info()['hits'] == 4
+
+    skier = Skier()
+    slope = FlatSurface(-np.deg2rad(30.0), 20.0)
+    results = cache.calculate_efh(slope, 0.2, (0.0, 0.0), skier,
+                                  increment=2.0)
+    expected = slope.calculate_efh(0.2, (0.0, 0.0), skier,
+                                   increment=2.0)
+    hit = other.calculate_efh(slope, 0.2, (0.0, 0.0), skier,
+                              increment=2.0)
+    for values, expected_values, hit_values in zip(results, expected, hit):
+        np.testing.assert_array_equal(values, expected_values)
+        np.testing.assert_array_equal(hit_values, expected_values)
+
+    # only the most recently used results are kept
+    small = ResultCache(path, max_size=1000)
+    small.access_interval = 0.0
+    small.make_jump(-15.0, 0.0, 40.0, 25.0, 0.5)
+    small.put('key', {'value': 1.0})
+    assert small.info()['entries'] == 1
+    assert small.get('key')['value'] == 1.0
+
+    cache.clear()
+    assert cache.info()['entries'] == 0
@@ -6,7 +6,8 @@ try:
 except ImportError:
     pycvodes = False
 
-from ..functions import make_jump, plot_jump, cartesian_from_measurements
+from ..functions import (make_jump, plot_jump, cartesian_from_measurements,
+                         make_jump_cache_info, clear_make_jump_cache)
 from ..utils import InvalidJumpError
 
 
@@ -20,11 +21,43 @@ def test_shift_surface_origin(plot=False):
         plt.show()
 
 
-@pytest.mark.xfail(strict=True)
-def test_make_jump_expected_to_fail():
+def test_make_jump_cache():
+
+    clear_make_jump_cache()
+
+    *surfs, outputs = make_jump(-15.0, 0.0, 30.0, 10.0, 0.5)
+    # the returned surfaces are copies of the cached ones
+    for surface in surfs:
+        surface.shift_coordinates(1.0, 1.0)
+
+    *new_surfs, new_outputs = make_jump(-15.0, 0.0, 30.0, 10.0, 0.6)
+
+    info = make_jump_cache_info()
+    for stage in ('approach', 'takeoff', 'flight'):
+        assert info[stage]['hits'] == 1
+        assert info[stage]['misses'] == 1
+    for stage in ('landing transition', 'landing'):
+        assert info[stage]['hits'] == 0
+        assert info[stage]['misses'] == 2
+
+    *cached_surfs, cached_outputs = make_jump(-15.0, 0.0, 30.0, 10.0, 0.5)
+    assert make_jump_cache_info()['landing']['hits'] == 1
+    assert cached_outputs == outputs
+    for surface, cached_surface in zip(surfs[:-1], cached_surfs[:-1]):
+        np.testing.assert_allclose(surface.x - 1.0, cached_surface.x)
+
+    clear_make_jump_cache()
+    *_, uncached_outputs = make_jump(-15.0, 0.0, 30.0, 10.0, 0.6)
+    assert uncached_outputs == new_outputs
+    assert make_jump_cache_info()['approach'] == {'hits': 0, 'misses': 1,
+                                                  'size': 1}
+
+
+def test_make_jump_used_to_fail():
 
-    # TODO : Fix these.
     # Was Invalid value in sqrt, these hang after the sqrt warning, no errors.
+    # The last one did not find the landing transition point before the
+    # bracketed transition search.
     make_jump(-10.0, 0.0, 30.0, 23.0, 0.2)
     make_jump(-10.0, 0.0, 30.0, 20.0, 0.1)
     make_jump(-11.2, 0.0, 40.0, 10.2, 0.54)
@@ -51,13 +84,10 @@ def test_skier_flies_forever():
     # This used to pass with solve_ivp and not pycvodes, but since the 1.2.0
     # release upstream changes in the dependencies seemed to cause it to fail
     # with both integrators. This now passes with pycvodes with the
-    # introduction of the surface spacing resampling at 0.3 meters.
+    # introduction of the surface spacing resampling at 0.3 meters and with
+    # both integrators with the bracketed landing transition search.
 
-    if pycvodes:
-        make_jump(-10.0, 0.0, 30.0, 20.0, 1.5)
-    else:
-        with pytest.raises(InvalidJumpError):
-            make_jump(-10.0, 0.0, 30.0, 20.0, 1.5)
+    make_jump(-10.0, 0.0, 30.0, 20.0, 1.5)
 
 
 def test_slow_skier():
@@ -100,12 +130,9 @@ def test_problematic_jump_parameters():
 
     # Used to be: ValueError: need at least one array to concatenate
     # Also has: while loop ran more than 1000 times. This no longer fails with
-    # pycvodes with the 0.3 m resampling.
-    if pycvodes:
-        make_jump(-15.0, 0.0, 30.0, 20.0, 2.8)
-    else:
-        with pytest.raises(InvalidJumpError):
-            make_jump(-15.0, 0.0, 30.0, 20.0, 2.8)
+    # pycvodes with the 0.3 m resampling and with both integrators with the
+    # bracketed landing transition search.
+    make_jump(-15.0, 0.0, 30.0, 20.0, 2.8)
 
     # Used to be too much fall height
     make_jump(-15.0, 0.0, 30.0, 20.0, 3.0)
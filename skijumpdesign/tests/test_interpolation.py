@@ -0,0 +1,39 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.interpolate import interp1d
+
+from ..interpolation import Interpolator
+
+
+def test_interpolator():
+
+    x_uniform = np.linspace(-3.0, 7.0, num=50)
+    x_nonuniform = np.cumsum(np.linspace(0.1, 0.5, num=50))
+
+    x_new = np.array([-10.0, -3.0, 0.123, 1.0, 2.2, 5.0, 6.999, 7.0, 12.0,
+                      19.0])
+
+    for x in [x_uniform, x_nonuniform]:
+        for y in [np.sin(x), np.vstack((np.sin(x), x**2, np.cos(x))).T]:
+
+            expected = interp1d(x, y, axis=0, fill_value='extrapolate')
+            interp = Interpolator(x, y)
+
+            assert_allclose(interp(x_new), expected(x_new))
+            assert_allclose(interp(x), y)
+
+            # scalar lookups, in an order that moves the cached segment
+            for xi in np.hstack((x_new, x_new[::-1], x[::3])):
+                assert_allclose(interp(xi), expected(xi))
+                assert_allclose(interp(float(xi)), expected(xi))
+
+            assert np.isnan(interp(np.nan)).all()
+            assert np.isnan(interp(np.array([np.nan, 1.0]))[0]).all()
+
+    # decreasing x values, e.g. the slope of a flight trajectory
+    slope = np.linspace(0.5, -1.5, num=20)
+    pos = np.vstack((np.linspace(0.0, 10.0, num=20),
+                     np.linspace(1.0, -3.0, num=20))).T
+    interp = Interpolator(slope, pos)
+    assert_allclose(interp(0.0), [2.5, 0.0])
+    assert_allclose(interp(np.array([-1.5, 0.5])), pos[[-1, 0]])
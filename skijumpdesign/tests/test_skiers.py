@@ -3,10 +3,11 @@ from math import isclose
 
 import numpy as np
 import matplotlib.pyplot as plt
+import pytest
 
 from ..skiers import Skier
 from ..surfaces import Surface, FlatSurface, TakeoffSurface
-from ..utils import vel2speed
+from ..utils import InvalidJumpError, vel2speed
 
 
 def test_skier(plot=False):
@@ -76,94 +77,94 @@ def test_slide_on():
     traj = skier.slide_on(surf, 50.0)
 
     expected_times = \
-np.array([0.        , 0.00280697, 0.00561393, 0.0084209 , 0.01122786,
-          0.01403483, 0.01684179, 0.01964876, 0.02245572, 0.02526269,
-          0.02806965, 0.03087662, 0.03368358, 0.03649055, 0.03929751,
-          0.04210448, 0.04491144, 0.04771841, 0.05052537, 0.05333234,
-          0.0561393 , 0.05894627, 0.06175323, 0.0645602 , 0.06736716,
-          0.07017413, 0.07298109, 0.07578806, 0.07859502, 0.08140199,
-          0.08420895, 0.08701592, 0.08982288, 0.09262985, 0.09543681,
-          0.09824378, 0.10105074, 0.10385771, 0.10666467, 0.10947164,
-          0.1122786 , 0.11508557, 0.11789253, 0.1206995 , 0.12350646,
-          0.12631343, 0.12912039, 0.13192736, 0.13473432, 0.13754129,
-          0.14034825, 0.14315522, 0.14596218, 0.14876915, 0.15157611,
-          0.15438308, 0.15719004, 0.15999701, 0.16280397, 0.16561094,
-          0.1684179 , 0.17122487, 0.17403183, 0.1768388 , 0.17964576,
-          0.18245273, 0.18525969, 0.18806666, 0.19087362, 0.19368059,
-          0.19648755, 0.19929452, 0.20210148, 0.20490845, 0.20771541,
-          0.21052238, 0.21332934, 0.21613631, 0.21894327, 0.22175024,
-          0.2245572 , 0.22736417, 0.23017113, 0.2329781 , 0.23578506,
-          0.23859203, 0.24139899, 0.24420596, 0.24701292, 0.24981989,
-          0.25262685, 0.25543382, 0.25824078, 0.26104775, 0.26385471,
-          0.26666168, 0.26946864, 0.27227561, 0.27508257, 0.27788954,
-          0.2806965 , 0.28350347, 0.28631043, 0.2891174 , 0.29192436,
-          0.29473133, 0.29753829, 0.30034526, 0.30315222, 0.30595919,
-          0.30876615, 0.31157312, 0.31438008, 0.31718705, 0.31999401,
-          0.32280098, 0.32560794, 0.32841491, 0.33122187, 0.33402884,
-          0.3368358 , 0.33964277, 0.34244974, 0.3452567 , 0.34806367,
-          0.35087063, 0.3536776 , 0.35648456, 0.35929153, 0.36209849,
-          0.36490546, 0.36771242, 0.37051939, 0.37332635, 0.37613332,
-          0.37894028, 0.38174725])
+np.array([0.        , 0.00280123, 0.00560247, 0.0084037 , 0.01120494,
+          0.01400617, 0.01680741, 0.01960864, 0.02240988, 0.02521111,
+          0.02801235, 0.03081358, 0.03361481, 0.03641605, 0.03921728,
+          0.04201852, 0.04481975, 0.04762099, 0.05042222, 0.05322346,
+          0.05602469, 0.05882593, 0.06162716, 0.06442839, 0.06722963,
+          0.07003086, 0.0728321 , 0.07563333, 0.07843457, 0.0812358 ,
+          0.08403704, 0.08683827, 0.08963951, 0.09244074, 0.09524197,
+          0.09804321, 0.10084444, 0.10364568, 0.10644691, 0.10924815,
+          0.11204938, 0.11485062, 0.11765185, 0.12045309, 0.12325432,
+          0.12605555, 0.12885679, 0.13165802, 0.13445926, 0.13726049,
+          0.14006173, 0.14286296, 0.1456642 , 0.14846543, 0.15126667,
+          0.1540679 , 0.15686913, 0.15967037, 0.1624716 , 0.16527284,
+          0.16807407, 0.17087531, 0.17367654, 0.17647778, 0.17927901,
+          0.18208025, 0.18488148, 0.18768271, 0.19048395, 0.19328518,
+          0.19608642, 0.19888765, 0.20168889, 0.20449012, 0.20729136,
+          0.21009259, 0.21289383, 0.21569506, 0.2184963 , 0.22129753,
+          0.22409876, 0.2269    , 0.22970123, 0.23250247, 0.2353037 ,
+          0.23810494, 0.24090617, 0.24370741, 0.24650864, 0.24930988,
+          0.25211111, 0.25491234, 0.25771358, 0.26051481, 0.26331605,
+          0.26611728, 0.26891852, 0.27171975, 0.27452099, 0.27732222,
+          0.28012346, 0.28292469, 0.28572592, 0.28852716, 0.29132839,
+          0.29412963, 0.29693086, 0.2997321 , 0.30253333, 0.30533457,
+          0.3081358 , 0.31093704, 0.31373827, 0.3165395 , 0.31934074,
+          0.32214197, 0.32494321, 0.32774444, 0.33054568, 0.33334691,
+          0.33614815, 0.33894938, 0.34175062, 0.34455185, 0.34735308,
+          0.35015432, 0.35295555, 0.35575679, 0.35855802, 0.36135926,
+          0.36416049, 0.36696173, 0.36976296, 0.3725642 , 0.37536543,
+          0.37816666, 0.3809679 , 0.38376913])
 
     expected_x = \
-np.array([ 0.        ,  0.09927789,  0.19955059,  0.30122071,  0.40491696,
-           0.51143158,  0.62172019,  0.73690183,  0.85825894,  0.98723736,
-           1.12544635,  1.27465857,  1.43711731,  1.61148119,  1.79253409,
-           1.97589775,  2.15814512,  2.33680033,  2.51033871,  2.67818681,
-           2.84072233,  2.99927419,  3.15612251,  3.31389873,  3.47277987,
-           3.63484738,  3.80171535,  3.97401565,  4.15139782,  4.33252917,
-           4.51509474,  4.69579728,  4.87035729,  5.033513  ,  5.1799285 ,
-           5.31436873,  5.43986856,  5.5576283 ,  5.66883322,  5.77465352,
-           5.87624437,  5.97474586,  6.07128303,  6.16696588,  6.26288934,
-           6.35967739,  6.45694011,  6.55515543,  6.65496514,  6.75712654,
-           6.86251249,  6.97211138,  7.08702714,  7.20847925,  7.33780273,
-           7.47644815,  7.6259816 ,  7.78747938,  7.95796356,  8.13323771,
-           8.30984487,  8.48507517,  8.65696585,  8.82430122,  8.98661268,
-           9.14417874,  9.29802498,  9.44992408,  9.60239583,  9.75700912,
-           9.91436617, 10.07615015, 10.2430726 , 10.41486242, 10.59026586,
-          10.76704651, 10.94198534, 11.11088066, 11.26864527, 11.41410257,
-          11.54904706, 11.67463094, 11.79206162, 11.90260171, 12.00756906,
-          12.10833673, 12.206333  , 12.30304137, 12.39934117, 12.49478609,
-          12.58967784, 12.68444025, 12.77959214, 12.87574734, 12.97361469,
-          13.07399802, 13.17779619, 13.28600303, 13.3997074 , 13.52009317,
-          13.64851577, 13.78703767, 13.93593106, 14.09431764, 14.2605661 ,
-          14.43229212, 14.6063584 , 14.7788746 , 14.94535395, 15.1057677 ,
-          15.26189431, 15.41465687, 15.56505473, 15.71416353, 15.86313514,
-          16.01319773, 16.16569887, 16.32339492, 16.4859959 , 16.65171496,
-          16.81882932, 16.98568023, 17.15067306, 17.31227719, 17.46902611,
-          17.61951734, 17.76241249, 17.89643721, 18.02084517, 18.13786321,
-          18.24907347, 18.35566415, 18.45866939, 18.55896932, 18.65728999,
-          18.75420344, 18.85012765])
+np.array([ 0.        ,  0.09907427,  0.19912872,  0.30058265,  0.40396027,
+           0.51008362,  0.61992491,  0.73452732,  0.85523535,  0.98361163,
+           1.12139334,  1.27029855,  1.43135588,  1.60379836,  1.78418256,
+           1.96722025,  2.14810472,  2.32409236,  2.49445449,  2.65966915,
+           2.82084871,  2.9792536 ,  3.13624154,  3.29309896,  3.45121501,
+           3.61184892,  3.77629729,  3.94561423,  4.12034028,  4.29987473,
+           4.48169785,  4.66121478,  4.8331892 ,  4.99401628,  5.14268789,
+           5.28014197,  5.40793458,  5.52786086,  5.64144023,  5.7499845 ,
+           5.85463817,  5.95628424,  6.05572578,  6.15368565,  6.25073165,
+           6.34746187,  6.4445519 ,  6.54254098,  6.64211519,  6.74392839,
+           6.84878428,  6.95764884,  7.0715759 ,  7.1918828 ,  7.32011465,
+           7.45787702,  7.60662644,  7.76684853,  7.93708299,  8.11349733,
+           8.29111541,  8.46593913,  8.63587929,  8.80053851,  8.96037778,
+           9.11650453,  9.27029223,  9.42278641,  9.57518765,  9.72869023,
+           9.88455427, 10.0439391 , 10.20784401, 10.37684678, 10.55057604,
+          10.7270329 , 10.90235006, 11.07165435, 11.231094  , 11.37910984,
+          11.51610218, 11.64341579, 11.76270652, 11.87545977, 11.98295885,
+          12.08628652, 12.18637681, 12.28401502, 12.37980618, 12.47446864,
+          12.56854798, 12.66258839, 12.75708   , 12.85253892, 12.94968423,
+          13.04911747, 13.15157823, 13.25800073, 13.36933373, 13.48688648,
+          13.61204007, 13.74627224, 13.89088712, 14.04631867, 14.2112604 ,
+          14.38226749, 14.55478302, 14.72495807, 14.89068008, 15.05140611,
+          15.20755495, 15.36002239, 15.50988377, 15.65811489, 15.80598314,
+          15.9545035 , 16.10482084, 16.25797331, 16.41505035, 16.57675214,
+          16.74323538, 16.91351082, 17.08492519, 17.25331693, 17.41438339,
+          17.56534089, 17.7054883 , 17.83556699, 17.95696944, 18.07110989,
+          18.17943291, 18.28300488, 18.38277845, 18.47963541, 18.5741639 ,
+          18.66711664, 18.75880664, 18.84955592])
 
     expected_v = \
-np.array([50.        , 50.06753557, 50.18785133, 50.37897037, 50.64411716,
-          50.9999092 , 51.47666101, 52.11838412, 52.98278705, 54.14127535,
-          55.67895154, 57.69461518, 60.31211158, 63.42769226, 66.71789026,
-          69.91231321, 72.79984336, 75.22863749, 77.10612701, 78.39901787,
-          79.13329065, 79.39420046, 79.32627703, 79.12683457, 78.80196136,
-          78.12428315, 76.92703342, 75.12133131, 72.69618163, 69.71847481,
-          66.33298698, 62.7623799 , 59.307201  , 56.34588337, 54.26707577,
-          52.72222087, 51.51647172, 50.59692594, 49.91484789, 49.42566872,
-          49.08898635, 48.86856547, 48.73233754, 48.65240079, 48.60502022,
-          48.59619027, 48.67088417, 48.81783236, 49.03436418, 49.32966772,
-          49.72478988, 50.25263637, 50.95797165, 51.89741902, 53.13946054,
-          54.76443707, 56.86454828, 59.471793  , 62.36396576, 65.31909512,
-          68.15356994, 70.72092967, 72.91186439, 74.65421481, 75.91297224,
-          76.69027862, 77.02542651, 76.9948591 , 76.71217019, 76.28463828,
-          75.58197947, 74.43527565, 72.7515024 , 70.51366385, 67.78079267,
-          64.68795006, 61.44622574, 58.34273801, 55.73306602, 53.68189195,
-          52.06346512, 50.81470724, 49.87501027, 49.18623642, 48.69271819,
-          48.34125829, 48.08112972, 47.86407575, 47.68172756, 47.57710321,
-          47.53677558, 47.55235246, 47.62234866, 47.75218602, 47.9541934 ,
-          48.24760668, 48.6585688 , 49.22012967, 49.97224629, 50.96178263,
-          52.24838363, 53.95594538, 56.09851111, 58.6155671 , 61.40025793,
-          64.29938648, 67.11341392, 69.59645973, 71.46905868, 72.80488654,
-          73.7607434 , 74.39352463, 74.74372079, 74.83541761, 74.67629601,
-          74.25763206, 73.54922389, 72.31629095, 70.57940244, 68.50508837,
-          66.23860204, 63.90392007, 61.60374238, 59.41949219, 57.41131603,
-          55.61808374, 54.05738846, 52.72554664, 51.60929666, 50.72708275,
-          50.04549643, 49.52673908, 49.13701309, 48.84652187, 48.62946983,
-          48.46406242, 48.33250608])
+np.array([50.        , 50.06735806, 50.17544632, 50.3439487 , 50.59135907,
+          50.94541135, 51.43183333, 52.08361791, 52.95096413, 54.10411663,
+          55.63411912, 57.64664492, 60.21673609, 63.29566279, 66.62914982,
+          69.8244712 , 72.56967608, 74.74622678, 76.3769895 , 77.53682682,
+          78.30411287, 78.73430205, 78.86042398, 78.69394052, 78.22420572,
+          77.42121681, 76.23133131, 74.58346318, 72.40388449, 69.66363897,
+          66.46672869, 63.10615823, 59.96338166, 57.30138846, 55.18673146,
+          53.55273004, 52.29949722, 51.33363516, 50.5872587 , 50.00911885,
+          49.56212701, 49.22337804, 48.97504707, 48.80592769, 48.70969668,
+          48.68230725, 48.72446037, 48.83888108, 49.03345415, 49.31953399,
+          49.71422287, 50.24500457, 50.94722103, 51.87246782, 53.09318097,
+          54.69767201, 56.77527944, 59.36684821, 62.37243085, 65.51675636,
+          68.4513412 , 70.93235868, 72.88898204, 74.35643257, 75.40033219,
+          76.09004307, 76.47800632, 76.58900744, 76.43065543, 75.99553846,
+          75.2559679 , 74.16575072, 72.66216018, 70.6775732 , 68.17781543,
+          65.2292925 , 62.06086287, 59.01348432, 56.3594621 , 54.2063572 ,
+          52.52101899, 51.2185922 , 50.20874654, 49.42209328, 48.80794599,
+          48.32903368, 47.95860199, 47.67869129, 47.47723753, 47.34517967,
+          47.27757602, 47.27311168, 47.33282232, 47.45946497, 47.66245443,
+          47.95223828, 48.34500591, 48.86837214, 49.5526961 , 50.45049473,
+          51.62541301, 53.15523683, 55.12089524, 57.55821352, 60.38462129,
+          63.34987059, 66.14694219, 68.54513083, 70.46328308, 71.92522983,
+          72.9916769 , 73.72345246, 74.16648855, 74.34801541, 74.28324621,
+          73.96903417, 73.38727221, 72.50562059, 71.2703895 , 69.6228862 ,
+          67.51175627, 64.94190916, 62.03574265, 59.05249768, 56.2973402 ,
+          53.95860155, 52.07772298, 50.60291607, 49.45395878, 48.55848054,
+          47.85254081, 47.29714802, 46.86129257, 46.52164899, 46.26366745,
+          46.0620118 , 45.90605403, 45.78156977])
 
     np.testing.assert_allclose(expected_times, traj.t, rtol=1e-5)
     np.testing.assert_allclose(expected_x, traj.pos[:, 0], rtol=1e-5)
@@ -182,19 +183,19 @@ def test_slide_on_regression():
 
     takeoff_entry_speed = skier.end_speed_on(approach)
 
-    expected_speed = 10.92727081007988054750512674218044
+    # NOTE : The speed from an integration with rtol=1e-12. The slide is
+    # integrated with rtol=1e-6.
+    expected_speed = 10.929842913926866
 
-    assert isclose(takeoff_entry_speed, expected_speed, rel_tol=1e-16)
+    assert isclose(takeoff_entry_speed, expected_speed, rel_tol=1e-6)
 
     takeoff_entry_vel = skier.end_vel_on(approach)
 
-    # NOTE : Not true regression here because there was a bug in end_vel_on
-    # which used tan instead of arctan.
-    expected_vx = 10.26827574556135758143682323861867
-    expected_vy = -3.7373467286218100547046105930348
+    expected_vx = 10.270692732566227
+    expected_vy = -3.738226439948311
 
-    assert isclose(takeoff_entry_vel[0], expected_vx)
-    assert isclose(takeoff_entry_vel[1], expected_vy)
+    assert isclose(takeoff_entry_vel[0], expected_vx, rel_tol=1e-6)
+    assert isclose(takeoff_entry_vel[1], expected_vy, rel_tol=1e-6)
 
     takeoff = TakeoffSurface(skier, approach_ang, takeoff_ang, expected_speed,
                              init_pos=approach.end)
@@ -208,8 +209,240 @@ def test_slide_on_regression():
                                delimiter=',')
 
     np.testing.assert_allclose(takeoff_traj.t,
-                               expected_times, rtol=1e-14)
+                               expected_times, rtol=1e-6)
     np.testing.assert_allclose(takeoff_traj.pos[:, 0],
-                               expected_traj[0], rtol=1e-15)
+                               expected_traj[0], rtol=1e-6, atol=1e-9)
     np.testing.assert_allclose(takeoff_traj.speed,
-                               expected_traj[1], rtol=1e-14)
+                               expected_traj[1], rtol=1e-6)
+
+
+def test_impact_state():
+
+    skier = Skier()
+
+    x = np.linspace(0.0, 60.0, num=300)
+    surf = Surface(x, -0.4 * x + 0.5 * np.sin(x / 3.0))
+
+    takeoff_pos = (0.0, 2.0)
+    takeoff_vel = (10.0, 2.0)
+
+    traj = skier.fly_to(surf, takeoff_pos, takeoff_vel)
+
+    time, state = skier.impact_state(takeoff_pos, takeoff_vel, surface=surf)
+    assert isclose(time, traj.duration, rel_tol=1e-6)
+    np.testing.assert_allclose(state[:2], traj.pos[-1], rtol=1e-6)
+    np.testing.assert_allclose(state[2:], traj.vel[-1], rtol=1e-6)
+
+    time, state = skier.impact_state(takeoff_pos, takeoff_vel, x=12.34)
+    assert isclose(state[0], 12.34)
+    np.testing.assert_allclose(state[1:], traj.interp_wrt_x(12.34)[[2, 3, 4]],
+                               rtol=1e-5)
+
+    # the sensitivities to a scaling of the takeoff velocity
+    _, sens_state = skier.impact_state(takeoff_pos, takeoff_vel, x=12.34,
+                                       sensitivity=takeoff_vel)
+    np.testing.assert_allclose(sens_state[:4], state, rtol=1e-5)
+    delta = 1e-6
+    _, plus = skier.impact_state(takeoff_pos,
+                                 np.multiply(takeoff_vel, 1.0 + delta),
+                                 x=12.34)
+    _, minus = skier.impact_state(takeoff_pos,
+                                  np.multiply(takeoff_vel, 1.0 - delta),
+                                  x=12.34)
+    # NOTE : The finite differences are at x and the sensitivities at the end
+    # time, which differ by the shift of the time of reaching x.
+    dstate = (sens_state[4:] - skier._flight_rhs(0.0, sens_state[:4]) *
+              sens_state[4] / sens_state[2])
+    np.testing.assert_allclose(dstate[1:], (plus - minus)[1:] / 2 / delta,
+                               rtol=1e-3, atol=1e-6)
+
+    # the Jacobian of the sensitivity equations used with pycvodes
+    jac = np.empty((8, 8))
+    skier._flight_jac_sensitivity_sundials(0.0, sens_state, jac)
+    expected = np.empty((8, 8))
+    for i in range(8):
+        plus, minus = sens_state.copy(), sens_state.copy()
+        plus[i] += delta
+        minus[i] -= delta
+        expected[:, i] = (skier._flight_rhs_sensitivity(0.0, plus) -
+                          skier._flight_rhs_sensitivity(0.0, minus)) / 2 / delta
+    np.testing.assert_allclose(jac, expected, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        skier.impact_state(takeoff_pos, takeoff_vel)
+
+
+def test_speed_to_land_at():
+
+    skier = Skier()
+
+    takeoff_pos = (0.0, 0.0)
+    takeoff_angle = np.deg2rad(20.0)
+
+    speed, impact_vel = skier.speed_to_land_at((20.0, -8.0), takeoff_pos,
+                                               takeoff_angle)
+    _, state = skier.impact_state(takeoff_pos,
+                                  (speed * np.cos(takeoff_angle),
+                                   speed * np.sin(takeoff_angle)), x=20.0)
+    # NOTE : The flights with and without the sensitivities are integrated
+    # with different time steps.
+    assert isclose(state[1], -8.0, abs_tol=1e-4)
+    np.testing.assert_allclose(impact_vel, state[2:], rtol=1e-5)
+
+    warm_speed, _ = skier.speed_to_land_at((20.0, -8.0), takeoff_pos,
+                                           takeoff_angle,
+                                           init_speed=1.1 * speed)
+    assert isclose(warm_speed, speed, rel_tol=1e-6)
+
+    # the landing point is above the takeoff direction
+    with pytest.raises(InvalidJumpError):
+        skier.speed_to_land_at((20.0, 8.0), takeoff_pos, takeoff_angle)
+
+    skier.max_shooting_iterations = 1
+    with pytest.raises(InvalidJumpError):
+        skier.speed_to_land_at((20.0, -8.0), takeoff_pos, takeoff_angle)
+
+
+def test_speeds_to_land_at():
+
+    skier = Skier()
+
+    takeoff_pos = (0.0, 0.0)
+    takeoff_angle = np.deg2rad(20.0)
+
+    points = np.array([[0.0, 0.0], [5.0, -1.0], [20.0, -8.0], [40.0, -30.0]])
+
+    speeds, impact_vels = skier.speeds_to_land_at(points, takeoff_pos,
+                                                  takeoff_angle)
+
+    assert speeds[0] == 0.0
+    np.testing.assert_allclose(impact_vels[0], [0.0, 0.0])
+    for point, speed, impact_vel in zip(points[1:], speeds[1:],
+                                        impact_vels[1:]):
+        expected_speed, expected_vel = skier.speed_to_land_at(
+            point, takeoff_pos, takeoff_angle)
+        assert isclose(speed, expected_speed, rel_tol=1e-5)
+        np.testing.assert_allclose(impact_vel, expected_vel, rtol=1e-5)
+
+    # no more points are solved after the first one that needs more than
+    # max_speed
+    points = np.array([[5.0, -1.0], [20.0, 8.0], [20.0, -8.0]])
+    speeds, impact_vels = skier.speeds_to_land_at(points, takeoff_pos,
+                                                  takeoff_angle,
+                                                  max_speed=20.0)
+    assert isclose(speeds[0], skier.speed_to_land_at(
+        points[0], takeoff_pos, takeoff_angle)[0], rel_tol=1e-5)
+    assert np.all(np.isnan(speeds[1:]))
+    assert np.all(np.isnan(impact_vels[1:]))
+
+    speeds, _ = skier.speeds_to_land_at(points[[0, 2]], takeoff_pos,
+                                        takeoff_angle, max_speed=5.0)
+    assert np.all(np.isnan(speeds))
+
+    # the second landing point is above the takeoff direction
+    with pytest.raises(InvalidJumpError):
+        skier.speeds_to_land_at(points, takeoff_pos, takeoff_angle)
+
+    # with max_speed a point that isn't reached within the flight time gives
+    # NaN from that point on instead of raising
+    skier = Skier()
+    skier.max_flight_time = 3.0
+    points = np.array([[5.0, -1.0], [20.0, -8.0], [150.0, -10.0],
+                       [25.0, -10.0]])
+    with pytest.raises(InvalidJumpError):
+        skier.speeds_to_land_at(points, takeoff_pos, takeoff_angle)
+    speeds, impact_vels = skier.speeds_to_land_at(points, takeoff_pos,
+                                                  takeoff_angle,
+                                                  max_speed=44.0)
+    expected_speeds, expected_vels = skier.speeds_to_land_at(
+        points[:2], takeoff_pos, takeoff_angle)
+    np.testing.assert_allclose(speeds[:2], expected_speeds)
+    np.testing.assert_allclose(impact_vels[:2], expected_vels)
+    assert np.all(np.isnan(speeds[2:]))
+    assert np.all(np.isnan(impact_vels[2:]))
+
+    # and so do points whose speeds aren't found within the iterations
+    skier.max_shooting_iterations = 1
+    with pytest.raises(InvalidJumpError):
+        skier.speeds_to_land_at(points[:2], takeoff_pos, takeoff_angle)
+    speeds, _ = skier.speeds_to_land_at(points[:2], takeoff_pos,
+                                        takeoff_angle, max_speed=44.0)
+    assert np.all(np.isnan(speeds))
+
+
+def test_fly_to_many():
+
+    skier = Skier()
+
+    x = np.linspace(0.0, 60.0, num=300)
+    surf = Surface(x, -0.4 * x + 0.5 * np.sin(x / 3.0))
+
+    takeoff_pos = (0.0, 2.0)
+    takeoff_vels = np.array([[5.0, 0.0], [10.0, 2.0], [15.0, 4.0]])
+
+    times, states = skier.fly_to_many(surf, takeoff_pos, takeoff_vels)
+
+    times2, states2, trajs = skier.fly_to_many(surf, takeoff_pos,
+                                               takeoff_vels,
+                                               trajectories=True)
+
+    for vel, time, state, time2, state2, traj in zip(takeoff_vels, times,
+                                                      states, times2, states2,
+                                                      trajs):
+        expected = skier._fly_to_scipy(surf, takeoff_pos, tuple(vel))
+        assert isclose(time, expected.duration, rel_tol=1e-5)
+        np.testing.assert_allclose(state[:2], expected.pos[-1], rtol=1e-5)
+        np.testing.assert_allclose(state[2:], expected.vel[-1], rtol=1e-5)
+        assert isclose(time2, expected.duration, rel_tol=1e-5)
+        np.testing.assert_allclose(state2, state, rtol=1e-6)
+        assert isclose(traj.duration, time2)
+        np.testing.assert_allclose(traj.pos[-1], state2[:2])
+
+    # a skier that flies away from the surface never lands
+    times, states = skier.fly_to_many(surf, takeoff_pos, [[10.0, 2.0],
+                                                          [-1.0, 500.0]])
+    assert not np.isnan(times[0])
+    assert np.isnan(times[1])
+    assert np.all(np.isnan(states[1]))
+
+    # only the states of the skiers in the air are recorded for trajectories
+    times, states, trajs = skier.fly_to_many(surf, takeoff_pos,
+                                             [[10.0, 2.0], [-1.0, 500.0],
+                                              [15.0, 4.0]],
+                                             trajectories=True)
+    assert trajs[1] is None
+    for i in (0, 2):
+        assert isclose(trajs[i].duration, times[i])
+        np.testing.assert_allclose(trajs[i].pos[-1], states[i, :2])
+        np.testing.assert_allclose(np.diff(trajs[i].t[:-1]),
+                                   1.0 / skier.samples_per_sec)
+        assert np.all(np.isfinite(trajs[i].pos))
+
+
+def test_slide_on_many():
+
+    skier = Skier()
+
+    approach = FlatSurface(-np.deg2rad(20.0), 40.0)
+    takeoff = TakeoffSurface(skier, approach.angle, np.deg2rad(15.0), 15.0,
+                             init_pos=approach.end)
+
+    init_speeds = np.array([0.0, 5.0, 10.0])
+
+    exit_speeds, exit_vels, reached = skier.slide_on_many(approach,
+                                                          init_speeds)
+
+    assert np.all(reached)
+    for init_speed, speed, vel in zip(init_speeds, exit_speeds, exit_vels):
+        expected = skier.end_vel_on(approach, init_speed=init_speed)
+        np.testing.assert_allclose(vel, expected, rtol=1e-3)
+        assert isclose(speed, vel2speed(*vel)[0])
+
+    # too slow to get over the takeoff, a heavier skier with less drag
+    slow_skier = Skier(mass=100.0, drag_coeff=0.5)
+    exit_speeds, _, reached = skier.slide_on_many(takeoff, [0.5, 15.0],
+                                                  skiers=[skier, slow_skier])
+    assert not reached[0]
+    assert np.isnan(exit_speeds[0])
+    assert reached[1]
+    assert exit_speeds[1] > skier.slide_on_many(takeoff, [15.0])[0][0]
@@ -8,7 +8,8 @@ import pytest
 from ..skiers import Skier
 from ..functions import make_jump
 from ..surfaces import (Surface, FlatSurface, ClothoidCircleSurface,
-                        TakeoffSurface, LandingTransitionSurface)
+                        TakeoffSurface, LandingTransitionSurface,
+                        LandingSurface)
 from ..utils import InvalidJumpError
 
 
@@ -40,6 +41,52 @@ def test_surface():
     assert isclose(surface.start[1], 4.0)
 
 
+def test_surface_distance_from():
+
+    # V shaped surface with a corner at (1, 0)
+    x = np.linspace(0.0, 2.0, num=21)
+    surface = Surface(x, np.abs(x - 1.0))
+
+    distance = surface.distance_from(1.0, 1.0)
+    assert isinstance(distance, float)
+    assert isclose(distance, np.sqrt(2) / 2)
+    assert isclose(surface.distance_from(1.0, -1.0), -1.0)
+    # the end segments are extrapolated
+    assert isclose(surface.distance_from(-1.0, 2.0), 0.0, abs_tol=1E-14)
+    assert isclose(surface.distance_from(4.0, 1.0), -np.sqrt(2))
+
+    # compare to a brute force search over all the segments
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0.0, 20.0, 200))
+    y = np.sin(x) + 0.3 * rng.standard_normal(200)
+    surface = Surface(x, y)
+
+    xp = rng.uniform(0.0, 20.0, 100)
+    yp = rng.uniform(-3.0, 3.0, 100)
+
+    frac = (((xp[:, np.newaxis] - surface.x[:-1]) * np.diff(surface.x) +
+             (yp[:, np.newaxis] - surface.y[:-1]) * np.diff(surface.y)) /
+            (np.diff(surface.x)**2 + np.diff(surface.y)**2))
+    frac[:, 1:] = np.maximum(frac[:, 1:], 0.0)
+    frac[:, :-1] = np.minimum(frac[:, :-1], 1.0)
+    expected = np.min(np.hypot(
+        surface.x[:-1] + frac * np.diff(surface.x) - xp[:, np.newaxis],
+        surface.y[:-1] + frac * np.diff(surface.y) - yp[:, np.newaxis]),
+        axis=1)
+    expected *= np.sign(yp - surface.interp_y(xp))
+
+    distances = surface.distance_from(xp, yp)
+    assert distances.shape == (100,)
+    np.testing.assert_allclose(distances, expected, rtol=0.0, atol=1E-12)
+    np.testing.assert_allclose(
+        [surface.distance_from(a, b) for a, b in zip(xp, yp)], expected,
+        rtol=0.0, atol=1E-12)
+
+    surface.shift_coordinates(1.0, 2.0)
+    np.testing.assert_allclose(surface.distance_from(xp + 1.0, yp + 2.0),
+                               expected, rtol=0.0, atol=1E-12)
+
+
 def test_flat_surface():
 
     fsurf = FlatSurface(-np.deg2rad(10), 40, init_pos=(5.0, 5.0))
@@ -48,6 +95,13 @@ def test_flat_surface():
     assert isclose(fsurf.y[0], 5.0)
     assert isclose(np.mean(np.arctan(fsurf.slope)), -np.deg2rad(10))
 
+    # the distance is measured from the line through the surface
+    assert isclose(fsurf.distance_from(5.0, 5.0), 0.0, abs_tol=1e-12)
+    assert isclose(fsurf.distance_from(*fsurf.end), 0.0, abs_tol=1e-12)
+    assert isclose(fsurf.distance_from(5.0, 6.0), np.cos(np.deg2rad(10)))
+    np.testing.assert_allclose(fsurf.distance_from(fsurf.x, fsurf.y), 0.0,
+                               atol=1e-12)
+
     length = np.sqrt(10**2 + 10**2)
 
     fsurf = FlatSurface(np.deg2rad(45.0), length, num_points=100000)
@@ -121,6 +175,15 @@ def test_landing_trans_surface(plot=False):
 
     x_trans, char_dist = landing_trans.find_transition_point()
 
+    trans_acc, _ = landing_trans.calc_trans_acc(x_trans)
+    assert abs(trans_acc - landing_trans.tolerable_acc) <= \
+        landing_trans.acc_error_tolerance
+
+    xs = np.linspace(xpara, x_trans, num=5)
+    accs, char_dists = landing_trans.calc_trans_acc(xs)
+    for x, acc, dist in zip(xs, accs, char_dists):
+        assert np.allclose(landing_trans.calc_trans_acc(x), (acc, dist))
+
     if plot:
         ax = slope.plot()
         ax = takeoff.plot(ax=ax)
@@ -131,6 +194,76 @@ def test_landing_trans_surface(plot=False):
         plt.show()
 
 
+def test_landing_surface_family():
+
+    skier = Skier()
+    takeoff_angle = np.deg2rad(25.0)
+
+    _, _, takeoff, landing, landing_trans, _, _ = make_jump(
+        -15.0, 0.0, 40.0, 25.0, 0.5)
+
+    family = LandingSurface(skier, takeoff.end, takeoff_angle,
+                            landing_trans.start, 0.5, None, method='family')
+
+    np.testing.assert_allclose(family.x, landing.x)
+    np.testing.assert_allclose(family.y, landing.y, rtol=0.0, atol=1e-4)
+
+    # the repeated first evaluation of the ode is answered from the cache and
+    # the warm started shots need about two flights each
+    stats = landing.shooting_stats
+    assert stats['hits'] >= 1
+    assert stats['misses'] > 0
+    assert stats['iterations'] < 2.5 * stats['misses']
+
+    with pytest.raises(ValueError):
+        LandingSurface(skier, takeoff.end, takeoff_angle, landing_trans.start,
+                       0.5, None, method='bisection')
+
+
+def test_calculate_efh_tolerance():
+
+    # measured surface of a jump in California, see docs/real-jumps.rst
+    xy = np.array([
+        [0.0, 3.552713678800501e-15],
+        [0.6983737278976931, -0.2952653370330331],
+        [1.396747455795386, -0.562260944207079],
+        [2.095121183693079, -0.8020880797151939],
+        [2.793494911590773, -1.015687629418959],
+        [3.491868639488466, -1.203861298485894],
+        [4.190242367386158, -1.367288473711628],
+        [4.888616095283852, -1.506539668672282],
+        [5.586989823181545, -1.622087225596292],
+        [6.285363551079238, -1.714313774828454],
+        [6.983737278976932, -1.783518824568937],
+        [7.682111006874624, -1.829923756448874],
+        [8.380484734772317, -1.853675426962386],
+        [9.078858462670011, -1.854848514083038],
+        [9.777232190567704, -1.833446697609837],
+        [10.4756059184654, -1.789402717104515],
+        [11.17397964636309, -1.722577309561352],
+        [11.87235337426078, -1.632756987373789],
+        [12.57072710215848, -1.519650572924967],
+        [13.26910083005617, -1.382884356143141],
+        [13.96747455795386, -1.221995681907728],
+        [24.384, -5.5263288]]).T
+    surface = Surface(*xy)
+    skier = Skier()
+    takeoff_angle = np.deg2rad(13.0)
+
+    dist, efh, speeds = surface.calculate_efh(takeoff_angle, (0.0, 0.0),
+                                              skier)
+    reachable = ~np.isnan(speeds)
+
+    for tolerance in (0.002, 0.01, 0.05):
+        dist_adapt, efh_adapt, speeds_adapt = surface.calculate_efh(
+            takeoff_angle, (0.0, 0.0), skier, tolerance=tolerance)
+        assert np.all(np.isin(dist_adapt, dist))
+        for vals, adapt in ((efh, efh_adapt), (speeds, speeds_adapt)):
+            error = (np.interp(dist[reachable], dist_adapt, adapt) -
+                     vals[reachable])
+            assert np.max(np.abs(error)) <= tolerance
+
+
 def test_area_under():
 
     x = sm.symbols('x')
@@ -179,23 +312,23 @@ def test_calculate_efh(profile=False):
         print(p.output_text(unicode=True, color=True))
 
     expected_speeds = \
-        np.array([ 0.        ,  0.64634268,  1.2356876 ,  1.76885108,  2.24964887,
-                   2.69168606,  3.09866358,  3.47053895,  3.81252508,  4.12895563,
-                   4.42290851,  4.69632597,  4.95135992,  5.1898158 ,  5.41341136,
-                   5.62352591,  5.82141688,  6.00814636,  6.18473831,  6.35203728,
-                   6.51082732,  6.66178867,  6.80554642,  6.94264205,  7.07360671,
-                   7.19885863,  7.31883812,  7.43389184,  7.54435492,  7.65055735,
-                   7.75276447,  7.85122643,  7.94619036,  8.03785699,  8.12644327,
-                   8.21211438,  8.29503769,  8.37538282,  8.45328143,  8.5288697 ,
-                   8.60226895,  8.67359403,  8.74294598,  8.81043762,  8.87615365,
-                   8.94017827,  9.00259044,  9.06346839,  9.12288563,  9.18090629,
-                   9.2375861 ,  9.29299052,  9.34717415,  9.40018621,  9.45207528,
-                   9.50288513,  9.55266139,  9.60144541,  9.64915056,  9.69601049,
-                   9.74202917,  9.78719679,  9.83154369,  9.87510007,  9.91785869,
-                   9.95991937, 10.00126913, 10.04193202, 10.08192875, 10.12129032,
-                  10.16002962, 10.19816754, 10.23572199, 10.27229304, 10.30913058,
-                  10.34504771, 10.3800144 , 10.41491013, 10.44931605, 10.4832593 ,
-                  10.51674639, 10.54978999, 10.5824021 , 10.61459589, 10.64642594])
+        np.array([ 0.        ,  0.64772333,  1.23468993,  1.76464499,  2.24778936,
+                   2.69142033,  3.09706946,  3.46754892,  3.80783024,  4.12374838,
+                   4.41690951,  4.68955554,  4.94379938,  5.18152316,  5.4044049 ,
+                   5.61384032,  5.81105615,  5.99715649,  6.17312735,  6.33984047,
+                   6.49806618,  6.64849118,  6.79172924,  6.92834097,  7.05882189,
+                   7.18362549,  7.30316029,  7.4177945 ,  7.52786466,  7.6336753 ,
+                   7.73550932,  7.83361797,  7.92823506,  8.019577  ,  8.10784102,
+                   8.19320786,  8.27584423,  8.35590455,  8.43353255,  8.50885852,
+                   8.58200627,  8.65308918,  8.72221395,  8.7894789 ,  8.85497568,
+                   8.91879007,  8.98100163,  9.04168459,  9.10090827,  9.15874283,
+                   9.21524789,  9.27048135,  9.3244973 ,  9.3773472 ,  9.42907866,
+                   9.47973771,  9.52936777,  9.57800945,  9.62570116,  9.67247923,
+                   9.71837805,  9.76343015,  9.80766546,  9.85111438,  9.89380476,
+                   9.93576307,  9.97701448, 10.01757617, 10.05748499, 10.09675507,
+                  10.13540702, 10.17346114, 10.21093628, 10.24785046, 10.28422091,
+                  10.3200641 , 10.35539578, 10.39023029, 10.42458241, 10.45846644,
+                  10.49189566, 10.52488281, 10.5574401 , 10.58957928, 10.6213115 ])
 
     np.testing.assert_allclose(np.diff(dist), 0.2 * np.ones(len(dist) - 1))
     np.testing.assert_allclose(efh[0], 0.0)
@@ -203,6 +336,22 @@ def test_calculate_efh(profile=False):
     np.testing.assert_allclose(speeds, expected_speeds, rtol=3.0e-5,
                                atol=3.0e-4)
 
+    # With a tolerance only the locations needed to linearly interpolate the
+    # equivalent fall heights and takeoff speeds to the tolerance are
+    # calculated.
+    dist, efh, speeds = landing.calculate_efh(np.deg2rad(takeoff_angle),
+                                              takeoff.end, skier,
+                                              increment=0.05)
+    dist_adapt, efh_adapt, speeds_adapt = landing.calculate_efh(
+        np.deg2rad(takeoff_angle), takeoff.end, skier, increment=0.05,
+        tolerance=0.01)
+    assert len(dist_adapt) < len(dist) / 2
+    assert np.all(np.isin(dist_adapt, dist))
+    np.testing.assert_allclose(np.interp(dist, dist_adapt, efh_adapt), efh,
+                               rtol=0.0, atol=0.01)
+    np.testing.assert_allclose(np.interp(dist, dist_adapt, speeds_adapt),
+                               speeds, rtol=0.0, atol=0.01)
+
     dist, _, _ = landing.calculate_efh(np.deg2rad(takeoff_angle), takeoff.end,
                                        skier, increment=0.1)
     np.testing.assert_allclose(np.diff(dist), 0.1 * np.ones(len(dist) - 1))
@@ -238,21 +387,21 @@ def test_calculate_efh(profile=False):
                                        takeoff_quad1,
                                     skier, increment=0.2)
     expected_quad1 = \
-        np.array([1.7835165, 1.78401272, 1.78217823, 1.77987242, 1.77628465,
-                  1.76998945, 1.76337001, 1.75578132, 1.7473959, 1.73834729,
-                  1.72865671, 1.71840936, 1.70768518, 1.69658602, 1.68518452,
-                  1.67349779, 1.66157619, 1.64946937, 1.6372259, 1.62488912,
-                  1.61246859, 1.59999239, 1.58749806, 1.57501062, 1.5625446,
-                  1.55011972, 1.53774518, 1.52543527, 1.51321161, 1.50108674,
-                  1.48906131, 1.47714836, 1.4653533, 1.45368229, 1.44214059,
-                  1.43073275, 1.41946312, 1.40833569, 1.3973575, 1.38652761,
-                  1.37583968, 1.3653022, 1.35491758, 1.34467922, 1.33459477,
-                  1.3246687, 1.314938, 1.3053352, 1.2958138, 1.28635201,
-                  1.27717301, 1.26814732, 1.25926159, 1.25050445, 1.24186084,
-                  1.2333902, 1.22506106, 1.21686473, 1.20880351, 1.20087464,
-                  1.19308445, 1.18542684, 1.17789294, 1.17046884, 1.16317604,
-                  1.15598451, 1.14875674, 1.14161781, 1.13468529, 1.12802913,
-                  1.12142533, 1.11492911, 1.1085392, 1.1022529, 1.09629121])
+        np.array([1.79081814, 1.79113227, 1.78959228, 1.78651435, 1.78206372,
+                  1.7763182, 1.76946561, 1.76167152, 1.75309935, 1.74382921,
+                  1.73390424, 1.72343171, 1.71250533, 1.70121387, 1.68960474,
+                  1.67770561, 1.6655792, 1.65327827, 1.64085007, 1.62832751,
+                  1.61572126, 1.60307132, 1.59040434, 1.57775052, 1.56512751,
+                  1.55254168, 1.54001319, 1.52755987, 1.5151966, 1.50293254,
+                  1.49077375, 1.47872794, 1.46680592, 1.45501583, 1.44336141,
+                  1.43184341, 1.42046784, 1.40923851, 1.39815974, 1.38723412,
+                  1.37645906, 1.36583703, 1.35536889, 1.34505652, 1.33489973,
+                  1.32489654, 1.31504756, 1.30535417, 1.2958134, 1.2864244,
+                  1.2771846, 1.26809316, 1.25914906, 1.25035106, 1.24169792,
+                  1.2331866, 1.22481516, 1.21658192, 1.20848498, 1.2005227,
+                  1.19269228, 1.18499185, 1.17742035, 1.16997541, 1.16265445,
+                  1.15545486, 1.14837479, 1.14141235, 1.13456557, 1.12783269,
+                  1.12121135, 1.11469922, 1.10829479, 1.10199551, 1.09579949])
     np.testing.assert_allclose(expected_quad1, efh1, rtol=1e-3)
 
     # Test function quadrant 2, negative takeoff angle, skier reaches 100mph
@@ -261,8 +410,8 @@ def test_calculate_efh(profile=False):
                                             takeoff_quad2, skier,
                                             increment=0.2)
     expected_speedskier = \
-        np.array([2.19864804, 2.81796169, 3.02391351, 3.06098472, 3.37912743,
-                  3.79123023, 4.43642894, 5.67024268, 9.02957195, np.nan,
+        np.array([2.19867941, 2.78027428, 2.95686886, 3.06193276, 3.40126705,
+                  3.80121557, 4.39001028, 5.51191937, 8.62054456, np.nan,
                   np.nan, np.nan, np.nan, np.nan, np.nan,
                   np.nan, np.nan, np.nan, np.nan, np.nan,
                   np.nan, np.nan, np.nan, np.nan, np.nan,
@@ -280,27 +429,58 @@ def test_calculate_efh(profile=False):
                   np.nan, np.nan, np.nan, np.nan, np.nan])
     np.testing.assert_allclose(expected_speedskier, efh_speed, rtol=1e-3)
 
+    # The points are split between worker processes, the calculation still
+    # stops at 100 mph.
+    _, efh_workers, _ = landing.calculate_efh(np.deg2rad(-takeoff_angle),
+                                              takeoff_quad2, skier,
+                                              increment=0.2, workers=3)
+    np.testing.assert_allclose(efh_workers, efh_speed)
+
+    # Only some of the locations are calculated when a tolerance is given
+    # but the calculation stops at the same location.
+    dist, _, _ = landing.calculate_efh(np.deg2rad(-takeoff_angle),
+                                       takeoff_quad2, skier, increment=0.2)
+    dist_adapt, efh_adapt, _ = landing.calculate_efh(
+        np.deg2rad(-takeoff_angle), takeoff_quad2, skier, increment=0.2,
+        tolerance=0.01)
+    assert len(dist_adapt) < len(dist)
+    assert np.all(np.isin(dist_adapt, dist))
+    np.testing.assert_allclose(efh_adapt,
+                               efh_speed[np.isin(dist, dist_adapt)],
+                               rtol=1e-5)
+
+    # The generator yields every 4th location first and its last value for
+    # each location matches calculate_efh().
+    results = list(landing.iter_efh(np.deg2rad(-takeoff_angle), takeoff_quad2,
+                                    skier, increment=0.2))
+    first_xs = [x for x, _, _ in results[:(len(dist) + 3) // 4]]
+    np.testing.assert_allclose(first_xs, dist[::4])
+    last_efh = {x: e for x, e, _ in results}
+    assert len(last_efh) == len(dist)
+    np.testing.assert_allclose([last_efh[x] for x in dist], efh_speed,
+                               rtol=1e-5)
+
     # Test quadrant 2, positive takeoff angle
     _, efh2, _ = landing.calculate_efh(np.deg2rad(takeoff_angle),
                                        takeoff_quad2, skier, increment=0.2)
     expected_quad2 = \
-        np.array([2.06869294, 2.32862611, 2.3347512, 2.26367959, 2.26529656,
-                  2.24632669, 2.21713456, 2.18302593, 2.1512251, 2.12735662,
-                  2.09678855, 2.06501121, 2.03247095, 1.99966889, 1.96699731,
-                  1.93383061, 1.90044012, 1.86702338, 1.83375702, 1.80080359,
-                  1.76806412, 1.7356011, 1.70352141, 1.67190225, 1.64082434,
-                  1.6102607, 1.58024025, 1.5507907, 1.52196707, 1.49379066,
-                  1.46623922, 1.43932379, 1.41305071, 1.38744381, 1.36250567,
-                  1.33821319, 1.31455562, 1.29153864, 1.269153, 1.24739955,
-                  1.22625899, 1.20571586, 1.18576279, 1.16638949, 1.14758039,
-                  1.12932359, 1.11160082, 1.0944017, 1.07765136, 1.06159372,
-                  1.0458878, 1.03062399, 1.01586807, 1.00152386, 0.98760244,
-                  0.97411286, 0.96106147, 0.94838167, 0.93598971, 0.92389684,
-                  0.91232011, 0.90106331, 0.8901389, 0.87949807, 0.86953028,
-                  0.85918949, 0.84947943, 0.8403958, 0.83124043, 0.82234776,
-                  0.81371588, 0.8053377, 0.79719569, 0.78926783, 0.78157332,
-                  0.77407325, 0.76664867, 0.75940032, 0.75243023, 0.7457996,
-                  0.73929607, 0.73297045, 0.72681849, 0.72083236, 0.71508179])
+        np.array([2.06870675, 2.31462124, 2.31513757, 2.27185086, 2.27922892,
+                  2.25666115, 2.21758177, 2.17588463, 2.15038838, 2.12784708,
+                  2.0967477, 2.06450139, 2.03168674, 1.99891211, 1.96594958,
+                  1.93247261, 1.89882762, 1.86521301, 1.83182413, 1.79867589,
+                  1.76572438, 1.73309057, 1.70086906, 1.66914721, 1.63794735,
+                  1.60725517, 1.57712303, 1.54759147, 1.51869747, 1.49044716,
+                  1.46282836, 1.43585974, 1.40955365, 1.38391823, 1.35894799,
+                  1.33462672, 1.31095403, 1.28792712, 1.26554284, 1.24379022,
+                  1.22264982, 1.20211284, 1.1821696, 1.16280912, 1.14401797,
+                  1.12577742, 1.10807583, 1.09090151, 1.07424082, 1.05807873,
+                  1.04239845, 1.02718734, 1.0124327, 0.99812184, 0.98424173,
+                  0.97077689, 0.95771483, 0.94504368, 0.93275171, 0.92082708,
+                  0.90925587, 0.89802767, 0.88713282, 0.87655993, 0.86629834,
+                  0.85633708, 0.84666661, 0.83727769, 0.82816119, 0.8193089,
+                  0.81071157, 0.80236046, 0.79424776, 0.78636585, 0.77870708,
+                  0.77126369, 0.76402885, 0.75699649, 0.75015971, 0.743512,
+                  0.73704691, 0.73075868, 0.72464179, 0.71868678, 0.71289646])
     np.testing.assert_allclose(expected_quad2, efh2, rtol=1e-3)
 
     # Test quadrant 2, negative takeoff angle less than 45
@@ -319,3 +499,40 @@ def test_calculate_efh(profile=False):
     with pytest.raises(InvalidJumpError):
         dist, _, _ = landing.calculate_efh(np.deg2rad(takeoff_angle),
                                            takeoff_quad4, skier, increment=0.2)
+
+
+def test_update_efh():
+
+    skier = Skier()
+
+    x = np.linspace(0.0, 30.0, num=151)
+    surf = Surface(x, -0.5 * x - 1.0)
+    takeoff_angle = np.deg2rad(10.0)
+
+    previous = surf.calculate_efh(takeoff_angle, (0.0, 0.0), skier)
+
+    y = surf.y.copy()
+    bump = (x > 10.0) & (x < 14.0)
+    y[bump] += 0.5 * np.sin(np.pi * (x[bump] - 10.0) / 4.0)
+    edited = Surface(x, y)
+
+    expected = edited.calculate_efh(takeoff_angle, (0.0, 0.0), skier)
+    updated = edited.update_efh(surf, previous, takeoff_angle, (0.0, 0.0),
+                                skier)
+    for a, b in zip(updated, expected):
+        np.testing.assert_allclose(a, b, rtol=1e-5)
+
+    # The edit moves the first location that can't be landed on further
+    # down the surface.
+    takeoff_angle = np.deg2rad(-20.0)
+    surf = Surface(x, -0.1 * x - 0.5)
+    previous = surf.calculate_efh(takeoff_angle, (0.0, 0.0), skier)
+    y = surf.y.copy()
+    y[(x > 1.5) & (x < 3.0)] -= 3.0
+    edited = Surface(x, y)
+    expected = edited.calculate_efh(takeoff_angle, (0.0, 0.0), skier)
+    assert np.sum(np.isnan(expected[1])) < np.sum(np.isnan(previous[1]))
+    updated = edited.update_efh(surf, previous, takeoff_angle, (0.0, 0.0),
+                                skier)
+    for a, b in zip(updated, expected):
+        np.testing.assert_allclose(a, b, rtol=1e-5)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from ..functions import make_jump
+from ..sweeps import OUTPUT_COLUMNS
+from ..surrogate import (fit_surrogate, make_jump_estimate, save_surrogate,
+                         load_surrogate)
+
+
+def test_surrogate(tmpdir):
+
+    surrogate = fit_surrogate([-15.0], [30.0, 35.0, 40.0], [20.0],
+                              [0.0, 0.5, 0.75, 1.0])
+
+    # a fall height of zero raises an InvalidJumpError
+    np.testing.assert_array_equal(surrogate.feasible[0, :, 0],
+                                  [[False, True, True, True]] * 3)
+
+    # the grid's designs are exact
+    *_, expected = make_jump(-15.0, 0.0, 35.0, 20.0, 0.75)
+    outputs = make_jump_estimate(-15.0, 0.0, 35.0, 20.0, 0.75, surrogate)
+    assert outputs == expected
+
+    *_, expected = make_jump(-15.0, 0.0, 33.0, 20.0, 0.9)
+    estimates, errors, trusted = surrogate.estimate(-15.0, 33.0, 20.0, 0.9)
+    assert trusted
+    for (_, key), estimate, error in zip(OUTPUT_COLUMNS, estimates, errors):
+        assert abs(estimate - expected[key]) <= error
+
+    # designs next to an invalid design or outside of the grid are made
+    for fall_height, slope_angle in ((0.25, -15.0), (0.6, -16.0)):
+        assert not surrogate.estimate(slope_angle, 33.0, 20.0,
+                                      fall_height)[2]
+        *_, expected = make_jump(slope_angle, 0.0, 33.0, 20.0, fall_height)
+        assert make_jump_estimate(slope_angle, 0.0, 33.0, 20.0, fall_height,
+                                  surrogate) == expected
+    assert surrogate.feasibility(-15.0, 33.0, 20.0, 0.25) == 0.5
+    assert np.isnan(surrogate.feasibility(-16.0, 33.0, 20.0, 0.6))
+
+    # the errors next to an invalid design are unknown
+    assert np.all(np.isnan(surrogate.estimate(-15.0, 33.0, 20.0, 0.6)[1]))
+    assert np.all(errors > 0.0)
+    *_, expected = make_jump(-15.0, 0.0, 33.0, 20.0, 0.9)
+    outputs = make_jump_estimate(-15.0, 0.0, 33.0, 20.0, 0.9, surrogate,
+                                 tolerance=np.max(errors))
+    np.testing.assert_array_equal([outputs[key] for _, key in
+                                   OUTPUT_COLUMNS], estimates)
+    assert make_jump_estimate(-15.0, 0.0, 33.0, 20.0, 0.9, surrogate,
+                              tolerance=np.min(errors) / 2) == expected
+
+    path = str(tmpdir.join('surrogate.npz'))
+    save_surrogate(surrogate, path)
+    loaded = load_surrogate(path)
+    np.testing.assert_array_equal(loaded.values, surrogate.values)
+    np.testing.assert_array_equal(loaded.errors, surrogate.errors)
+    for axis, loaded_axis in zip(surrogate.axes, loaded.axes):
+        np.testing.assert_array_equal(loaded_axis, axis)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from .. import sweeps
+from ..functions import make_jump
+from ..skiers import Skier
+from ..surfaces import FlatSurface
+from ..sweeps import (sweep, load_sweep, sweep_efh, Journal,
+                      OUTPUT_COLUMNS)
+
+
+def test_sweep(tmpdir):
+
+    path = str(tmpdir.join('sweep.npz'))
+
+    table = sweep([-15.0], [30.0, 40.0], [20.0], [0.0, 0.5], path=path)
+
+    assert all(len(values) == 4 for values in table.values())
+    np.testing.assert_allclose(table['approach_len'], [30.0, 30.0, 40.0, 40.0])
+    np.testing.assert_allclose(table['fall_height'], [0.0, 0.5, 0.0, 0.5])
+
+    # a fall height of zero raises an InvalidJumpError
+    failed = table['failure'] != ''
+    np.testing.assert_array_equal(failed, [True, False, True, False])
+    assert np.all(np.isnan(table['snow_budget'][failed]))
+
+    *_, outputs = make_jump(-15.0, 0.0, 40.0, 20.0, 0.5)
+    for column, key in OUTPUT_COLUMNS:
+        assert table[column][3] == outputs[key]
+
+    loaded = load_sweep(path)
+    assert list(loaded) == list(table)
+    for column in table:
+        np.testing.assert_array_equal(loaded[column], table[column])
+
+    parallel = sweep([-15.0], [30.0, 40.0], [20.0], [0.0, 0.5], workers=2)
+    for column in table:
+        np.testing.assert_array_equal(parallel[column], table[column])
+
+
+def test_sweep_journal(tmpdir, monkeypatch):
+
+    path = str(tmpdir.join('sweep.journal'))
+
+    table = sweep([-15.0], [30.0, 40.0], [20.0], [0.0, 0.5], journal=path)
+
+    with open(path) as f:
+        lines = f.readlines()
+    assert len(lines) == 4
+
+    # simulate a sweep that was killed while writing its third result
+    with open(path, 'w') as f:
+        f.writelines(lines[:2] + [lines[2][:10]])
+
+    made = []
+    sweep_design = sweeps._sweep_design
+
+    def record(design):
+        made.append(design)
+        return sweep_design(design)
+
+    monkeypatch.setattr(sweeps, '_sweep_design', record)
+
+    resumed = sweep([-15.0], [30.0, 40.0], [20.0], [0.0, 0.5], journal=path)
+    assert made == [(-15.0, 0.0, 40.0, 20.0, 0.0),
+                    (-15.0, 0.0, 40.0, 20.0, 0.5)]
+    for column in table:
+        np.testing.assert_array_equal(resumed[column], table[column])
+
+    made.clear()
+    sweep([-15.0], [30.0, 40.0], [20.0], [0.0, 0.5], journal=path)
+    assert made == []
+
+    assert len(Journal(path)) == 4
+
+
+def test_sweep_efh(tmpdir):
+
+    path = str(tmpdir.join('efh.journal'))
+
+    skier = Skier()
+    slope = FlatSurface(-np.deg2rad(30.0), 20.0)
+    jobs = [(slope, np.deg2rad(10.0), (0.0, 0.0)),
+            (slope, np.deg2rad(20.0), (0.0, 0.0))]
+
+    results = sweep_efh(jobs, increment=2.0, journal=path)
+
+    for (surface, angle, point), result in zip(jobs, results):
+        expected = surface.calculate_efh(angle, point, skier, increment=2.0)
+        for values, expected_values in zip(result, expected):
+            np.testing.assert_array_equal(values, expected_values)
+
+    resumed = sweep_efh(jobs, increment=2.0, journal=path)
+    for result, resumed_result in zip(results, resumed):
+        for values, resumed_values in zip(result, resumed_result):
+            np.testing.assert_array_equal(values, resumed_values)
+
+    assert len(Journal(path)) == 2
@@ -1,11 +1,15 @@
+import pickle
+from copy import deepcopy
 from math import isclose
 
 import numpy as np
+import pytest
 import matplotlib.pyplot as plt
 
-from ..skiers import Skier
-from ..surfaces import Surface
-from ..trajectories import Trajectory
+from ..skiers import Skier, _HermiteInterpolant
+from ..surfaces import Surface, FlatSurface, HorizontalSurface
+from ..trajectories import Trajectory, DenseTrajectory
+from ..utils import InvalidJumpError
 
 
 def test_trajectory(plot=False):
@@ -63,3 +67,86 @@ def test_interp_wrt_x():
     assert isclose(res[1], 2.33)  # x
     assert isclose(res[2], 5.0 * 2.33 + 2.0)  # y
     assert isclose(res[7], 5.0)  # slope
+
+
+def test_dense_trajectory():
+
+    def sample(times):
+        pos = np.vstack((times, times**2)).T
+        vel = np.vstack((np.ones_like(times), 2.0 * times)).T
+        return {'pos': pos, 'vel': vel}
+
+    traj = DenseTrajectory((1.0, 3.0), sample, 100)
+
+    assert isclose(traj.duration, 2.0)
+    assert 'pos' not in traj.__dict__  # not sampled yet
+
+    assert traj.t.shape == (200,)
+    assert isclose(traj.t[-1], 3.0)
+    np.testing.assert_allclose(traj.pos[:, 1], traj.t**2)
+    np.testing.assert_allclose(traj.slope, 2.0 * traj.t, rtol=1e-14)
+    assert isclose(traj.interp_wrt_x(2.0)[2], 4.0, rel_tol=1e-4)
+
+    traj = pickle.loads(pickle.dumps(DenseTrajectory((1.0, 3.0), sample, 100)))
+    np.testing.assert_allclose(traj.pos[:, 1], traj.t**2)
+
+
+def test_single_pass_flight():
+
+    skier = Skier()
+
+    surf = Surface(np.linspace(0.0, 30.0, num=100), np.zeros(100))
+
+    traj = skier.fly_to(surf, (4.0, 3.0), (8.0, 5.0))
+    coarse = skier.fly_to(surf, (4.0, 3.0), (8.0, 5.0), fine=False)
+
+    assert isinstance(traj, DenseTrajectory)
+    assert isclose(traj.duration, coarse.duration)
+    np.testing.assert_allclose(traj.pos[-1], coarse.pos[-1])
+    np.testing.assert_allclose(np.diff(traj.t), 1.0 / skier.samples_per_sec,
+                               rtol=1e-2)
+
+    # the cubic interpolant used with pycvodes' adaptive steps, the RK45
+    # steps are longer than those of pycvodes
+    states = np.hstack((coarse.pos, coarse.vel))
+    dense = _HermiteInterpolant(coarse.t, states,
+                                skier._flight_rhs_many(states))
+    np.testing.assert_allclose(dense(traj.t).T,
+                               np.hstack((traj.pos, traj.vel)), atol=1e-3)
+
+
+def test_truncated():
+
+    skier = Skier()
+
+    surf = Surface(np.linspace(0.0, 30.0, num=100), np.zeros(100))
+    upper = Surface(np.linspace(0.0, 30.0, num=100), np.full(100, 2.0))
+
+    traj = skier.fly_to(surf, (4.0, 3.0), (8.0, 5.0))
+    expected = skier.fly_to(upper, (4.0, 3.0), (8.0, 5.0))
+
+    truncated = traj.truncated(upper)
+
+    assert isinstance(truncated, DenseTrajectory)
+    assert isclose(truncated.duration, expected.duration, rel_tol=1e-9)
+    np.testing.assert_allclose(truncated.pos, expected.pos, atol=1e-9)
+
+    # the copies can also be truncated, but not the unpickled trajectories
+    assert isclose(deepcopy(traj).truncated(upper).duration,
+                   truncated.duration)
+    with pytest.raises(ValueError):
+        pickle.loads(pickle.dumps(traj)).truncated(upper)
+
+    below = Surface(np.linspace(0.0, 30.0, num=100), np.full(100, -1.0))
+    with pytest.raises(InvalidJumpError):
+        traj.truncated(below)
+
+    # flat surfaces compute the distances in closed form
+    traj = skier.fly_to(FlatSurface(-0.3, 200.0), (0.0, 0.0), (10.0, 2.0))
+    for flat in (FlatSurface(-0.1, 200.0, init_pos=(-1.0, -0.5)),
+                 HorizontalSurface(-1.0, 50.0)):
+        truncated = traj.truncated(flat)
+        expected = skier.fly_to(flat, (0.0, 0.0), (10.0, 2.0))
+        assert isclose(truncated.duration, expected.duration, rel_tol=1e-9)
+        np.testing.assert_allclose(truncated.pos, expected.pos, atol=1e-9)
+        assert abs(flat.distance_from(*truncated.pos[-1])) < 1e-9
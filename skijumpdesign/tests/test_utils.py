@@ -1,7 +1,14 @@
+import os
+import sys
+import glob
+import subprocess
+from importlib.machinery import EXTENSION_SUFFIXES
+
 import numpy as np
 from numpy.testing import assert_allclose
 
-from ..utils import vel2speed
+from ..utils import (vel2speed, compute_flight_derivs, compute_slide_derivs,
+                     _flight_derivs_numpy, _slide_derivs_numpy)
 
 
 def test_vel2speed():
@@ -21,3 +28,92 @@ def test_vel2speed():
         speed, angle = vel2speed(*ins)
         assert_allclose(speed, outs[0])
         assert_allclose(angle, outs[1])
+
+
+def test_kernel_cache(tmpdir):
+
+    env = dict(os.environ, SKIJUMPDESIGN_CACHE_DIR=str(tmpdir))
+    code = ('import sys; from skijumpdesign.utils import compute_drag; '
+            'print(compute_drag is not None, "sympy" in sys.modules)')
+
+    def run():
+        out = subprocess.check_output([sys.executable, '-c', code], env=env)
+        return out.decode().split()
+
+    kernels_dir = os.path.join(str(tmpdir), 'kernels')
+    stale = os.path.join(kernels_dir, 'drag_expr-0123456789abcdef')
+    os.makedirs(stale)
+
+    compiled, _ = run()
+
+    if compiled != 'True':
+        return
+
+    # the second process loads the cached module without importing sympy
+    assert run() == ['True', 'False']
+
+    # the build files and kernels with the names of earlier versions are
+    # removed
+    assert not os.path.exists(stale)
+    drag_dir, = [path for path in glob.glob(os.path.join(kernels_dir,
+                                                         'drag_expr-*'))
+                 if os.path.isdir(path)]
+    assert not os.path.exists(os.path.join(drag_dir, 'build'))
+    module, = glob.glob(os.path.join(drag_dir, 'wrapper_module_*' +
+                                     EXTENSION_SUFFIXES[0]))
+    mtime = os.path.getmtime(module)
+
+    # without the aliases, e.g. after editing the source, the kernels are
+    # found by their expressions and not compiled again
+    for alias in glob.glob(os.path.join(kernels_dir, '*.alias')):
+        os.remove(alias)
+    assert run()[0] == 'True'
+    assert os.path.getmtime(module) == mtime
+
+    # a broken kernel is built again
+    with open(module, 'w') as f:
+        f.write('broken')
+    assert run()[0] == 'True'
+    assert os.path.getsize(module) > len('broken')
+
+
+def test_derivative_kernels():
+
+    flight_args = (10.0, -2.0, 75.0, 0.34, 0.821, 0.85, 9.81)
+    slide_args = (12.0, 0.3, 0.05, 0.2, -0.1, 75.0, 0.34, 0.821, 0.03, 0.85,
+                  9.81)
+
+    assert_allclose(compute_flight_derivs(*flight_args),
+                    _flight_derivs_numpy(*flight_args))
+    assert_allclose(compute_slide_derivs(*slide_args),
+                    _slide_derivs_numpy(*slide_args))
+
+    # check the Jacobians with central differences
+    delta = 1e-6
+    derivs = _flight_derivs_numpy(*flight_args)
+    for i, idx in enumerate([0, 1]):  # vx, vy are states 2 and 3
+        plus = list(flight_args)
+        plus[idx] += delta
+        minus = list(flight_args)
+        minus[idx] -= delta
+        expected = (_flight_derivs_numpy(*plus)[:, 0] -
+                    _flight_derivs_numpy(*minus)[:, 0]) / 2 / delta
+        assert_allclose(derivs[:, 3 + i], expected, atol=1e-8)
+
+    derivs = _slide_derivs_numpy(*slide_args)
+    plus = list(slide_args)
+    plus[0] += delta
+    minus = list(slide_args)
+    minus[0] -= delta
+    expected = (_slide_derivs_numpy(*plus)[:, 0] -
+                _slide_derivs_numpy(*minus)[:, 0]) / 2 / delta
+    assert_allclose(derivs[:, 2], expected, atol=1e-8)
+    # x enters through the slope and curvature
+    v, slope, kurva, dslope, dkurva = slide_args[:5]
+    plus = (v, slope + dslope * delta, kurva + dkurva * delta) + \
+        slide_args[3:]
+    minus = (v, slope - dslope * delta, kurva - dkurva * delta) + \
+        slide_args[3:]
+    expected = (_slide_derivs_numpy(*plus)[:, 0] -
+                _slide_derivs_numpy(*minus)[:, 0]) / 2 / delta
+    assert_allclose(derivs[:, 1], expected, atol=1e-8)
@@ -1,13 +1,14 @@
 import os
+from copy import deepcopy
 
 import numpy as np
-from scipy.interpolate import interp1d
 if 'ONRENDER' in os.environ:
     plt = None
 else:
     import matplotlib.pyplot as plt
 
-from .utils import EPS
+from .interpolation import Interpolator
+from .utils import EPS, InvalidJumpError
 
 
 class Trajectory(object):
@@ -81,13 +82,9 @@ class Trajectory(object):
 
     def _initialize_interpolators(self):
 
-        kwargs = {'fill_value': 'extrapolate',
-                  'copy': False,
-                  'assume_sorted': True,
-                  'axis': 0}
-        self.interp_pos_wrt_x = interp1d(self.pos[:, 0], self.pos, **kwargs)
-        self.interp_wrt_x = interp1d(self.pos[:, 0], self._traj, **kwargs)
-        self.interp_pos_wrt_slope = interp1d(self.slope, self.pos, **kwargs)
+        self.interp_pos_wrt_x = Interpolator(self.pos[:, 0], self.pos)
+        self.interp_wrt_x = Interpolator(self.pos[:, 0], self._traj)
+        self.interp_pos_wrt_slope = Interpolator(self.slope, self.pos)
 
     @property
     def duration(self):
@@ -156,3 +153,124 @@ class Trajectory(object):
         ax.set_aspect('equal')
 
         return ax
+
+
+class DenseTrajectory(Trajectory):
+    """Class that describes a 2D trajectory computed by an integrator with
+    dense output. The equally spaced samples are only computed from the
+    integrator's interpolant when an attribute that needs them is first
+    accessed."""
+
+    # These attributes are set by Trajectory.__init__() when sampled.
+    _sampled_attributes = ('t', 'pos', 'vel', 'acc', 'speed', 'slope',
+                           'angle', '_traj', 'interp_pos_wrt_x',
+                           'interp_wrt_x', 'interp_pos_wrt_slope')
+
+    def __init__(self, t_span, sample, samples_per_sec):
+        """Instantiates a trajectory that has not been sampled yet.
+
+        Parameters
+        ==========
+        t_span : 2-tuple of floats
+            The start and end times of the trajectory.
+        sample : callable
+            A function that takes an array of times, shape(n,), and returns a
+            dictionary of the ``pos``, ``vel``, ``acc``, and ``speed`` keyword
+            arguments of ``Trajectory`` at those times.
+        samples_per_sec : float
+            The rate the trajectory is sampled at.
+
+        """
+
+        self._t_span = tuple(t_span)
+        self._sample = sample
+        # NOTE : The function is kept after sampling so that the trajectory
+        # can be truncated.
+        self._sampler = sample
+        self._samples_per_sec = samples_per_sec
+        self._num_samples = int(samples_per_sec * self.duration)
+
+    def _sample_trajectory(self):
+        # NOTE : _sample is removed first so any access to an attribute that
+        # isn't set yet raises an AttributeError instead of recursing.
+        sample = self.__dict__.pop('_sample')
+        t = np.linspace(*self._t_span, num=self._num_samples)
+        Trajectory.__init__(self, t, **sample(t))
+
+    def __getattr__(self, name):
+        # NOTE : This is only called if the attribute is not found, i.e. for
+        # the sampled attributes before the first access.
+        if name in self._sampled_attributes and '_sample' in self.__dict__:
+            self._sample_trajectory()
+            return getattr(self, name)
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name))
+
+    def __getstate__(self):
+        # NOTE : The interpolant may hold local functions that can't be
+        # pickled, so the samples are stored instead.
+        if '_sample' in self.__dict__:
+            self._sample_trajectory()
+        state = self.__dict__.copy()
+        state.pop('_sampler', None)
+        return state
+
+    def __deepcopy__(self, memo):
+        # NOTE : Copies share the interpolant, which is not modified by
+        # sampling, so they are not sampled like when pickled.
+        traj = self.__class__.__new__(self.__class__)
+        memo[id(self)] = traj
+        for name, value in self.__dict__.items():
+            if name not in ('_sample', '_sampler'):
+                value = deepcopy(value, memo)
+            traj.__dict__[name] = value
+        return traj
+
+    @property
+    def duration(self):
+        """Returns the duration of the trajectory in seconds."""
+        return self._t_span[1] - self._t_span[0]
+
+    def truncated(self, surface):
+        """Returns the trajectory until it first crosses the surface from
+        above, without integrating it again.
+
+        Parameters
+        ==========
+        surface : Surface
+            A surface that the trajectory crosses.
+
+        Returns
+        =======
+        DenseTrajectory
+            The trajectory until the crossing, sampled at the same rate.
+
+        Raises
+        ======
+        InvalidJumpError
+            Error if the trajectory does not cross the surface.
+
+        """
+        if '_sampler' not in self.__dict__:
+            raise ValueError('Unpickled trajectories can not be truncated.')
+
+        distance = surface.distance_from(self.pos[:, 0], self.pos[:, 1])
+        crossings = np.nonzero((distance[:-1] > 0.0) &
+                               (distance[1:] <= 0.0))[0]
+        if len(crossings) == 0:
+            raise InvalidJumpError('The trajectory does not cross the '
+                                   'surface.')
+
+        # NOTE : The crossing is found between the samples by bisection on
+        # the integrator's interpolant.
+        lower, upper = self.t[crossings[0]], self.t[crossings[0] + 1]
+        for i in range(50):
+            middle = (lower + upper) / 2.0
+            pos = self._sampler(np.array([middle]))['pos'][0]
+            if surface.distance_from(pos[0], pos[1]) > 0.0:
+                lower = middle
+            else:
+                upper = middle
+
+        return DenseTrajectory((self._t_span[0], upper), self._sampler,
+                               self._samples_per_sec)
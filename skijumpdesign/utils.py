@@ -1,6 +1,18 @@
+import os
+import re
+import glob
+import time
+import shutil
+import inspect
+import hashlib
+import logging
+import tempfile
+import importlib.util
+from importlib.machinery import EXTENSION_SUFFIXES
+
 import numpy as np
-import sympy as sm
-from sympy.utilities.autowrap import autowrap
+
+from .version import __version__
 
 EPS = np.finfo(float).eps
 
@@ -17,26 +29,276 @@ class InvalidJumpError(Exception):
     pass
 
 
-def _generate_fast_drag_func():
+def cache_dir():
+    """Returns the path to the directory where skijumpdesign stores files that
+    persist between sessions. This is ``$SKIJUMPDESIGN_CACHE_DIR`` if set,
+    otherwise ``skijumpdesign`` in ``$XDG_CACHE_HOME`` or ``~/.cache``."""
+    if 'SKIJUMPDESIGN_CACHE_DIR' in os.environ:
+        return os.environ['SKIJUMPDESIGN_CACHE_DIR']
+    root = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(root, 'skijumpdesign')
+
+
+def _load_kernel(path):
+    """Returns the compiled function stored in the kernel directory path."""
+    mod_paths = [p for suffix in EXTENSION_SUFFIXES
+                 for p in glob.glob(os.path.join(path, 'wrapper_module_*' +
+                                                 suffix))]
+    mod_path = mod_paths[0]  # IndexError if not built
+    mod_name = os.path.basename(mod_path).split('.')[0]
+    spec = importlib.util.spec_from_file_location(mod_name, mod_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.autofunc_c
+
+
+# NOTE : The kernels are built with this autowrap backend, which is part of
+# their key.
+_KERNEL_BACKEND = 'cython'
+# NOTE : Kernel builds older than this were interrupted and are removed.
+_STALE_BUILD_AGE = 3600.0  # seconds
+
+
+def _kernel_hash(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+    return digest.hexdigest()[:16]
+
+
+def _build_kernel(expr, args, kernels_dir, name):
+    """Builds the kernel of the expression in the directory name of
+    kernels_dir and returns its compiled function."""
+    from sympy.utilities.autowrap import autowrap
+    path = os.path.join(kernels_dir, name)
+    os.makedirs(kernels_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=name + '-build-', dir=kernels_dir)
+    try:
+        autowrap(expr, backend=_KERNEL_BACKEND, args=args, tempdir=build_dir)
+        # NOTE : Only the compiled module is loaded, so the object files are
+        # removed.
+        shutil.rmtree(os.path.join(build_dir, 'build'), ignore_errors=True)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            # NOTE : Either another process finished building first or the
+            # directory is broken, e.g. by an interrupted copy, and is
+            # replaced.
+            try:
+                return _load_kernel(path)
+            except Exception:
+                shutil.rmtree(path, ignore_errors=True)
+                os.rename(build_dir, path)
+        return _load_kernel(path)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def _write_alias(alias_path, name):
+    """Atomically writes the kernel directory name to the alias file."""
+    fd, tmp_path = tempfile.mkstemp(prefix=name + '-build-',
+                                    dir=os.path.dirname(alias_path))
+    with os.fdopen(fd, 'w') as f:
+        f.write(name)
+    os.replace(tmp_path, alias_path)
+
+
+def _prune_kernels(kernels_dir, func_name, prefix, keep):
+    """Removes the kernel directories and aliases of the function in
+    kernels_dir whose names start with prefix, or have the name scheme of
+    earlier versions, except those in keep."""
+    # NOTE : Kernels of other package versions for the same Python are
+    # removed too, so environments with different versions that share the
+    # cache directory rebuild them in turn.
+    legacy = re.compile(re.escape(func_name) + r'-[0-9a-f]{16}$')
+    for entry in os.listdir(kernels_dir):
+        if entry in keep or not (entry.startswith(prefix) or
+                                 legacy.match(entry)):
+            continue
+        path = os.path.join(kernels_dir, entry)
+        # NOTE : Other processes may be building the kernel.
+        if ('-build-' in entry and
+                time.time() - os.path.getmtime(path) < _STALE_BUILD_AGE):
+            continue
+        logging.info('Removing the stale kernel {}.'.format(path))
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def _cached_autowrap(generate_expr):
+    """Returns a compiled function of the SymPy expression and argument
+    symbols returned by ``generate_expr()``.
+
+    The Cython module is built once and stored in a directory of
+    ``cache_dir()`` that is named with a hash of the expression and
+    arguments, the package version, the Python extension tag and the
+    backend. An alias file named with a hash of the generating function's
+    source points to that directory, so later imports load the stored
+    module without importing SymPy or compiling. The build files and the
+    stale kernels of the function are removed. None is returned if the
+    module can't be built, e.g. Cython or a C compiler is missing.
+
+    """
+    func_name = generate_expr.__name__.strip('_')
+    # e.g. cpython-38-x86_64-linux-gnu
+    tag = EXTENSION_SUFFIXES[0].split('.')[1]
+    prefix = '{}-{}-'.format(func_name, tag)
+    kernels_dir = os.path.join(cache_dir(), 'kernels')
+
+    # NOTE : The source, unlike the code object, doesn't change when the
+    # function moves in the file or the package is moved.
+    try:
+        source = inspect.getsource(generate_expr)
+    except (OSError, TypeError):
+        alias = None
+    else:
+        alias = prefix + _kernel_hash(source, __version__,
+                                      _KERNEL_BACKEND) + '.alias'
+        try:
+            with open(os.path.join(kernels_dir, alias)) as f:
+                return _load_kernel(os.path.join(kernels_dir,
+                                                 f.read().strip()))
+        except Exception:
+            pass
+
+    try:
+        import sympy as sm
+        expr, args = generate_expr()
+        name = prefix + _kernel_hash(sm.srepr(expr), sm.srepr(args),
+                                     __version__, _KERNEL_BACKEND)
+        try:
+            kernel = _load_kernel(os.path.join(kernels_dir, name))
+        except Exception:
+            logging.info('Compiling {} into {}.'.format(name, kernels_dir))
+            kernel = _build_kernel(expr, args, kernels_dir, name)
+    except Exception as e:
+        logging.info('Compiling {} failed: {}'.format(func_name, e))
+        return None
+
+    try:
+        if alias is not None:
+            _write_alias(os.path.join(kernels_dir, alias), name)
+        _prune_kernels(kernels_dir, func_name, prefix, (name, alias))
+    except OSError as e:
+        logging.info('Updating the kernels of {} failed: {}'.format(
+            func_name, e))
+
+    return kernel
+
+
+def _drag_expr():
+    import sympy as sm
     v, A, ro, C = sm.symbols('v, A, ro, C')
     drag_expr = -sm.sign(v) / 2 * ro * C * A * v**2
-    return autowrap(drag_expr, backend='cython', args=(ro, v, C, A))
+    return drag_expr, (ro, v, C, A)
 
-try:
-    compute_drag = _generate_fast_drag_func()
-except:
-    compute_drag = None
 
+compute_drag = _cached_autowrap(_drag_expr)
 
-def _gen_fast_distance_from():
+
+def _distance_from_flat_expr():
+    import sympy as sm
     theta, x, y = sm.symbols('theta, x, y')
     expr = (y - sm.tan(theta) * x) * sm.cos(theta)
-    return autowrap(expr, backend='cython', args=(theta, x, y))
+    return expr, (theta, x, y)
+
+
+compute_dist_from_flat = _cached_autowrap(_distance_from_flat_expr)
+
+
+def _flight_derivs_expr():
+    import sympy as sm
+    x, y, vx, vy = sm.symbols('x, y, vx, vy', real=True)
+    m, A, C, ro, g = sm.symbols('m, A, C, ro, g', positive=True)
+    # NOTE : v*|v| is the same as sign(v)*v**2 but has a derivative without
+    # a Dirac delta.
+    drag_per_mass = ro * C * A / 2 / m
+    rhs = sm.Matrix([vx,
+                     vy,
+                     -drag_per_mass * vx * sm.Abs(vx),
+                     -g - drag_per_mass * vy * sm.Abs(vy)])
+    jac = rhs.jacobian([x, y, vx, vy])
+    return rhs.row_join(jac), (vx, vy, m, A, C, ro, g)
+
+
+def _flight_derivs_numpy(vx, vy, m, A, C, ro, g):
+    drag_per_mass = ro * C * A / 2 / m
+    derivs = np.zeros((4, 5))
+    derivs[0, 0] = vx
+    derivs[1, 0] = vy
+    derivs[2, 0] = -drag_per_mass * vx * np.abs(vx)
+    derivs[3, 0] = -g - drag_per_mass * vy * np.abs(vy)
+    derivs[0, 3] = 1.0
+    derivs[1, 4] = 1.0
+    derivs[2, 3] = -2.0 * drag_per_mass * np.abs(vx)
+    derivs[3, 4] = -2.0 * drag_per_mass * np.abs(vy)
+    return derivs
+
+
+# NOTE : Returns a 4 x 5 array with the time derivatives of the flight states
+# [x, y, vx, vy] in the first column and the Jacobian of those derivatives
+# with respect to the states in the remaining columns.
+compute_flight_derivs = _cached_autowrap(_flight_derivs_expr)
+if compute_flight_derivs is None:
+    compute_flight_derivs = _flight_derivs_numpy
+
+
+def _slide_derivs_expr():
+    import sympy as sm
+    x, v = sm.symbols('x, v', real=True)
+    slope, kurva, dslope, dkurva = sm.symbols('slope, kurva, dslope, dkurva',
+                                              real=True)
+    m, A, C, mu, ro, g = sm.symbols('m, A, C, mu, ro, g', positive=True)
+    slope_func = sm.Function('slope')(x)
+    kurva_func = sm.Function('kurva')(x)
+    theta = sm.atan(slope_func)
+    # NOTE : The friction uses the tangent of the slope to match
+    # Skier.friction_force().
+    rhs = sm.Matrix([
+        v * sm.cos(theta),
+        -g * sm.sin(theta) - ro * C * A / 2 / m * v * sm.Abs(v) -
+        sm.sign(v) * mu * (g * sm.cos(sm.tan(slope_func)) +
+                           kurva_func * v**2)])
+    jac = rhs.jacobian([x, v])
+    # the derivative of sign(v) is zero everywhere but v = 0
+    jac = jac.replace(sm.DiracDelta, lambda *args: 0)
+    derivs = rhs.row_join(jac)
+    derivs = derivs.subs({slope_func.diff(x): dslope,
+                          kurva_func.diff(x): dkurva})
+    derivs = derivs.subs({slope_func: slope, kurva_func: kurva})
+    return derivs, (v, slope, kurva, dslope, dkurva, m, A, C, mu, ro, g)
+
+
+def _slide_derivs_numpy(v, slope, kurva, dslope, dkurva, m, A, C, mu, ro, g):
+    drag_per_mass = ro * C * A / 2 / m
+    cos_theta = 1.0 / np.sqrt(1.0 + slope**2)
+    sin_theta = slope * cos_theta
+    derivs = np.empty((2, 3))
+    derivs[0, 0] = v * cos_theta
+    derivs[1, 0] = (-g * sin_theta - drag_per_mass * v * np.abs(v) -
+                    np.sign(v) * mu * (g * np.cos(np.tan(slope)) +
+                                       kurva * v**2))
+    derivs[0, 1] = -v * slope * cos_theta**3 * dslope
+    derivs[0, 2] = cos_theta
+    derivs[1, 1] = (-g * cos_theta**3 * dslope -
+                    np.sign(v) * mu * (-g * np.sin(np.tan(slope)) *
+                                       (1.0 + np.tan(slope)**2) * dslope +
+                                       dkurva * v**2))
+    derivs[1, 2] = -2.0 * np.abs(v) * (drag_per_mass + mu * kurva)
+    return derivs
+
 
-try:
-    compute_dist_from_flat = _gen_fast_distance_from()
-except:
-    compute_dist_from_flat = None
+# NOTE : Returns a 2 x 3 array with the time derivatives of the sliding states
+# [x, v] in the first column and the Jacobian of those derivatives with
+# respect to the states in the remaining columns. The slope and curvature of
+# the surface and their derivatives with respect to x are evaluated at the
+# skier's position.
+compute_slide_derivs = _cached_autowrap(_slide_derivs_expr)
+if compute_slide_derivs is None:
+    compute_slide_derivs = _slide_derivs_numpy
 
 
 def speed2vel(speed, angle):